@@ -1,19 +1,30 @@
+import time
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt, JWTError
-from sqlalchemy.orm import Session
-from app.db.connection import get_db
-from app.db.models import User
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.connection import get_async_db
+from app.db.models import User, UserRole
 from app.auth.utils import SECRET_KEY, ALGORITHM
+from app.utils.metrics import db_query_seconds
+from app.auth.principal_cache import (
+    Principal, snapshot_user, get_cached_principal, cache_principal, invalidate_user
+)
 
 # Define how we extract token from request headers
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/auth/login")
 
 #Verify and decode JWT token
-def get_current_user(
+async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
-):
+    db: AsyncSession = Depends(get_async_db)
+) -> Principal:
+    # Recently seen token: skip decoding and the users lookup
+    principal = get_cached_principal(token)
+    if principal is not None:
+        return principal
+
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
         detail="Could not validate credentials",
@@ -28,16 +39,32 @@ def get_current_user(
     except JWTError:
         raise credentials_exception
 
-    user = db.query(User).filter(User.email == email).first()
+    loaded_at = time.monotonic()
+    with db_query_seconds.time(group="user_lookup"):
+        user = (await db.execute(select(User).where(User.email == email))).scalars().first()
     if not user:
         raise credentials_exception
 
-    return user
+    principal = snapshot_user(user)
+    cache_principal(token, principal, payload.get("exp"), loaded_at)
+    return principal
 
 
 #Check if current user is an admin
-def require_admin(current_user: User = Depends(get_current_user)):
-    if current_user.role.value != "admin":
+async def require_admin(
+    current_user: Principal = Depends(get_current_user),
+    db: AsyncSession = Depends(get_async_db)
+):
+    # Roles are changed outside the API (create_admin.py, SQL), so a cached snapshot
+    # may be out of date: confirm admin rights against the users row every time
+    if current_user.role == UserRole.admin:
+        with db_query_seconds.time(group="admin_check"):
+            role = (await db.execute(select(User.role).where(User.id == current_user.id))).scalar()
+        if role != UserRole.admin:
+            # Demoted or deleted: drop every cached snapshot of this user
+            invalidate_user(current_user.id)
+            current_user = None
+    if current_user is None or current_user.role != UserRole.admin:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Admin access required"
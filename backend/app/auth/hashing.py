@@ -0,0 +1,20 @@
+from passlib.context import CryptContext
+from app.config import BCRYPT_ROUNDS
+
+# Kept free of app/DB imports: this module is what password pool processes load.
+
+#Password hashing context; hashes below BCRYPT_ROUNDS are flagged for upgrade
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=BCRYPT_ROUNDS)
+
+
+def hash_password(password: str):
+    return pwd_context.hash(password)
+
+
+def verify_and_update(plain_password: str, hashed_password: str):
+    """(matches, new_hash); new_hash is set when the stored hash should be upgraded."""
+    try:
+        return pwd_context.verify_and_update(plain_password, hashed_password)
+    except ValueError:
+        # malformed or unknown hash format
+        return False, None
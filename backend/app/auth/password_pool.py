@@ -0,0 +1,108 @@
+import asyncio
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from app.config import PASSWORD_HASH_WORKERS, PASSWORD_HASH_MAX_QUEUE
+from app.auth import hashing
+from app.utils.metrics import queue_depth
+
+
+class PasswordPoolBusy(Exception):
+    """Raised instead of queueing when the hashing pool is saturated."""
+
+
+class PasswordHashPool:
+    """
+    Runs bcrypt in a small process pool so login/register bursts cannot
+    starve the request threadpool. At most ``workers + max_queue`` jobs are
+    admitted; further calls fail fast with PasswordPoolBusy.
+    """
+
+    def __init__(self, workers: int = PASSWORD_HASH_WORKERS,
+                 max_queue: int = PASSWORD_HASH_MAX_QUEUE):
+        self.workers = max(1, workers)
+        self.max_queue = max(0, max_queue)
+        self._slots = threading.BoundedSemaphore(self.workers + self.max_queue)
+        self._lock = threading.Lock()
+        self._executor = None
+        self.in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.upgraded = 0
+
+    def _get_executor(self):
+        with self._lock:
+            if self._executor is None:
+                # spawn, not fork: the API process runs threads (workers, schedulers)
+                context = multiprocessing.get_context("spawn")
+                self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=context)
+            return self._executor
+
+    def _submit(self, fn, *args):
+        """Admit a job or raise PasswordPoolBusy; the slot is freed when it finishes."""
+        if not self._slots.acquire(blocking=False):
+            self.rejected += 1
+            raise PasswordPoolBusy()
+        with self._lock:
+            self.in_flight += 1
+        try:
+            future = self._get_executor().submit(fn, *args)
+        except Exception:
+            self._release(None)
+            raise
+        future.add_done_callback(self._release)
+        return future
+
+    def _release(self, _future):
+        with self._lock:
+            self.in_flight -= 1
+            self.completed += 1
+        self._slots.release()
+
+    def _verified(self, result):
+        verified, new_hash = result
+        if new_hash:
+            self.upgraded += 1
+        return verified, new_hash
+
+    def hash(self, password: str):
+        return self._submit(hashing.hash_password, password).result()
+
+    def verify_and_update(self, password: str, hashed_password: str):
+        future = self._submit(hashing.verify_and_update, password, hashed_password)
+        return self._verified(future.result())
+
+    #Async variants: await the worker without holding a thread
+    async def hash_async(self, password: str):
+        return await asyncio.wrap_future(self._submit(hashing.hash_password, password))
+
+    async def verify_and_update_async(self, password: str, hashed_password: str):
+        future = self._submit(hashing.verify_and_update, password, hashed_password)
+        return self._verified(await asyncio.wrap_future(future))
+
+    def warm_up(self):
+        """Start the worker processes ahead of the first login."""
+        executor = self._get_executor()
+        for _ in range(self.workers):
+            executor.submit(int)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def stats(self):
+        return {
+            "workers": self.workers,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "upgraded_hashes": self.upgraded,
+        }
+
+
+password_pool = PasswordHashPool()
+
+queue_depth.set_function(lambda: password_pool.in_flight, queue="password_hash")
@@ -0,0 +1,76 @@
+import threading
+import time
+from dataclasses import dataclass
+from app.config import AUTH_CACHE_SIZE, AUTH_CACHE_TTL_SECONDS
+from app.db.models import User, UserRole
+from app.utils.ttl_cache import TTLCache
+from app.utils.metrics import observe_cache_stats
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Immutable snapshot of the authenticated user, safe to share across requests."""
+    id: int
+    name: str
+    email: str
+    role: UserRole
+
+
+_principal_cache = TTLCache(maxsize=AUTH_CACHE_SIZE, ttl=AUTH_CACHE_TTL_SECONDS)
+
+# user id -> monotonic time of its last invalidation. Snapshots loaded before it are
+# stale; records older than the cache TTL are dropped, as those snapshots have expired
+_invalidated_at = {}
+_invalidation_lock = threading.Lock()
+_invalidations = 0
+
+
+def snapshot_user(user: User):
+    return Principal(id=user.id, name=user.name, email=user.email, role=user.role)
+
+
+def get_cached_principal(token: str):
+    entry = _principal_cache.get(token)
+    if entry is None:
+        return None
+    principal, loaded_at = entry
+    invalidated_at = _invalidated_at.get(principal.id)
+    if invalidated_at is not None and loaded_at <= invalidated_at:
+        _principal_cache.pop(token)
+        return None
+    return principal
+
+
+def cache_principal(token: str, principal: Principal, expires_at: float = None, loaded_at: float = None):
+    """
+    Cache until the TTL or the token's own expiry, whichever comes first.
+    ``loaded_at`` is the time.monotonic() before the user row was read.
+    """
+    ttl = AUTH_CACHE_TTL_SECONDS
+    if expires_at is not None:
+        ttl = min(ttl, expires_at - time.time())
+    if ttl <= 0:
+        return
+    _principal_cache.set(token, (principal, loaded_at or time.monotonic()), ttl=ttl)
+
+
+def invalidate_user(user_id: int):
+    """Call after a user's role changes or the user is deleted."""
+    global _invalidations
+    now = time.monotonic()
+    with _invalidation_lock:
+        for expired in [uid for uid, at in _invalidated_at.items() if at < now - AUTH_CACHE_TTL_SECONDS]:
+            del _invalidated_at[expired]
+        _invalidated_at[user_id] = now
+        _invalidations += 1
+
+
+def clear_principal_cache():
+    _principal_cache.clear()
+
+
+def get_principal_cache_stats():
+    return {**_principal_cache.stats(), "invalidations": _invalidations}
+
+
+observe_cache_stats("principal", get_principal_cache_stats)
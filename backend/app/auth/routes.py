@@ -1,32 +1,53 @@
 from fastapi import APIRouter, Depends, HTTPException, status
-from sqlalchemy.orm import Session
-from app.db.connection import get_db
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.db.connection import get_async_db
 from app.db.models import User, UserRole
 from app.auth.schemas import UserRegister, UserLogin, TokenResponse
-from app.auth.utils import hash_password, verify_password, create_access_token
+from app.auth.utils import create_access_token
+from app.auth.password_pool import password_pool, PasswordPoolBusy
+from app.auth.dependencies import require_admin
+from app.auth.principal_cache import get_principal_cache_stats
+from app.utils.metrics import db_query_seconds
 
 router = APIRouter(prefix="/auth", tags=["Authentication"])
 
 
+async def _find_user(db: AsyncSession, email: str):
+    with db_query_seconds.time(group="user_lookup"):
+        return (await db.execute(select(User).where(User.email == email))).scalars().first()
+
+
+def _busy():
+    return HTTPException(
+        status_code=503,
+        detail="Too many sign-in requests, please retry shortly",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.get("/ping")
-def ping_test():
+async def ping_test():
     print("/auth router is working fine")
     return {"message": "Auth route working fine!"}
 
 
 #Register New Citizen
 @router.post("/register", response_model=TokenResponse)
-def register_user(data: UserRegister, db: Session = Depends(get_db)):
+async def register_user(data: UserRegister, db: AsyncSession = Depends(get_async_db)):
     """Register a new citizen user"""
     print("Register request received:", data.dict())
 
     # Check if email already exists
-    existing_user = db.query(User).filter(User.email == data.email).first()
+    existing_user = await _find_user(db, data.email)
     if existing_user:
         raise HTTPException(status_code=400, detail="Email already registered")
 
     #Hash password
-    hashed_pw = hash_password(data.password)
+    try:
+        hashed_pw = await password_pool.hash_async(data.password)
+    except PasswordPoolBusy:
+        raise _busy()
 
     #Create new user with role = user
     new_user = User(
@@ -39,11 +60,11 @@ def register_user(data: UserRegister, db: Session = Depends(get_db)):
     #Save to DB with error handling
     try:
         db.add(new_user)
-        db.commit()
-        db.refresh(new_user)
+        await db.commit()
+        await db.refresh(new_user)
         print(f"User created successfully: {new_user.email}")
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         print(f"Database error: {e}")
         raise HTTPException(status_code=500, detail=f"Database error: {e}")
 
@@ -58,17 +79,32 @@ def register_user(data: UserRegister, db: Session = Depends(get_db)):
 
 #Login User or Admin
 @router.post("/login", response_model=TokenResponse)
-def login_user(data: UserLogin, db: Session = Depends(get_db)):
+async def login_user(data: UserLogin, db: AsyncSession = Depends(get_async_db)):
     """Login for both users and admin"""
     print("Login attempt for:", data.email)
 
-    user = db.query(User).filter(User.email == data.email).first()
+    user = await _find_user(db, data.email)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
-    if not verify_password(data.password, user.password_hash):
+    try:
+        verified, new_hash = await password_pool.verify_and_update_async(
+            data.password, user.password_hash
+        )
+    except PasswordPoolBusy:
+        raise _busy()
+    if not verified:
         raise HTTPException(status_code=401, detail="Invalid email or password")
 
+    #Re-hash with the current cost settings
+    if new_hash:
+        try:
+            user.password_hash = new_hash
+            await db.commit()
+        except Exception as e:
+            await db.rollback()
+            print(f"Could not upgrade password hash for {user.email}: {e}")
+
     print(f"Login successful for {user.email} (role: {user.role.value})")
 
     # Generate JWT token
@@ -78,3 +114,15 @@ def login_user(data: UserLogin, db: Session = Depends(get_db)):
     })
 
     return {"access_token": token, "token_type": "bearer"}
+
+
+#Principal cache hit rate
+@router.get("/cache/stats", dependencies=[Depends(require_admin)])
+async def principal_cache_stats():
+    return get_principal_cache_stats()
+
+
+#Password hashing pool load
+@router.get("/hashing/stats", dependencies=[Depends(require_admin)])
+async def password_pool_stats():
+    return password_pool.stats()
@@ -1,7 +1,7 @@
 from datetime import datetime, timedelta
 from jose import JWTError, jwt
-from passlib.context import CryptContext
 from app.db.models import User
+from app.auth.hashing import pwd_context
 
 
 #JWT Settings
@@ -9,10 +9,7 @@ SECRET_KEY = "secretigrsbackendkey"
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 60 * 24  # 1 day
 
-#Password hashing context
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-
-#Hashing Function
+#Hashing Function (in-process; request handlers go through password_pool)
 def hash_password(password: str):
     return pwd_context.hash(password)
 
@@ -0,0 +1,98 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+#Background enrichment (geocoding + AI solution) for submitted grievances
+ENRICHMENT_WORKERS = int(os.getenv("ENRICHMENT_WORKERS", "4"))
+# Attempts per grievance before it is released without coordinates/AI solution
+ENRICHMENT_MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3"))
+ENRICHMENT_RETRY_DELAY_SECONDS = float(os.getenv("ENRICHMENT_RETRY_DELAY_SECONDS", "2"))  # doubles per attempt
+# A 'Processing' grievance whose claim was not renewed for this long belongs to a dead
+# process and is taken over; live processes renew their claims every third of it
+ENRICHMENT_CLAIM_SECONDS = int(os.getenv("ENRICHMENT_CLAIM_SECONDS", "300"))
+
+#Geocode cache (in-process LRU in front of the geocode_cache table)
+GEOCODE_CACHE_SIZE = int(os.getenv("GEOCODE_CACHE_SIZE", "2048"))
+GEOCODE_CACHE_TTL_SECONDS = int(os.getenv("GEOCODE_CACHE_TTL_SECONDS", str(24 * 3600)))
+GEOCODE_DB_TTL_DAYS = int(os.getenv("GEOCODE_DB_TTL_DAYS", "90"))
+
+#Gemini response cache (llm_response_cache table)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_TTL_SECONDS = int(os.getenv("LLM_CACHE_TTL_SECONDS", str(7 * 24 * 3600)))
+
+#Gemini classification batching
+CLASSIFY_BATCH_MAX_SIZE = int(os.getenv("CLASSIFY_BATCH_MAX_SIZE", "20"))
+CLASSIFY_BATCH_WINDOW_MS = int(os.getenv("CLASSIFY_BATCH_WINDOW_MS", "10"))
+CLASSIFY_BATCH_MAX_IN_FLIGHT = int(os.getenv("CLASSIFY_BATCH_MAX_IN_FLIGHT", "4"))
+
+#Gemini deadlines (seconds per call, SDK retries off) and circuit breaker
+GEMINI_TIMEOUT_SECONDS = float(os.getenv("GEMINI_TIMEOUT_SECONDS", "15"))
+GEMINI_CLASSIFY_TIMEOUT_SECONDS = float(os.getenv("GEMINI_CLASSIFY_TIMEOUT_SECONDS", "5"))
+# Calls slower than this succeed but count as failures towards opening the breaker
+GEMINI_SLOW_CALL_SECONDS = float(os.getenv("GEMINI_SLOW_CALL_SECONDS", "8"))
+GEMINI_BREAKER_FAILURES = int(os.getenv("GEMINI_BREAKER_FAILURES", "5"))
+GEMINI_BREAKER_OPEN_SECONDS = float(os.getenv("GEMINI_BREAKER_OPEN_SECONDS", "30"))
+# Longest wait for a solution another thread is already generating before generating it anyway
+SOLUTION_WAIT_SECONDS = float(os.getenv("SOLUTION_WAIT_SECONDS", "60"))
+
+#Forecast horizons (days) precomputed for every category per model version
+FORECAST_HORIZONS = tuple(
+    int(days) for days in os.getenv("FORECAST_HORIZONS", "7,30,90").split(",") if days.strip()
+)
+
+#Micro-hotspot clustering (incremental MiniBatchKMeans)
+HOTSPOT_CLUSTERS = int(os.getenv("HOTSPOT_CLUSTERS", "5"))
+HOTSPOT_REFIT_NEW_POINTS = int(os.getenv("HOTSPOT_REFIT_NEW_POINTS", "1000"))
+HOTSPOT_REFIT_SECONDS = int(os.getenv("HOTSPOT_REFIT_SECONDS", "3600"))
+
+#Forecast model store written by retrains (gitignored by default); the shipped
+#app/models/forecast/store/ seed is only read until the first publish here
+FORECAST_MODEL_DIR = os.getenv("FORECAST_MODEL_DIR", "app/models/forecast/runtime")
+
+#Forecast retraining (0 = one process per CPU core)
+RETRAIN_WORKERS = int(os.getenv("RETRAIN_WORKERS", "0"))
+
+#Retrain scheduler triggers
+RETRAIN_NEW_ROWS = int(os.getenv("RETRAIN_NEW_ROWS", "500"))
+RETRAIN_INTERVAL_SECONDS = int(os.getenv("RETRAIN_INTERVAL_SECONDS", str(24 * 3600)))
+RETRAIN_CHECK_SECONDS = int(os.getenv("RETRAIN_CHECK_SECONDS", "300"))
+# A fresh instance serves traffic this long before a trigger may start a retrain
+RETRAIN_STARTUP_DELAY_SECONDS = int(os.getenv("RETRAIN_STARTUP_DELAY_SECONDS", "900"))
+# Extra niceness of the Prophet fitting processes, so API threads win the CPU
+RETRAIN_NICENESS = int(os.getenv("RETRAIN_NICENESS", "10"))
+
+#Authenticated principal cache (token -> user snapshot, skips the users lookup)
+AUTH_CACHE_SIZE = int(os.getenv("AUTH_CACHE_SIZE", "4096"))
+AUTH_CACHE_TTL_SECONDS = int(os.getenv("AUTH_CACHE_TTL_SECONDS", "60"))
+
+#Password hashing (bcrypt in a dedicated process pool)
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+PASSWORD_HASH_WORKERS = int(os.getenv("PASSWORD_HASH_WORKERS", "2"))
+PASSWORD_HASH_MAX_QUEUE = int(os.getenv("PASSWORD_HASH_MAX_QUEUE", "16"))
+
+#Local classifier (keyword matcher + TF-IDF model); Gemini only below the threshold
+LOCAL_CLASSIFIER_THRESHOLD = float(os.getenv("LOCAL_CLASSIFIER_THRESHOLD", "0.7"))
+LOCAL_CLASSIFIER_TRAINING_SIZE = int(os.getenv("LOCAL_CLASSIFIER_TRAINING_SIZE", "6000"))
+# Share of a text's content words the model must know for its confidence to count in full
+LOCAL_CLASSIFIER_FULL_COVERAGE = float(os.getenv("LOCAL_CLASSIFIER_FULL_COVERAGE", "0.5"))
+
+#Bulk ingest of historical grievances (rows per insert + checkpoint)
+BULK_INGEST_BATCH_SIZE = int(os.getenv("BULK_INGEST_BATCH_SIZE", "1000"))
+
+#Database connection pools (sync engine for workers/scripts, async engine for routes)
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "10"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "20"))
+DB_POOL_TIMEOUT = int(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))  # below typical idle timeouts
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() == "true"
+
+#External API endpoints (point at benchmarks/stub_apis.py for load tests; empty = the real services)
+GEMINI_API_ENDPOINT = os.getenv("GEMINI_API_ENDPOINT", "")
+OPENCAGE_API_URL = os.getenv("OPENCAGE_API_URL", "")
+
+#Health checks and startup
+HEALTH_DB_TIMEOUT_SECONDS = float(os.getenv("HEALTH_DB_TIMEOUT_SECONDS", "2"))
+# Median `import app.main` time allowed by check_import_time.py
+IMPORT_TIME_BUDGET_MS = int(os.getenv("IMPORT_TIME_BUDGET_MS", "1500"))
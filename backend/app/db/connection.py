@@ -1,16 +1,66 @@
 import os
 from sqlalchemy import create_engine
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker, AsyncSession
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from app.config import (
+    DB_POOL_SIZE, DB_MAX_OVERFLOW, DB_POOL_TIMEOUT, DB_POOL_RECYCLE, DB_POOL_PRE_PING
+)
 
 load_dotenv()
 
 DATABASE_URL = os.getenv("DATABASE_URL")
 
-engine = create_engine(DATABASE_URL)
+# asyncpg takes ssl as a connect argument, not libpq's sslmode/channel_binding
+_LIBPQ_ONLY_PARAMS = ("sslmode", "channel_binding")
+
+
+def _pool_options(url):
+    """Pool tuning; in-memory SQLite keeps SQLAlchemy's single-connection pool."""
+    if url.get_backend_name() == "sqlite" and url.database in (None, "", ":memory:"):
+        return {}
+    return {
+        "pool_size": DB_POOL_SIZE,
+        "max_overflow": DB_MAX_OVERFLOW,
+        "pool_timeout": DB_POOL_TIMEOUT,
+        "pool_recycle": DB_POOL_RECYCLE,
+        "pool_pre_ping": DB_POOL_PRE_PING,  # drop connections the server closed
+    }
+
+
+def _async_url(url):
+    """Same database through an asyncio driver; returns (url, connect_args)."""
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        return url.set(drivername="sqlite+aiosqlite"), {}
+    if backend != "postgresql":
+        return url, {}
+
+    connect_args = {}
+    query = dict(url.query)
+    sslmode = query.get("sslmode")
+    if sslmode and sslmode != "disable":
+        connect_args["ssl"] = sslmode if sslmode in ("require", "prefer", "allow") else True
+    for name in _LIBPQ_ONLY_PARAMS:
+        query.pop(name, None)
+    return url.set(drivername="postgresql+asyncpg", query=query), connect_args
+
+
+_url = make_url(DATABASE_URL)
+
+engine = create_engine(_url, **_pool_options(_url))
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+_async_db_url, _async_connect_args = _async_url(_url)
+async_engine = create_async_engine(
+    _async_db_url, connect_args=_async_connect_args, **_pool_options(_url)
+)
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
 Base = declarative_base()
 
 def get_db():
@@ -18,4 +68,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close()
\ No newline at end of file
+        db.close()
+
+async def get_async_db():
+    """Request-scoped AsyncSession for the async routes."""
+    async with AsyncSessionLocal() as db:
+        yield db
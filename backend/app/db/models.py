@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Enum, ForeignKey
+from sqlalchemy import Column, Integer, String, Text, Date, DateTime, Enum, ForeignKey, Float, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -33,11 +33,73 @@ class Grievance(Base):
     category = Column(String(100))
     priority = Column(String(50))
     region = Column(String(150))
-    latitude = Column(String(50))
-    longitude = Column(String(50))
+    latitude = Column(Float)
+    longitude = Column(Float)
+    geohash = Column(String(12), index=True)
     solution = Column(Text)
     status = Column(String(50), default="Pending")
     created_at = Column(DateTime, default=datetime.utcnow)
     user_id = Column(Integer, ForeignKey("users.id"))
+    # Process enriching a 'Processing' grievance, and when it last renewed that claim
+    enrichment_claimed_by = Column(String(32))
+    enrichment_claimed_at = Column(DateTime)
     user = relationship("User", backref="grievances")
-    
\ No newline at end of file
+
+    __table_args__ = (
+        Index("ix_grievances_lat_lng", "latitude", "longitude"),
+        # Keyset pagination on (created_at, id), alone and behind the common filters
+        Index("ix_grievances_created_id", "created_at", "id"),
+        Index("ix_grievances_user_created", "user_id", "created_at", "id"),
+        Index("ix_grievances_status_created", "status", "created_at", "id"),
+        Index("ix_grievances_category_created", "category", "created_at", "id"),
+        Index("ix_grievances_priority_created", "priority", "created_at", "id"),
+        Index("ix_grievances_region_created", "region", "created_at", "id"),
+    )
+
+
+#Persistent geocode cache (seeded from the bundled UP gazetteer)
+class GeocodeCache(Base):
+    __tablename__ = "geocode_cache"
+
+    region_key = Column(String(150), primary_key=True)
+    latitude = Column(Float, nullable=True)
+    longitude = Column(Float, nullable=True)
+    source = Column(String(20), default="opencage")  # gazetteer / opencage
+    updated_at = Column(DateTime, default=datetime.utcnow)
+
+
+#Gemini responses keyed by hash(model + normalized prompt)
+class LLMResponseCache(Base):
+    __tablename__ = "llm_response_cache"
+
+    cache_key = Column(String(64), primary_key=True)
+    model = Column(String(100), nullable=False)
+    response = Column(Text, nullable=False)
+    created_at = Column(DateTime, default=datetime.utcnow)
+    last_accessed_at = Column(DateTime, default=datetime.utcnow, index=True)
+    expires_at = Column(DateTime, index=True)
+
+
+#Daily rollup of grievance counts, maintained on submit and status change
+class GrievanceDailyCount(Base):
+    __tablename__ = "grievance_daily_counts"
+
+    day = Column(Date, primary_key=True)
+    region = Column(String(150), primary_key=True)  # "" when unknown
+    category = Column(String(100), primary_key=True)  # "" when unknown
+    status = Column(String(50), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+
+
+#Progress of a bulk ingest job, committed together with each batch
+class IngestCheckpoint(Base):
+    __tablename__ = "ingest_checkpoints"
+
+    job_id = Column(String(100), primary_key=True)
+    source = Column(String(255))
+    rows_done = Column(Integer, nullable=False, default=0)  # input records consumed
+    inserted = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    status = Column(String(20), default="running")  # running / completed / failed
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow)
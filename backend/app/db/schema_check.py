@@ -0,0 +1,43 @@
+from sqlalchemy import inspect
+from app.db.connection import Base, engine
+from app.db import models  # registers the tables on Base.metadata
+
+MIGRATE_HINT = "Run `python migrate_db.py` from backend/ (safe to repeat), then restart."
+
+
+class SchemaOutOfDate(RuntimeError):
+    """The database predates the models: tables or columns are missing, or have the old types."""
+
+
+def find_schema_problems(bind=engine):
+    """Differences between the database and the models that break the API, as readable strings."""
+    inspector = inspect(bind)
+    problems = []
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            problems.append(f"table {table.name} is missing")
+            continue
+        columns = {column["name"]: column for column in inspector.get_columns(table.name)}
+        missing = [name for name in table.columns.keys() if name not in columns]
+        if missing:
+            problems.append(f"{table.name} is missing column(s) {', '.join(missing)}")
+        # Coordinates were stored as strings before they became floats
+        if table.name == "grievances":
+            for name in ("latitude", "longitude"):
+                if name in columns and "CHAR" in str(columns[name]["type"]).upper():
+                    problems.append(f"grievances.{name} is still {columns[name]['type']}, not a float")
+    return problems
+
+
+def check_schema(bind=engine):
+    """
+    Fail fast at startup on an outdated schema instead of answering 500s later.
+    An unreachable database is only reported: /health/ready covers that.
+    """
+    try:
+        problems = find_schema_problems(bind)
+    except Exception as e:
+        print("Schema check skipped, database not reachable:", e)
+        return
+    if problems:
+        raise SchemaOutOfDate("Database schema is out of date: " + "; ".join(problems) + ". " + MIGRATE_HINT)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Optional
+from typing import Optional, List
 from datetime import datetime
 
 class GrievanceCreate(BaseModel):
@@ -19,3 +19,16 @@ class GrievanceResponse(BaseModel):
 
     class Config:
         from_attributes = True
+
+
+class MapCell(BaseModel):
+    geohash: str
+    latitude: float
+    longitude: float
+    count: int
+
+
+class MapViewportResponse(BaseModel):
+    total: int
+    cells: List[MapCell]
+    grievances: List[GrievanceResponse]
@@ -1,10 +1,19 @@
-from fastapi import FastAPI
+from fastapi import FastAPI, Response
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import grievance
-from app.routes import grievance, analytics
+from app.routes import grievance, analytics, health
 from app.auth.routes import router as auth_router
-from app.services.forecast_manager import load_forecast_models, retrain_forecast_models_async
+from app.services.forecast_manager import get_forecast_state
 from app.routes import ai_router
+from app.services.enrichment_worker import start_enrichment_workers
+from app.services.geocode_service import seed_geocode_cache
+from app.services.retrain_scheduler import retrain_scheduler
+from app.auth.password_pool import password_pool
+from app.services.local_classifier import get_model as get_local_model
+from app.services.warmup import start_warm_up
+from app.db.connection import async_engine
+from app.db.schema_check import check_schema
+from app.utils.metrics import MetricsMiddleware, render_metrics, CONTENT_TYPE
 
 
 app = FastAPI(
@@ -21,13 +30,16 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Ingest-Job-Id", "Content-Disposition"],
 )
+app.add_middleware(MetricsMiddleware)
 
 #Routers
 app.include_router(auth_router)
 app.include_router(grievance.router)
 app.include_router(analytics.router)
 app.include_router(ai_router.router)
+app.include_router(health.router)
 
 
 # app.include_router(chatbot.router)
@@ -35,9 +47,29 @@ app.include_router(ai_router.router)
 @app.on_event("startup")
 def startup_event():
     print("Starting IGRS backend...")
-    load_forecast_models()
-    retrain_forecast_models_async()
-    
+    # An outdated database would fail on the first submit: refuse to start instead
+    check_schema()
+    # In the background, cheapest and most needed first; /health/ready reports progress
+    start_warm_up([
+        ("geocode_cache", seed_geocode_cache),
+        ("enrichment_workers", start_enrichment_workers),
+        ("password_pool", password_pool.warm_up),
+        ("forecast_manifest", get_forecast_state),
+        ("local_classifier", get_local_model),
+        ("retrain_scheduler", retrain_scheduler.start),
+    ])
+
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    password_pool.shutdown()
+    await async_engine.dispose()
+
+
+#Prometheus scrape endpoint
+@app.get("/metrics", include_in_schema=False)
+def metrics():
+    return Response(render_metrics(), media_type=CONTENT_TYPE)
 
 
 @app.get("/")
@@ -1,17 +1,49 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from app.services.gemini_classifier import classify_grievance
-from app.services.gemini_service import generate_solution
+from typing import List
+from app.services.nlp_processor import classify_with_fallback, classify_batch_with_fallback
+from app.services.local_classifier import get_local_classifier_stats
+from app.services.gemini_service import generate_solution, solution_event_stream
+from app.utils.sse import SSE_HEADERS, wants_event_stream
+from app.services.llm_cache import get_llm_cache_stats
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
+MAX_BATCH_REQUEST_ITEMS = 1000
+
 class GrievanceRequest(BaseModel):
     text: str
 
+class GrievanceBatchRequest(BaseModel):
+    texts: List[str]
+
 @router.post("/classify")
 def classify_grievance_route(req: GrievanceRequest):
-    return classify_grievance(req.text)
+    return classify_with_fallback(req.text)
+
+@router.post("/classify/batch")
+def classify_grievance_batch_route(req: GrievanceBatchRequest):
+    if len(req.texts) > MAX_BATCH_REQUEST_ITEMS:
+        raise HTTPException(
+            status_code=413,
+            detail=f"At most {MAX_BATCH_REQUEST_ITEMS} grievances per batch request"
+        )
+    return {"results": classify_batch_with_fallback(req.texts)}
+
+@router.get("/classify/stats")
+def local_classifier_stats_route():
+    return get_local_classifier_stats()
 
 @router.post("/solution")
-def generate_solution_route(req: GrievanceRequest):
+def generate_solution_route(req: GrievanceRequest, request: Request, stream: bool = False):
+    # ?stream=true or Accept: text/event-stream -> tokens as Server-Sent Events
+    if stream or wants_event_stream(request.headers.get("accept")):
+        return StreamingResponse(
+            solution_event_stream(req.text), media_type="text/event-stream", headers=SSE_HEADERS
+        )
     return {"solution": generate_solution(req.text)}
+
+@router.get("/cache/stats")
+def llm_cache_stats_route():
+    return get_llm_cache_stats()
@@ -1,35 +1,107 @@
-from fastapi import APIRouter, HTTPException
+from fastapi import APIRouter, HTTPException, Request, Response, Depends
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import date
+from typing import Optional
+from app.db.connection import get_async_db
+from app.services.rollup_service import get_count_totals
+from app.services.grievance_listing import count_by_priority
 from app.services.analytics_service import generate_forecast
-from app.services.retrain_service import retrain_forecast_models
+from app.services.retrain_scheduler import retrain_scheduler
 from app.services.hotspot_service import detect_hotspots
 from app.services.hotspot_trend_service import get_hotspot_trends
+from app.services.geocode_service import get_geocode_stats
+from app.auth.dependencies import require_admin
+from app.utils.metrics import db_query_seconds
 
 router = APIRouter(prefix="/analytics", tags=["Analytics"])
 
 @router.get("/forecast/{category}")
-def get_forecast(category: str):
+async def get_forecast(category: str, request: Request, response: Response, days: int = 30):
     """Return forecast + smart summary for a grievance category"""
-    result = generate_forecast(category)
+    if not 1 <= days <= 365:
+        raise HTTPException(status_code=400, detail="days must be between 1 and 365")
+
+    # Prophet prediction / Gemini summary on a cache miss: keep it off the event loop
+    result = await run_in_threadpool(generate_forecast, category, days)
     if "error" in result:
         raise HTTPException(status_code=404, detail=result["error"])
+
+    # Payload only changes when a new model set is installed, or a templated summary is replaced
+    degraded = "-templated" if result.get("summary_degraded") else ""
+    etag = f'"{result["model_version"]}-{category}-{days}{degraded}"'
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
     return result
 
 
-@router.post("/retrain")
-def retrain_model():
-    """Force retraining using real grievance data"""
-    success = retrain_forecast_models()
-    if not success:
-        return {"message": "Not enough data yet. Using trained data model."}
-    return {"message": "Model retrained successfully using real data."}
+@router.post("/retrain", status_code=202)
+async def retrain_model(admin=Depends(require_admin)):
+    """Queue a retrain using real grievance data; returns the job to poll."""
+    job = retrain_scheduler.submit("manual")
+    return job.to_dict()
+
+
+@router.get("/retrain")
+async def list_retrain_jobs(admin=Depends(require_admin)):
+    """Recent retrain jobs, newest first."""
+    return retrain_scheduler.list_jobs()
+
+
+@router.get("/retrain/{job_id}")
+async def get_retrain_job(job_id: str, admin=Depends(require_admin)):
+    """Status, progress and timing of a retrain job."""
+    job = retrain_scheduler.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Retrain job not found")
+    return job.to_dict()
+
+
+@router.delete("/retrain/{job_id}")
+async def cancel_retrain_job(job_id: str, admin=Depends(require_admin)):
+    """Cancel a queued job, or stop a running one before it installs new models."""
+    job = retrain_scheduler.cancel(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Retrain job not found")
+    return job.to_dict()
 
 
 @router.get("/hotspots/trends")
-def get_hotspot_trend(limit: int = 5):
+async def get_hotspot_trend(limit: int = 5):
     """Hybrid insight: real hotspots + predicted trend"""
-    return get_hotspot_trends(limit)
+    return await run_in_threadpool(get_hotspot_trends, limit)
 
 @router.get("/hotspots")
-def get_hotspots(limit: int = 10, use_clustering: bool = True):
+async def get_hotspots(limit: int = 10, use_clustering: bool = True):
     """Return macro and micro hotspots."""
-    return detect_hotspots(limit, use_clustering)
\ No newline at end of file
+    return await run_in_threadpool(detect_hotspots, limit, use_clustering)
+
+
+@router.get("/geocode/stats")
+async def geocode_stats():
+    """Hit/miss counters of the geocode cache levels."""
+    return get_geocode_stats()
+
+
+@router.get("/counts")
+async def get_counts(
+    group_by: str = "status",
+    start: Optional[date] = None,
+    end: Optional[date] = None,
+    region: Optional[str] = None,
+    category: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db),
+    admin=Depends(require_admin),
+):
+    """Dashboard counts per status, category or region from the daily rollup (priority from grievances)."""
+    if group_by not in ("status", "category", "region", "priority"):
+        raise HTTPException(status_code=400, detail="group_by must be status, category, region or priority")
+    if group_by == "priority":
+        with db_query_seconds.time(group="priority_counts"):
+            return await db.run_sync(count_by_priority, start=start, end=end, region=region, category=category)
+    with db_query_seconds.time(group="rollup_counts"):
+        return await db.run_sync(
+            get_count_totals, group_by, start=start, end=end, region=region, category=category
+        )
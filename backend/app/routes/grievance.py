@@ -1,90 +1,275 @@
-from fastapi import APIRouter, HTTPException, Depends
-from sqlalchemy.orm import Session
-from typing import List
+import json
+import tempfile
+import uuid
+from datetime import datetime
+from fastapi import APIRouter, HTTPException, Depends, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import List, Optional
 
 from app.db import models, schemas, connection
-from app.services.nlp_processor import process_grievance
+from app.services.nlp_processor import classify_locally
+from app.services.enrichment_worker import (
+    enqueue_grievance, enrichment_claim, solution_stream_events, PROCESSING_STATUS
+)
+from app.services.gemini_service import saved_solution_events
+from app.utils.sse import SSE_HEADERS
+from app.services.map_service import get_viewport_grievances
+from app.services.rollup_service import record_grievance_created, record_status_change
+from app.services.bulk_ingest import ingest_stream
+from app.services.grievance_export import stream_export, MEDIA_TYPES
+from app.services.grievance_listing import (
+    DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, grievance_filters, apply_grievance_filters, paginate_grievances
+)
 from app.auth.dependencies import get_current_user, require_admin
+from app.auth.principal_cache import Principal
+from app.utils.metrics import db_query_seconds, pipeline_stage_seconds
 
 
 router = APIRouter(prefix="/grievance", tags=["Grievance"])
 
 
+async def _get_visible_grievance(db: AsyncSession, grievance_id: int, current_user: Principal):
+    """The grievance if it belongs to the user (or the user is an admin), else 404."""
+    with db_query_seconds.time(group="grievance_lookup"):
+        grievance = await db.get(models.Grievance, grievance_id)
+    is_owner = grievance is not None and grievance.user_id == current_user.id
+    if not grievance or not (is_owner or current_user.role.value == "admin"):
+        raise HTTPException(status_code=404, detail="Grievance not found")
+    return grievance
+
+
 #Submit a new grievance (USER only)
 @router.post("/submit", response_model=schemas.GrievanceResponse)
-def submit_grievance(
+async def submit_grievance(
     grievance: schemas.GrievanceCreate,
-    db: Session = Depends(connection.get_db),
-    current_user: models.User = Depends(get_current_user)
+    db: AsyncSession = Depends(connection.get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
     Allows a logged-in user to submit a grievance.
-    Automatically processes it using the NLP module
-    and links it to the user's ID.
+    Runs the fast keyword rules, saves it with status 'Processing'
+    and hands geocoding + AI solution to the background workers.
     """
     try:
-        # Run NLP pipeline for categorization, priority, and region extraction
-        processed = process_grievance(grievance.description)
+        # Local categorization, priority, and region extraction
+        processed = await run_in_threadpool(classify_locally, grievance.description)
 
         # Link the grievance to the logged-in user
         new_grievance = models.Grievance(
             **processed,
-            user_id=current_user.id
+            status=PROCESSING_STATUS,
+            user_id=current_user.id,
+            **enrichment_claim()  # this process enriches it; no other sweep picks it up
         )
 
-        db.add(new_grievance)
-        db.commit()
-        db.refresh(new_grievance)
-
-        return new_grievance
+        with pipeline_stage_seconds.time(stage="db_commit"):
+            db.add(new_grievance)
+            await db.flush()
+            await db.run_sync(record_grievance_created, new_grievance)
+            await db.commit()
+            await db.refresh(new_grievance)
 
     except Exception as e:
+        await db.rollback()
         print(f"Error while submitting grievance: {e}")
         raise HTTPException(status_code=500, detail="Failed to submit grievance")
 
+    enqueue_grievance(new_grievance.id, new_grievance.priority)
+    return new_grievance
+
+
+#Poll a grievance until background enrichment has finished
+@router.get("/{grievance_id}/status", response_model=schemas.GrievanceResponse)
+async def get_grievance_status(
+    grievance_id: int,
+    db: AsyncSession = Depends(connection.get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Returns the current state of a grievance. While status is
+    'Processing' the location and solution are still being generated.
+    """
+    return await _get_visible_grievance(db, grievance_id, current_user)
+
+
+#Stream the AI solution of a grievance as Server-Sent Events
+@router.get("/{grievance_id}/solution/stream")
+async def stream_grievance_solution(
+    grievance_id: int,
+    db: AsyncSession = Depends(connection.get_async_db),
+    current_user: Principal = Depends(get_current_user)
+):
+    """
+    Lets the submit page show the solution while Gemini writes it instead of
+    polling /status. Emits "token" events and a final "done" event; the finished
+    text is saved to the grievance unless a solution was saved first. While the
+    enrichment worker is generating it, the stream waits for the worker's answer.
+    """
+    grievance = await _get_visible_grievance(db, grievance_id, current_user)
+
+    if grievance.solution:
+        events = saved_solution_events(grievance.solution)
+    else:
+        events = solution_stream_events(grievance_id, grievance.description)
+    return StreamingResponse(events, media_type="text/event-stream", headers=SSE_HEADERS)
+
 
 #Get all grievances for the logged-in user
 @router.get("/my-grievances", response_model=List[schemas.GrievanceResponse])
-def get_my_grievances(
-    db: Session = Depends(connection.get_db),
-    current_user: models.User = Depends(get_current_user)
+async def get_my_grievances(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    filters: dict = Depends(grievance_filters),
+    db: AsyncSession = Depends(connection.get_async_db),
+    current_user: Principal = Depends(get_current_user)
 ):
     """
-    Fetch all grievances submitted by the currently logged-in user.
+    Fetch grievances submitted by the currently logged-in user, newest first.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
     """
-    grievances = db.query(models.Grievance).filter(models.Grievance.user_id == current_user.id).all()
+    def page(session):
+        query = session.query(models.Grievance).filter(models.Grievance.user_id == current_user.id)
+        return paginate_grievances(apply_grievance_filters(query, filters), cursor, limit)
+
+    with db_query_seconds.time(group="grievance_listing"):
+        grievances, next_cursor = await db.run_sync(page)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return grievances
 
 
 #Admin-only: View all grievances
 @router.get("/all", response_model=List[schemas.GrievanceResponse])
-def get_all_grievances(
-    db: Session = Depends(connection.get_db),
+async def get_all_grievances(
+    response: Response,
+    cursor: Optional[str] = None,
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    filters: dict = Depends(grievance_filters),
+    db: AsyncSession = Depends(connection.get_async_db),
     admin=Depends(require_admin)
 ):
     """
-    Allows admin to view all grievances in the system.
+    Allows admin to page through all grievances in the system, newest first,
+    filtered by status, category, priority, region and date range.
+    Pass the X-Next-Cursor response header back as `cursor` for the next page.
     """
-    grievances = db.query(models.Grievance).order_by(models.Grievance.created_at.desc()).all()
+    def page(session):
+        query = apply_grievance_filters(session.query(models.Grievance), filters)
+        return paginate_grievances(query, cursor, limit)
+
+    with db_query_seconds.time(group="grievance_listing"):
+        grievances, next_cursor = await db.run_sync(page)
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
     return grievances
 
 
+#Admin-only: Streaming export of (filtered) grievances
+@router.get("/export")
+async def export_grievances(
+    format: str = Query("csv", pattern="^(csv|ndjson)$"),
+    gzip: bool = False,
+    filters: dict = Depends(grievance_filters),
+    admin=Depends(require_admin)
+):
+    """
+    Downloads every grievance matching the listing filters as CSV or NDJSON,
+    optionally gzip-compressed. Rows are streamed as they are read.
+    """
+    file_name = f"grievances-{datetime.utcnow():%Y%m%d-%H%M%S}.{format}"
+    media_type = MEDIA_TYPES[format]
+    if gzip:
+        file_name += ".gz"
+        media_type = "application/gzip"
+    return StreamingResponse(
+        stream_export(filters, format, gzip),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+    )
+
+
+#Admin-only: Grievances inside the visible map area
+@router.get("/map", response_model=schemas.MapViewportResponse)
+async def get_map_viewport(
+    min_lat: float = Query(..., ge=-90, le=90),
+    min_lng: float = Query(..., ge=-180, le=180),
+    max_lat: float = Query(..., ge=-90, le=90),
+    max_lng: float = Query(..., ge=-180, le=180),
+    limit: int = Query(500, ge=1, le=5000),
+    precision: int = Query(5, ge=1, le=9),
+    db: AsyncSession = Depends(connection.get_async_db),
+    admin=Depends(require_admin)
+):
+    """
+    Returns grievances and geohash cell counts inside a bounding box,
+    so the map only loads what is visible.
+    """
+    if min_lat > max_lat or min_lng > max_lng:
+        raise HTTPException(status_code=400, detail="Invalid bounding box")
+    with db_query_seconds.time(group="map_viewport"):
+        return await db.run_sync(
+            get_viewport_grievances, min_lat, min_lng, max_lat, max_lng, limit, precision
+        )
+
+
+#Admin-only: Bulk import of historical grievances
+@router.post("/bulk-ingest")
+async def bulk_ingest(
+    request: Request,
+    format: Optional[str] = Query(None, pattern="^(csv|jsonl)$"),
+    job_id: Optional[str] = Query(None, max_length=100),
+    admin=Depends(require_admin)
+):
+    """
+    Imports a CSV or JSONL request body (description required; category, priority,
+    region, latitude, longitude, status, created_at, user_id optional).
+    The body is spooled to disk as it arrives and imported in batches; the response
+    streams NDJSON progress and one line per rejected row.
+    Re-send the same file with the returned job_id to resume an interrupted import.
+    """
+    if format is None:
+        format = "csv" if "csv" in request.headers.get("content-type", "") else "jsonl"
+    job_id = job_id or uuid.uuid4().hex
+
+    body = tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024)
+    async for chunk in request.stream():
+        body.write(chunk)
+    body.seek(0)
+
+    def events():
+        try:
+            for event in ingest_stream(body, format, job_id, source="upload"):
+                yield json.dumps(event, default=str) + "\n"
+        finally:
+            body.close()
+
+    return StreamingResponse(
+        events(), media_type="application/x-ndjson", headers={"X-Ingest-Job-Id": job_id}
+    )
+
+
 #Admin-only: Update grievance status
 @router.put("/{grievance_id}/status")
-def update_grievance_status(
+async def update_grievance_status(
     grievance_id: int,
     status: str,
-    db: Session = Depends(connection.get_db),
+    db: AsyncSession = Depends(connection.get_async_db),
     admin=Depends(require_admin)
 ):
     """
     Allows admin to update the status of a specific grievance.
     e.g., Resolved, In Progress, Closed, etc.
     """
-    grievance = db.query(models.Grievance).filter(models.Grievance.id == grievance_id).first()
-    if not grievance:
-        raise HTTPException(status_code=404, detail="Grievance not found")
+    with db_query_seconds.time(group="status_update"):
+        grievance = await db.get(models.Grievance, grievance_id)
+        if not grievance:
+            raise HTTPException(status_code=404, detail="Grievance not found")
 
-    grievance.status = status
-    db.commit()
+        old_status = grievance.status
+        grievance.status = status
+        await db.run_sync(record_status_change, grievance, old_status)
+        await db.commit()
     return {"message": f"Grievance ID {grievance_id} updated to status '{status}'."}
@@ -0,0 +1,52 @@
+import asyncio
+import time
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+from sqlalchemy import text
+from app.config import HEALTH_DB_TIMEOUT_SECONDS
+from app.db.connection import async_engine
+from app.services.warmup import get_warm_up_status
+from app.services.forecast_manager import get_forecast_status
+from app.services.local_classifier import get_local_classifier_stats
+from app.services.gemini_client import gemini_breaker
+from app.auth.password_pool import password_pool
+
+router = APIRouter(prefix="/health", tags=["Health"])
+
+_started_at = time.time()
+
+
+async def _ping_database():
+    async with async_engine.connect() as conn:
+        await conn.execute(text("SELECT 1"))
+
+
+@router.get("/live")
+def live():
+    """The process is up and serving; says nothing about dependencies."""
+    return {"status": "ok", "uptime_seconds": round(time.time() - _started_at, 1)}
+
+
+@router.get("/ready")
+async def ready():
+    """503 until warm-up has finished and the database answers; reports what is warmed up."""
+    start = time.perf_counter()
+    try:
+        await asyncio.wait_for(_ping_database(), HEALTH_DB_TIMEOUT_SECONDS)
+        database = {"ok": True}
+    except Exception as e:
+        database = {"ok": False, "error": str(e) or type(e).__name__}
+    database["seconds"] = round(time.perf_counter() - start, 4)
+
+    warm_up = get_warm_up_status()
+    is_ready = database["ok"] and warm_up["finished"]
+    return JSONResponse(status_code=200 if is_ready else 503, content={
+        "status": "ready" if is_ready else "starting" if not warm_up["finished"] else "unavailable",
+        "database": database,
+        "warm_up": warm_up,
+        "forecast": get_forecast_status(),
+        "local_classifier": {"model_trained": get_local_classifier_stats()["model_trained"]},
+        "password_pool": password_pool.stats(),
+        # Informational: an open breaker means degraded answers, not an unready instance
+        "gemini": gemini_breaker.stats(),
+    })
@@ -1,27 +1,148 @@
-import pandas as pd
+import threading
 from datetime import timedelta
 from fastapi import HTTPException
-from app.services.gemini_service import generate_solution
-from app.services.forecast_manager import get_forecast_model
+from app.config import FORECAST_HORIZONS
+from app.services.gemini_service import generate_text
+from app.services.gemini_client import gemini_breaker, fallback_reason
+from app.services.forecast_manager import get_forecast_state
+from app.utils.metrics import cache_requests_total, llm_fallbacks_total
+
+# Serializes Prophet predictions so concurrent misses don't repeat the same work
+_compute_lock = threading.Lock()
+
+
+def _ai_summary(category: str, avg_pred, trend: str):
+    """(summary, degraded): Gemini's insight, or the templated one when Gemini is unavailable."""
+    prompt = (
+        f"Generate a short, two-line forecast insight for category '{category}' "
+        f"in Uttar Pradesh. The average predicted count is {avg_pred}, showing a {trend} trend. "
+        "Make it concise and suitable for dashboard display."
+    )
+    try:
+        return generate_text(prompt, "forecast_summary"), False
+    except Exception as e:
+        print("Error generating AI summary:", e)
+        llm_fallbacks_total.inc(operation="forecast_summary", reason=fallback_reason(e))
+        return f"{category} grievances average around {avg_pred} — trend: {trend}.", True
+
+
+def _summarize(category: str, forecast_data):
+    """Overall stats + AI summary for one forecast horizon (a slice of Prophet's prediction frame)."""
+    avg_pred = round(forecast_data["predicted_count"].mean(), 2)
+    diff = forecast_data["predicted_count"].iloc[-1] - forecast_data["predicted_count"].iloc[0]
+    trend = "increase" if diff > 0 else "decrease" if diff < 0 else "stable"
+
+    # Handle insufficient data
+    if len(forecast_data) < 5:
+        summary, degraded = "Not enough real grievance data yet to generate a reliable forecast.", False
+    else:
+        summary, degraded = _ai_summary(category, avg_pred, trend)
+
+    return avg_pred, trend, summary, degraded
+
+
+def _compute_category(model, category: str, horizons, version: str):
+    """
+    One make_future_dataframe + predict for the longest horizon;
+    shorter horizons are prefixes of the same future frame.
+    """
+    longest = max(horizons)
+    future = model.make_future_dataframe(periods=longest)
+    forecast = model.predict(future).tail(longest)
+
+    # Extract relevant fields
+    forecast_all = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].rename(
+        columns={
+            "ds": "date",
+            "yhat": "predicted_count",
+            "yhat_lower": "lower_bound",
+            "yhat_upper": "upper_bound",
+        }
+    )
+
+    results = {}
+    for days in horizons:
+        forecast_data = forecast_all.head(days)
+        avg_pred, trend, summary, degraded = _summarize(category, forecast_data)
+
+        # Final structured response
+        results[(category, days)] = {
+            "status": "success",
+            "category": category,
+            "average_predicted": avg_pred,
+            "trend": trend,
+            "forecast": forecast_data.to_dict(orient="records"),
+            "summary": summary,
+            "summary_degraded": degraded,
+            "model_version": version,
+        }
+    return results
+
+
+def _refresh_summary(state, key, result):
+    """Replace a templated summary with Gemini's once Gemini answers again."""
+    if gemini_breaker.is_open():
+        return result
+    summary, degraded = _ai_summary(result["category"], result["average_predicted"], result["trend"])
+    if not degraded:
+        result = {**result, "summary": summary, "summary_degraded": False}
+        state.results[key] = result
+    return result
+
+
+def _get_or_compute(state, category: str, days: int):
+    key = (category, days)
+    result = state.results.get(key)
+    if result is not None:
+        if result.get("summary_degraded"):
+            result = _refresh_summary(state, key, result)
+        return result
+
+    with _compute_lock:
+        result = state.results.get(key)
+        if result is None:
+            horizons = sorted(set(FORECAST_HORIZONS) | {days})
+            state.results.update(
+                _compute_category(state.models[category], category, horizons, state.version)
+            )
+            result = state.results[key]
+    return result
+
+
+def precompute_forecasts(state):
+    """Fill the forecast cache of a freshly installed model set (categories already in use)."""
+    categories = state.models.loaded_categories()
+    if not categories:
+        return
+    for category in categories:
+        if state is not get_forecast_state():
+            return  # superseded by a newer model set
+        for days in FORECAST_HORIZONS:
+            try:
+                _get_or_compute(state, category, days)
+            except Exception as e:
+                print(f"Could not precompute forecast for {category}: {e}")
+                break
+    print(f"Forecasts precomputed for model version {state.version}")
 
 
 def generate_forecast(category: str, days: int = 30):
     """
     Generate forecast data and AI summary for the given category.
-    Uses cached Prophet models from memory for instant access.
+    Served from the per-model-version cache; computed once per model set.
     """
-    model = get_forecast_model(category)
-    if not model:
+    state = get_forecast_state()
+    if category not in state.models:
         return {
             "status": "error",
             "error": f"No forecast model found for category '{category}'.",
             "summary": "Forecast unavailable for this category yet."
         }
 
+    cached = (category, days) in state.results
+    cache_requests_total.inc(cache="forecast", result="hit" if cached else "miss")
     try:
-        #Fast prediction using cached model
-        future = model.make_future_dataframe(periods=days)
-        forecast = model.predict(future).tail(days)
+        return _get_or_compute(state, category, days)
     except Exception as e:
         print(f"Error during forecast generation: {e}")
         return {
@@ -29,45 +150,3 @@ def generate_forecast(category: str, days: int = 30):
             "error": "Forecast generation failed due to model issue.",
             "summary": str(e),
         }
-
-    # Extract relevant fields
-    forecast_data = forecast[["ds", "yhat", "yhat_lower", "yhat_upper"]].copy()
-    forecast_data.rename(
-        columns={
-            "ds": "date",
-            "yhat": "predicted_count",
-            "yhat_lower": "lower_bound",
-            "yhat_upper": "upper_bound",
-        },
-        inplace=True,
-    )
-
-    # Compute overall stats
-    avg_pred = round(forecast_data["predicted_count"].mean(), 2)
-    diff = forecast_data["predicted_count"].iloc[-1] - forecast_data["predicted_count"].iloc[0]
-    trend = "increase" if diff > 0 else "decrease" if diff < 0 else "stable"
-
-    # Handle insufficient data
-    if len(forecast_data) < 5:
-        summary = "Not enough real grievance data yet to generate a reliable forecast."
-    else:
-        prompt = (
-            f"Generate a short, two-line forecast insight for category '{category}' "
-            f"in Uttar Pradesh. The average predicted count is {avg_pred}, showing a {trend} trend. "
-            "Make it concise and suitable for dashboard display."
-        )
-        try:
-            summary = generate_solution(prompt)
-        except Exception as e:
-            print("Error generating AI summary:", e)
-            summary = f"{category} grievances average around {avg_pred} — trend: {trend}."
-
-    # Final structured response
-    return {
-        "status": "success",
-        "category": category,
-        "average_predicted": avg_pred,
-        "trend": trend,
-        "forecast": forecast_data.to_dict(orient="records"),
-        "summary": summary,
-    }
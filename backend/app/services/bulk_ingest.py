@@ -0,0 +1,284 @@
+import csv
+import io
+import json
+import itertools
+from datetime import datetime
+from sqlalchemy import insert
+from app.config import BULK_INGEST_BATCH_SIZE
+from app.db.connection import SessionLocal
+from app.db.models import Grievance, IngestCheckpoint, User
+from app.services.nlp_processor import classify_locally_batch
+from app.services.geocode_service import get_location
+from app.services.rollup_service import record_bulk_created
+from app.services.cluster_engine import hotspot_clusters
+from app.utils.geohash import encode_geohash
+
+DEFAULT_STATUS = "Pending"
+
+# Columns written by the bulk insert, in COPY order
+INSERT_COLUMNS = [
+    "description", "category", "priority", "region", "latitude", "longitude",
+    "geohash", "status", "created_at", "user_id",
+]
+
+MAX_LENGTHS = {"category": 100, "priority": 50, "region": 150, "status": 50}
+
+
+class RowError(ValueError):
+    """A single input record that cannot be imported."""
+
+
+#Parsing (one record at a time, never the whole file) ---
+def iter_records(stream, fmt: str):
+    """
+    Yield (row_number, record_or_error) from a binary stream of CSV or JSONL.
+    Row numbers count data records from 1 and are what checkpoints refer to.
+    """
+    text = io.TextIOWrapper(stream, encoding="utf-8-sig", newline="")
+    if fmt == "csv":
+        for row_number, record in enumerate(csv.DictReader(text), start=1):
+            yield row_number, record
+        return
+
+    row_number = 0
+    for line in text:
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise ValueError("expected a JSON object")
+            yield row_number, record
+        except ValueError as e:
+            yield row_number, RowError(f"invalid JSON: {e}")
+
+
+def _clean(value):
+    if value is None:
+        return None
+    value = str(value).strip()
+    return value or None
+
+
+def _parse_float(record: dict, name: str):
+    value = _clean(record.get(name))
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        raise RowError(f"{name} is not a number: {value!r}")
+
+
+def _validate(record: dict):
+    """Normalize one input record; fields left None are filled in by _enrich."""
+    description = _clean(record.get("description"))
+    if not description:
+        raise RowError("description is required")
+
+    created_at = _clean(record.get("created_at"))
+    if created_at:
+        try:
+            created_at = datetime.fromisoformat(created_at.replace("Z", "+00:00")).replace(tzinfo=None)
+        except ValueError:
+            raise RowError(f"created_at is not an ISO date/time: {created_at!r}")
+
+    user_id = _clean(record.get("user_id"))
+    if user_id is not None:
+        try:
+            user_id = int(user_id)
+        except ValueError:
+            raise RowError(f"user_id is not an integer: {user_id!r}")
+
+    row = {
+        "description": description,
+        "category": _clean(record.get("category")),
+        "priority": _clean(record.get("priority")),
+        "region": _clean(record.get("region")),
+        "latitude": _parse_float(record, "latitude"),
+        "longitude": _parse_float(record, "longitude"),
+        "status": _clean(record.get("status")) or DEFAULT_STATUS,
+        "created_at": created_at or datetime.utcnow(),
+        "user_id": user_id,
+    }
+    if (row["latitude"] is None) != (row["longitude"] is None):
+        raise RowError("latitude and longitude must be given together")
+    for name, limit in MAX_LENGTHS.items():
+        if row[name] and len(row[name]) > limit:
+            raise RowError(f"{name} is longer than {limit} characters")
+    return row
+
+
+#Enrichment (per batch) ---
+def _enrich(rows: list):
+    """
+    Fill in missing category/priority/region with one local classifier call for
+    the whole batch, and geocode each distinct region once. No Gemini calls:
+    historical imports don't get AI solutions.
+    """
+    missing = [row for row in rows if not (row["category"] and row["priority"] and row["region"])]
+    if missing:
+        classified = classify_locally_batch([row["description"] for row in missing])
+        for row, local in zip(missing, classified):
+            for name in ("category", "priority", "region"):
+                row[name] = row[name] or local[name]
+
+    regions = {row["region"] for row in rows if row["latitude"] is None and row["region"]}
+    locations = {}
+    for region in regions:
+        try:
+            locations[region] = get_location(region)
+        except Exception as e:
+            print(f"Bulk ingest could not geocode {region}: {e}")
+            locations[region] = {}
+
+    for row in rows:
+        if row["latitude"] is None and row["region"] in locations:
+            row["latitude"] = locations[row["region"]].get("latitude")
+            row["longitude"] = locations[row["region"]].get("longitude")
+        row["geohash"] = encode_geohash(row["latitude"], row["longitude"])
+    return rows
+
+
+#Writing ---
+def _copy_rows(db, rows: list):
+    """Postgres COPY ... FROM STDIN through the session's own connection."""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow(["" if row[name] is None else row[name] for name in INSERT_COLUMNS])
+    buffer.seek(0)
+    cursor = db.connection().connection.cursor()
+    try:
+        cursor.copy_expert(
+            f"COPY grievances ({', '.join(INSERT_COLUMNS)}) FROM STDIN WITH (FORMAT csv)",
+            buffer,
+        )
+    finally:
+        cursor.close()
+
+
+def insert_rows(db, rows: list):
+    """Insert dicts keyed by INSERT_COLUMNS; COPY on psycopg2, executemany elsewhere."""
+    records = [{name: row[name] for name in INSERT_COLUMNS} for row in rows]
+    dialect = db.get_bind().dialect
+    if dialect.name == "postgresql" and dialect.driver == "psycopg2":
+        _copy_rows(db, records)
+    else:
+        db.execute(insert(Grievance), records)  # executemany
+
+
+def _get_checkpoint(db, job_id: str, source: str):
+    checkpoint = db.get(IngestCheckpoint, job_id)
+    if checkpoint is None:
+        checkpoint = IngestCheckpoint(job_id=job_id, source=source, rows_done=0, inserted=0, failed=0)
+        db.add(checkpoint)
+        db.commit()
+    return checkpoint
+
+
+def _split_unknown_users(db, batch: list):
+    """
+    (rows, errors) for a batch of (row_number, row): rows whose user_id is not in
+    users become per-row errors instead of failing the whole insert on the FK.
+    """
+    user_ids = {row["user_id"] for _, row in batch if row["user_id"] is not None}
+    known = set()
+    if user_ids:
+        known = {user_id for (user_id,) in db.query(User.id).filter(User.id.in_(user_ids))}
+    rows, errors = [], []
+    for row_number, row in batch:
+        if row["user_id"] is None or row["user_id"] in known:
+            rows.append(row)
+        else:
+            errors.append({"event": "error", "row": row_number, "error": f"user_id {row['user_id']} does not exist"})
+    return rows, errors
+
+
+def _write_batch(db, checkpoint, rows: list, rows_done: int, failed: int):
+    """Insert rows, update the rollup and advance the checkpoint in one transaction."""
+    try:
+        if rows:
+            insert_rows(db, _enrich(rows))
+            record_bulk_created(db, rows)
+        checkpoint.rows_done = rows_done
+        checkpoint.inserted += len(rows)
+        checkpoint.failed += failed
+        checkpoint.updated_at = datetime.utcnow()
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+
+
+def ingest_stream(stream, fmt: str, job_id: str, source: str = None,
+                  batch_size: int = BULK_INGEST_BATCH_SIZE):
+    """
+    Import grievances from a CSV/JSONL binary stream in batches, yielding progress
+    events as they happen:
+
+        {"event": "error", "row": n, "error": "..."}    one per rejected record
+        {"event": "batch", "rows_done": n, "inserted": n, "failed": n}
+        {"event": "done", "status": "completed" | "failed", ...}
+
+    Every batch commits together with its checkpoint, so running the same
+    ``job_id`` again skips the records that were already imported.
+    """
+    if fmt not in ("csv", "jsonl"):
+        raise ValueError("format must be csv or jsonl")
+
+    db = SessionLocal()
+    try:
+        checkpoint = _get_checkpoint(db, job_id, source)
+        if checkpoint.status == "completed":
+            yield {"event": "done", "status": "completed", "job_id": job_id,
+                   "rows_done": checkpoint.rows_done, "inserted": checkpoint.inserted,
+                   "failed": checkpoint.failed, "message": "Job already completed"}
+            return
+        resume_after = checkpoint.rows_done
+        if resume_after:
+            print(f"Bulk ingest {job_id}: resuming after row {resume_after}")
+        checkpoint.status = "running"
+        db.commit()
+
+        records = itertools.dropwhile(lambda item: item[0] <= resume_after, iter_records(stream, fmt))
+        batch, failed, rows_done = [], 0, resume_after
+        status = "completed"
+        try:
+            for row_number, record in records:
+                rows_done = row_number
+                try:
+                    if isinstance(record, RowError):
+                        raise record
+                    batch.append((row_number, _validate(record)))
+                except RowError as e:
+                    failed += 1
+                    yield {"event": "error", "row": row_number, "error": str(e)}
+
+                if len(batch) + failed >= batch_size:
+                    rows, errors = _split_unknown_users(db, batch)
+                    yield from errors
+                    _write_batch(db, checkpoint, rows, rows_done, failed + len(errors))
+                    batch, failed = [], 0
+                    yield {"event": "batch", "rows_done": checkpoint.rows_done,
+                           "inserted": checkpoint.inserted, "failed": checkpoint.failed}
+
+            rows, errors = _split_unknown_users(db, batch)
+            yield from errors
+            _write_batch(db, checkpoint, rows, rows_done, failed + len(errors))
+        except Exception as e:
+            status = "failed"
+            print(f"Bulk ingest {job_id} stopped at row {checkpoint.rows_done}: {e}")
+            yield {"event": "error", "row": None, "error": f"batch failed: {e}"}
+
+        checkpoint.status = status
+        checkpoint.updated_at = datetime.utcnow()
+        db.commit()
+        if checkpoint.inserted:
+            hotspot_clusters.mark_stale()
+        yield {"event": "done", "status": status, "job_id": job_id,
+               "rows_done": checkpoint.rows_done, "inserted": checkpoint.inserted,
+               "failed": checkpoint.failed}
+    finally:
+        db.close()
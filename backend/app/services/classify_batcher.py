@@ -0,0 +1,82 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from app.config import CLASSIFY_BATCH_MAX_SIZE, CLASSIFY_BATCH_WINDOW_MS, CLASSIFY_BATCH_MAX_IN_FLIGHT
+from app.services.gemini_classifier import classify_grievances_batch
+from app.utils.metrics import queue_depth
+
+
+class MicroBatcher:
+    """
+    Collects single requests that arrive within ``window_ms`` of each other
+    and hands them to ``batch_fn`` as one list (at most ``max_batch`` items).
+    Callers block on their own result, so it works from sync routes.
+    Up to ``max_in_flight`` batches are sent upstream at the same time.
+    """
+
+    def __init__(self, batch_fn, max_batch: int = CLASSIFY_BATCH_MAX_SIZE,
+                 window_ms: int = CLASSIFY_BATCH_WINDOW_MS,
+                 max_in_flight: int = CLASSIFY_BATCH_MAX_IN_FLIGHT):
+        self.batch_fn = batch_fn
+        self.max_batch = max(1, max_batch)
+        self.window = window_ms / 1000
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(1, max_in_flight), thread_name_prefix="classify-batch"
+        )
+        self._queue = queue.Queue()
+        self._thread = None
+        self._start_lock = threading.Lock()
+
+    def _ensure_started(self):
+        if self._thread is None:
+            with self._start_lock:
+                if self._thread is None:
+                    self._thread = threading.Thread(
+                        target=self._run, name="classify-batcher", daemon=True
+                    )
+                    self._thread.start()
+
+    def submit(self, item):
+        """Queue one item and return a Future for its result."""
+        self._ensure_started()
+        future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item):
+        return self.submit(item).result()
+
+    def _run(self):
+        while True:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.window
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=remaining))
+                except queue.Empty:
+                    break
+            self._executor.submit(self._dispatch, batch)
+
+    def _dispatch(self, batch):
+        items = [item for item, _ in batch]
+        try:
+            results = self.batch_fn(items)
+        except Exception as e:
+            for _, future in batch:
+                future.set_exception(e)
+            return
+        for (_, future), result in zip(batch, results):
+            future.set_result(result)
+
+
+_classify_batcher = MicroBatcher(classify_grievances_batch)
+queue_depth.set_function(_classify_batcher._queue.qsize, queue="classify_batch")
+
+
+def classify_with_batching(problem: str):
+    """Single classification that shares a Gemini call with concurrent requests."""
+    return _classify_batcher(problem)
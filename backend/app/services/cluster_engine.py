@@ -0,0 +1,157 @@
+import os
+import threading
+import time
+from app.config import HOTSPOT_CLUSTERS, HOTSPOT_REFIT_NEW_POINTS, HOTSPOT_REFIT_SECONDS
+from app.utils.aggregate_data import stream_coordinates
+
+STATE_PATH = "app/models/clusters/hotspot_clusters.pkl"
+
+
+class HotspotClusterEngine:
+    """
+    Micro-hotspot clustering that survives between requests.
+    numpy/scikit-learn are imported on the first read, not at API startup.
+
+    A full MiniBatchKMeans fit runs only on first use, after
+    ``refit_new_points`` new points or after ``refit_seconds``.
+    In between, newly geocoded grievances are folded in with partial_fit
+    and the cached centroids/densities are served as they are.
+    """
+
+    def __init__(self, n_clusters: int = HOTSPOT_CLUSTERS,
+                 refit_new_points: int = HOTSPOT_REFIT_NEW_POINTS,
+                 refit_seconds: int = HOTSPOT_REFIT_SECONDS,
+                 state_path: str = STATE_PATH):
+        self.n_clusters = max(1, n_clusters)
+        self.refit_new_points = refit_new_points
+        self.refit_seconds = refit_seconds
+        self.state_path = state_path
+
+        self._lock = threading.Lock()
+        self._pending = []  # points added since the last partial_fit
+        self._model = None
+        self._densities = None
+        self._points_since_refit = 0
+        self._fitted_at = 0.0
+        self._loaded = False
+        self._stale = False
+
+    #Persistence ---
+    def _load_state(self):
+        import joblib
+
+        self._loaded = True
+        try:
+            state = joblib.load(self.state_path)
+        except FileNotFoundError:
+            return
+        except Exception as e:
+            print("Could not load hotspot cluster state:", e)
+            return
+        if state.get("n_clusters") != self.n_clusters:
+            return  # k changed: refit from scratch
+        self._model = state["model"]
+        self._densities = state["densities"]
+        self._fitted_at = state["fitted_at"]
+        self._points_since_refit = state["points_since_refit"]
+
+    def _save_state(self):
+        import joblib
+
+        try:
+            os.makedirs(os.path.dirname(self.state_path), exist_ok=True)
+            tmp_path = f"{self.state_path}.tmp"
+            joblib.dump({
+                "n_clusters": self.n_clusters,
+                "model": self._model,
+                "densities": self._densities,
+                "fitted_at": self._fitted_at,
+                "points_since_refit": self._points_since_refit,
+            }, tmp_path)
+            os.replace(tmp_path, self.state_path)
+        except Exception as e:
+            print("Could not save hotspot cluster state:", e)
+
+    #Updates ---
+    def add_point(self, latitude: float, longitude: float):
+        """Record a newly geocoded grievance; folded in on the next read."""
+        if latitude is None or longitude is None:
+            return
+        with self._lock:
+            self._pending.append((latitude, longitude))
+
+    def mark_stale(self):
+        """Force a full refit on the next read (e.g. after a bulk import)."""
+        with self._lock:
+            self._stale = True
+
+    def _needs_refit(self):
+        return (
+            self._model is None
+            or self._stale
+            or self._points_since_refit + len(self._pending) >= self.refit_new_points
+            or time.time() - self._fitted_at >= self.refit_seconds
+        )
+
+    def _refit(self, db):
+        import numpy as np
+        from sklearn.cluster import MiniBatchKMeans
+
+        coords = stream_coordinates(db)
+        self._pending = []
+        self._stale = False
+        if len(coords) < self.n_clusters:
+            self._model = None
+            self._densities = None
+            return
+        model = MiniBatchKMeans(
+            n_clusters=self.n_clusters, random_state=42, n_init=3, batch_size=4096
+        )
+        labels = model.fit_predict(coords)
+        self._model = model
+        self._densities = np.bincount(labels, minlength=self.n_clusters)
+        self._points_since_refit = 0
+        self._fitted_at = time.time()
+        print(f"Hotspot clusters refitted on {len(coords)} points (k={self.n_clusters})")
+
+    def _fold_in_pending(self):
+        import numpy as np
+
+        points = np.asarray(self._pending, dtype=float)
+        self._pending = []
+        self._model.partial_fit(points)
+        self._densities = self._densities + np.bincount(
+            self._model.predict(points), minlength=self.n_clusters
+        )
+        self._points_since_refit += len(points)
+
+    def get_clusters(self, db):
+        """Cached cluster centroids and densities (None if too few points)."""
+        with self._lock:
+            if not self._loaded:
+                self._load_state()
+
+            changed = False
+            if self._needs_refit():
+                self._refit(db)
+                changed = True
+            elif self._pending:
+                self._fold_in_pending()
+                changed = True
+            if changed and self._model is not None:
+                self._save_state()
+
+            if self._model is None:
+                return None
+            return [
+                {
+                    "cluster_id": int(i),
+                    "latitude": float(lat),
+                    "longitude": float(lon),
+                    "complaint_density": int(self._densities[i])
+                }
+                for i, (lat, lon) in enumerate(self._model.cluster_centers_)
+            ]
+
+
+hotspot_clusters = HotspotClusterEngine()
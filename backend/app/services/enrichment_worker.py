@@ -0,0 +1,299 @@
+import itertools
+import queue
+import threading
+import time
+import uuid
+from datetime import datetime, timedelta
+from sqlalchemy import update, or_
+from app.config import (
+    ENRICHMENT_WORKERS, ENRICHMENT_MAX_ATTEMPTS, ENRICHMENT_RETRY_DELAY_SECONDS, ENRICHMENT_CLAIM_SECONDS,
+    SOLUTION_WAIT_SECONDS,
+)
+from app.db.connection import SessionLocal
+from app.db.models import Grievance
+from app.services.nlp_processor import locate_region, solve_problem, reclassify_uncertain
+from app.services.gemini_service import templated_solution, saved_solution_events, solution_event_stream
+from app.services.cluster_engine import hotspot_clusters
+from app.services.rollup_service import record_category_change, record_status_change
+from app.utils.geohash import encode_geohash
+from app.utils.metrics import db_query_seconds, pipeline_stage_seconds, queue_depth
+
+PROCESSING_STATUS = "Processing"
+READY_STATUS = "Pending"
+
+# Lower number = picked up first
+_PRIORITY_RANK = {"High": 0, "Medium": 1, "Low": 2}
+
+# Marks this process's claims; every uvicorn worker process has its own
+WORKER_ID = uuid.uuid4().hex
+
+_queue = queue.PriorityQueue()
+_sequence = itertools.count()  # keeps FIFO order inside the same priority
+_queued_ids = set()  # queued or being enriched here, so an id is never in the queue twice
+_queued_lock = threading.Lock()
+_workers = []
+_workers_lock = threading.Lock()
+
+# grievance_id -> Event set when the thread generating its solution is done
+_solutions_in_flight = {}
+_in_flight_lock = threading.Lock()
+
+
+def enrichment_claim():
+    """Column values that claim a new grievance for this process's workers."""
+    return {"enrichment_claimed_by": WORKER_ID, "enrichment_claimed_at": datetime.utcnow()}
+
+
+def enqueue_grievance(grievance_id: int, priority: str = None):
+    """Schedule a saved grievance, claimed by this process, for geocoding + solution generation."""
+    with _queued_lock:
+        if grievance_id in _queued_ids:
+            return
+        _queued_ids.add(grievance_id)
+    rank = _PRIORITY_RANK.get(priority, len(_PRIORITY_RANK))
+    _queue.put((rank, next(_sequence), grievance_id, time.perf_counter()))
+
+
+def get_queue_depth():
+    return _queue.qsize()
+
+
+def _set_solution_if_missing(db, grievance_id: int, solution: str):
+    # First writer wins: a solution streamed to the user may already be saved
+    db.execute(
+        update(Grievance)
+        .where(Grievance.id == grievance_id, Grievance.solution.is_(None))
+        .values(solution=solution)
+        .execution_options(synchronize_session=False)
+    )
+
+
+def save_streamed_solution(grievance_id: int, solution: str):
+    """Persist a solution generated over /grievance/{id}/solution/stream."""
+    db = SessionLocal()
+    try:
+        _set_solution_if_missing(db, grievance_id, solution)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _saved_solution(grievance_id: int):
+    db = SessionLocal()
+    try:
+        return db.query(Grievance.solution).filter(Grievance.id == grievance_id).scalar()
+    finally:
+        db.close()
+
+
+def _claim_solution(grievance_id: int):
+    """
+    Become the one thread generating this grievance's solution. While another
+    holds the claim (a worker, or a client streaming it) wait for it to finish,
+    so Gemini is asked once; after SOLUTION_WAIT_SECONDS take over anyway.
+    """
+    deadline = time.monotonic() + SOLUTION_WAIT_SECONDS
+    while True:
+        with _in_flight_lock:
+            running = _solutions_in_flight.get(grievance_id)
+            if running is None or time.monotonic() >= deadline:
+                claim = _solutions_in_flight[grievance_id] = threading.Event()
+                return claim
+        running.wait(max(0.0, deadline - time.monotonic()))
+
+
+def _release_solution(grievance_id: int, claim: threading.Event):
+    with _in_flight_lock:
+        # A waiter that timed out may have taken the id over
+        if _solutions_in_flight.get(grievance_id) is claim:
+            del _solutions_in_flight[grievance_id]
+    claim.set()
+
+
+def _ensure_solution(grievance_id: int, description: str):
+    """Generate and save the solution unless one is saved, or being streamed and saved meanwhile."""
+    claim = _claim_solution(grievance_id)
+    try:
+        if _saved_solution(grievance_id) is None:
+            save_streamed_solution(grievance_id, solve_problem(description))
+    finally:
+        _release_solution(grievance_id, claim)
+
+
+def solution_stream_events(grievance_id: int, description: str):
+    """
+    Events of /grievance/{id}/solution/stream. When a worker is generating the
+    solution right now, its result is sent once it is saved instead of calling
+    Gemini a second time.
+    """
+    claim = _claim_solution(grievance_id)
+    try:
+        solution = _saved_solution(grievance_id)
+        if solution is not None:
+            yield from saved_solution_events(solution)
+            return
+        yield from solution_event_stream(
+            description, on_complete=lambda solution: save_streamed_solution(grievance_id, solution)
+        )
+    finally:
+        _release_solution(grievance_id, claim)
+
+
+def _enrich_once(grievance_id: int):
+    db = SessionLocal()
+    try:
+        grievance = db.query(Grievance).filter(Grievance.id == grievance_id).first()
+        if not grievance:
+            print(f"Enrichment skipped, grievance {grievance_id} no longer exists")
+            return
+        if grievance.status == PROCESSING_STATUS and grievance.enrichment_claimed_by != WORKER_ID:
+            print(f"Enrichment skipped, grievance {grievance_id} was taken over by another process")
+            return
+
+        location = locate_region(grievance.region)
+        if grievance.solution is None:
+            _ensure_solution(grievance_id, grievance.description)
+        with pipeline_stage_seconds.time(stage="reclassify"):
+            category = reclassify_uncertain(grievance.description)
+        started = time.perf_counter()
+        # Submit stored the keyword rule for texts the local classifier was unsure of
+        if category and grievance.status == PROCESSING_STATUS:
+            old_category, grievance.category = grievance.category, category
+            record_category_change(db, grievance, old_category)
+        grievance.latitude = location["latitude"]
+        grievance.longitude = location["longitude"]
+        grievance.geohash = encode_geohash(location["latitude"], location["longitude"])
+
+        # Don't overwrite a status an admin has set in the meantime
+        if grievance.status == PROCESSING_STATUS:
+            grievance.status = READY_STATUS
+            record_status_change(db, grievance, PROCESSING_STATUS)
+
+        db.commit()
+        db_query_seconds.observe(time.perf_counter() - started, group="enrichment_update")
+        hotspot_clusters.add_point(location["latitude"], location["longitude"])
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
+
+
+def _release_unenriched(grievance_id: int):
+    """Give up on enrichment: mark the grievance ready with a templated solution and no coordinates."""
+    db = SessionLocal()
+    try:
+        grievance = db.query(Grievance).filter(Grievance.id == grievance_id).first()
+        if not grievance:
+            return
+        _set_solution_if_missing(db, grievance_id, templated_solution(grievance.description))
+        if grievance.status == PROCESSING_STATUS:
+            grievance.status = READY_STATUS
+            record_status_change(db, grievance, PROCESSING_STATUS)
+        db.commit()
+        print(f"Grievance {grievance_id} released without enrichment")
+    except Exception as e:
+        # Still 'Processing': taken over by requeue_unfinished_grievances once the claim lapses
+        db.rollback()
+        print(f"Could not release grievance {grievance_id}: {e}")
+    finally:
+        db.close()
+
+
+def enrich_grievance(grievance_id: int):
+    """
+    Fill in coordinates and AI solution for one grievance and mark it ready.
+    Failures are retried with backoff; after ENRICHMENT_MAX_ATTEMPTS the grievance
+    is marked ready anyway, so clients polling its status are not left waiting.
+    """
+    attempts = max(1, ENRICHMENT_MAX_ATTEMPTS)
+    for attempt in range(1, attempts + 1):
+        try:
+            _enrich_once(grievance_id)
+            return
+        except Exception as e:
+            print(f"Enrichment attempt {attempt}/{attempts} failed for grievance {grievance_id}: {e}")
+            if attempt < attempts:
+                time.sleep(ENRICHMENT_RETRY_DELAY_SECONDS * 2 ** (attempt - 1))
+    _release_unenriched(grievance_id)
+
+
+def _worker_loop():
+    while True:
+        _, _, grievance_id, queued_at = _queue.get()
+        pipeline_stage_seconds.observe(time.perf_counter() - queued_at, stage="queue_wait")
+        try:
+            enrich_grievance(grievance_id)
+        finally:
+            with _queued_lock:
+                _queued_ids.discard(grievance_id)
+            _queue.task_done()
+
+
+def requeue_unfinished_grievances():
+    """
+    Renew this process's claims on 'Processing' grievances, then claim and queue
+    the ones whose claim lapsed (left by a restart or crash) or that never had one.
+    The claiming UPDATE ... RETURNING is atomic, so with several processes each
+    grievance is taken by exactly one of them.
+    """
+    now = datetime.utcnow()
+    db = SessionLocal()
+    try:
+        db.execute(
+            update(Grievance)
+            .where(Grievance.status == PROCESSING_STATUS, Grievance.enrichment_claimed_by == WORKER_ID)
+            .values(enrichment_claimed_at=now)
+            .execution_options(synchronize_session=False)
+        )
+        claimed = db.execute(
+            update(Grievance)
+            .where(
+                Grievance.status == PROCESSING_STATUS,
+                or_(
+                    Grievance.enrichment_claimed_by.is_(None),
+                    Grievance.enrichment_claimed_at.is_(None),
+                    Grievance.enrichment_claimed_at < now - timedelta(seconds=ENRICHMENT_CLAIM_SECONDS),
+                ),
+            )
+            .values(enrichment_claimed_by=WORKER_ID, enrichment_claimed_at=now)
+            .returning(Grievance.id, Grievance.priority)
+            .execution_options(synchronize_session=False)
+        ).all()
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print("Could not claim unfinished grievances:", e)
+        return 0
+    finally:
+        db.close()
+
+    for grievance_id, priority in claimed:
+        enqueue_grievance(grievance_id, priority)
+    if claimed:
+        print(f"Re-queued {len(claimed)} grievances for enrichment")
+    return len(claimed)
+
+
+def _claim_loop():
+    while True:
+        requeue_unfinished_grievances()
+        time.sleep(max(1, ENRICHMENT_CLAIM_SECONDS / 3))
+
+
+def start_enrichment_workers(num_workers: int = ENRICHMENT_WORKERS):
+    """Start the bounded pool of background enrichment threads (idempotent)."""
+    with _workers_lock:
+        if _workers:
+            return
+        for i in range(max(1, num_workers)):
+            worker = threading.Thread(
+                target=_worker_loop, name=f"enrichment-worker-{i}", daemon=True
+            )
+            worker.start()
+            _workers.append(worker)
+    print(f"Started {len(_workers)} grievance enrichment workers")
+    threading.Thread(target=_claim_loop, name="enrichment-claims", daemon=True).start()
+
+
+queue_depth.set_function(get_queue_depth, queue="enrichment")
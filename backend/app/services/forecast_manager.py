@@ -1,32 +1,147 @@
-import joblib
 import threading
 import os
+from datetime import datetime
+from app.services.model_store import (
+    LEGACY_MODEL_PATH, read_manifest, load_model, publish_models, import_legacy_pickle
+)
 
-_forecast_models_cache = {}
+
+class LazyModels:
+    """
+    Category -> Prophet model, read from the model store on first use.
+    Only categories that have actually been requested are kept in memory.
+    """
+
+    def __init__(self, entries: dict, loaded: dict = None):
+        self.entries = entries  # category -> manifest entry
+        self._loaded = dict(loaded or {})
+        self._lock = threading.Lock()
+
+    def __contains__(self, category):
+        return category in self.entries or category in self._loaded
+
+    def __iter__(self):
+        return iter(list(self.entries.keys() | self._loaded.keys()))
+
+    def __len__(self):
+        return len(self.entries.keys() | self._loaded.keys())
+
+    def __getitem__(self, category):
+        model = self.get(category)
+        if model is None:
+            raise KeyError(category)
+        return model
+
+    def get(self, category, default=None, keep_loaded: bool = True):
+        model = self._loaded.get(category)
+        if model is not None:
+            return model
+        entry = self.entries.get(category)
+        if entry is None:
+            return default
+        with self._lock:
+            model = self._loaded.get(category)
+            if model is None:
+                try:
+                    model = load_model(entry)
+                except Exception as e:
+                    print(f"Could not load forecast model for {category}:", e)
+                    return default
+                if keep_loaded:
+                    self._loaded[category] = model
+                    print(f"Forecast model loaded: {category} ({entry['version']})")
+        return model
+
+    def loaded_categories(self):
+        return list(self._loaded)
+
+
+class ForecastState:
+    """One installed model set plus everything derived from it."""
+
+    def __init__(self, models: LazyModels, version: str):
+        self.models = models
+        self.version = version
+        self.results = {}  # (category, days) -> precomputed forecast payload
+        self.trends = {}  # category -> (trend, expected_change_percent)
+
+
+_state = None  # read from the manifest on first use
 _model_lock = threading.Lock()
+_load_lock = threading.Lock()
+
+
+def _new_version():
+    return datetime.utcnow().strftime("%Y%m%d%H%M%S%f")
+
+
+def _install(models: LazyModels, version: str):
+    """Swap in a new model set; old precomputed results go with the old state."""
+    global _state
+    _state = ForecastState(models, version)
+    _precompute_async(_state)
+
 
 def load_forecast_models():
-    """Load pretrained forecast models into cache at startup."""
-    global _forecast_models_cache
+    """(Re)read the model store manifest; models themselves load on first use."""
     try:
-        model_path = "app/models/forecast/up_forecast.pkl"
-        _forecast_models_cache = joblib.load(model_path)
-        print(f"Forecast models loaded: {list(_forecast_models_cache.keys())}")
+        manifest = read_manifest()
+        if manifest is None and os.path.exists(LEGACY_MODEL_PATH):
+            # Deserializes every model at once; ship the store (export_model_store.py) to avoid it
+            print(f"Model store empty, importing {LEGACY_MODEL_PATH}")
+            manifest = import_legacy_pickle(_new_version())
+        if manifest is None:
+            raise FileNotFoundError("no model store manifest or legacy pickle")
+        print(f"Forecast models available: {list(manifest['categories'])} "
+              f"(version {manifest['version']})")
+        models, version = LazyModels(manifest["categories"]), manifest["version"]
     except Exception as e:
         print("Could not load initial forecast models:", e)
-        _forecast_models_cache = {}
+        models, version = LazyModels({}), "empty"
+    with _model_lock:
+        _install(models, version)
+
+def get_forecast_state():
+    """
+    Current model set, version and precomputed results (read once per request).
+    The first call reads the manifest, so startup never waits for it.
+    """
+    if _state is None:
+        with _load_lock:
+            if _state is None:
+                load_forecast_models()
+    return _state
+
+def get_forecast_status():
+    """What is warmed up, without triggering a load (for /health/ready)."""
+    state = _state
+    if state is None:
+        return {"manifest_loaded": False}
+    return {
+        "manifest_loaded": True,
+        "version": state.version,
+        "available": sorted(state.models.entries),
+        "loaded": sorted(state.models.loaded_categories()),
+        "precomputed_forecasts": len(state.results),
+    }
+
+def get_model_version():
+    return get_forecast_state().version
 
-def get_forecast_model(category: str):
-    """Retrieve model from cache."""
-    return _forecast_models_cache.get(category)
+def get_forecast_model(category: str, keep_loaded: bool = True):
+    """Retrieve model from cache, loading it from the store if needed."""
+    return get_forecast_state().models.get(category, keep_loaded=keep_loaded)
 
 def update_forecast_cache(models: dict):
-    """Thread-safe update of cached models."""
+    """Publish retrained models to the store and install them (thread-safe)."""
     with _model_lock:
-        _forecast_models_cache.update(models)
-        print(f"Forecast cache updated with {len(models)} models")
+        manifest = publish_models(models, _new_version())
+        # Keep in memory only the categories that were in use before
+        in_use = _state.models.loaded_categories() if _state else []
+        loaded = {category: models[category] for category in in_use if category in models}
+        _install(LazyModels(manifest["categories"], loaded), manifest["version"])
+        print(f"Forecast cache updated with {len(models)} models (version {_state.version})")
 
-def retrain_forecast_models_async():
-    """Trigger background retraining."""
-    from app.services.retrain_service import retrain_forecast_models
-    threading.Thread(target=retrain_forecast_models, daemon=True).start()
+def _precompute_async(state: ForecastState):
+    from app.services.analytics_service import precompute_forecasts
+    threading.Thread(target=precompute_forecasts, args=(state,), daemon=True).start()
@@ -1,16 +1,28 @@
 import re
 import json
-import os
-import google.generativeai as genai
+from app.config import CLASSIFY_BATCH_MAX_SIZE, GEMINI_CLASSIFY_TIMEOUT_SECONDS
+from app.services.llm_cache import get_cached_response, store_response
+from app.services.gemini_client import generate_content, fallback_reason
+from app.utils.metrics import llm_fallbacks_total
 
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+CLASSIFIER_MODEL = "gemini-2.5-flash"
 
-def classify_grievance(problem: str):
-    """
-    Uses Gemini AI to classify a grievance into category, priority, and region.
-    Returns a clean JSON dict that the frontend can parse directly.
-    """
-    prompt = f"""
+DEFAULT_CLASSIFICATION = {
+    "category": "Other",
+    "priority": "Medium",
+    "region": "Unknown"
+}
+
+
+def _parse_json_response(text: str):
+    # Remove markdown formatting like ```json ... ```
+    text = re.sub(r"^```(?:json)?", "", text.strip())
+    text = re.sub(r"```$", "", text)
+    return json.loads(text.strip())
+
+
+def _build_prompt(problem: str):
+    return f"""
     You are a grievance classification assistant for a government system.
     Classify the following grievance and return only a JSON object.
 
@@ -24,24 +36,86 @@ def classify_grievance(problem: str):
     Grievance: "{problem}"
     """
 
-    try:
-        model = genai.GenerativeModel("gemini-2.5-flash")
-        response = model.generate_content(prompt)
-        text = response.text.strip()
 
-        # Remove markdown formatting like ```json ... ```
-        text = re.sub(r"^```(?:json)?", "", text)
-        text = re.sub(r"```$", "", text)
-        text = text.strip()
+def _build_batch_prompt(problems: list):
+    numbered = "\n".join(f"{i}. \"{problem}\"" for i, problem in enumerate(problems))
+    return f"""
+    You are a grievance classification assistant for a government system.
+    Classify EACH of the following {len(problems)} grievances and return only a JSON array
+    with exactly one object per grievance, in the same order.
 
-        # Parse JSON safely
-        parsed = json.loads(text)
-        return parsed
+    Required format of every object:
+    {{
+      "index": <number of the grievance>,
+      "category": "One of [Water, Electricity, Roads, Waste, Health, Law & Order, Other]",
+      "priority": "High / Medium / Low",
+      "region": "City or District name (if mentioned, else 'Unknown')"
+    }}
+
+    Grievances:
+    {numbered}
+    """
 
+
+def _clean_item(item):
+    """Validate one classification; anything unusable becomes None."""
+    if not isinstance(item, dict) or not item.get("category"):
+        return None
+    return {key: item.get(key) or default for key, default in DEFAULT_CLASSIFICATION.items()}
+
+
+def _classify_chunk(problems: list):
+    """
+    One Gemini round trip for up to CLASSIFY_BATCH_MAX_SIZE grievances:
+    (results, fallback reason), with None for every grievance left unclassified.
+    """
+    results = [None] * len(problems)
+    try:
+        response = generate_content(
+            CLASSIFIER_MODEL, _build_batch_prompt(problems), "classify_batch", GEMINI_CLASSIFY_TIMEOUT_SECONDS
+        )
+        parsed = _parse_json_response(response.text)
+        if not isinstance(parsed, list):
+            raise ValueError("batch response is not a JSON array")
     except Exception as e:
-        print("Gemini classification error:", e)
-        return {
-            "category": "Other",
-            "priority": "Medium",
-            "region": "Unknown"
-        }
+        print("Gemini batch classification error:", e)
+        return results, fallback_reason(e)
+
+    for position, item in enumerate(parsed):
+        index = item.get("index", position) if isinstance(item, dict) else position
+        if isinstance(index, int) and 0 <= index < len(problems) and results[index] is None:
+            results[index] = _clean_item(item)
+    return results, "error"
+
+
+def classify_grievances_batch(problems: list):
+    """
+    Classify many grievances with as few Gemini calls as possible.
+    Items Gemini skipped or mangled fall back to the default classification.
+    Results are cached per grievance, under the single-grievance prompt as key.
+    """
+    problems = [" ".join(problem.split()) for problem in problems]
+    results = [None] * len(problems)
+
+    # Serve what we can from the cache, and classify duplicates only once
+    pending = {}
+    for i, problem in enumerate(problems):
+        cached = get_cached_response(CLASSIFIER_MODEL, _build_prompt(problem))
+        if cached is not None:
+            results[i] = json.loads(cached)
+        else:
+            pending.setdefault(problem, []).append(i)
+
+    unique = list(pending)
+    for start in range(0, len(unique), CLASSIFY_BATCH_MAX_SIZE):
+        chunk = unique[start:start + CLASSIFY_BATCH_MAX_SIZE]
+        classifications, reason = _classify_chunk(chunk)
+        for problem, classification in zip(chunk, classifications):
+            if classification is not None:
+                store_response(CLASSIFIER_MODEL, _build_prompt(problem), json.dumps(classification))
+            if classification is None:
+                llm_fallbacks_total.inc(len(pending[problem]), operation="classify_batch", reason=reason)
+            for i in pending[problem]:
+                results[i] = classification or dict(DEFAULT_CLASSIFICATION)
+
+    return results
@@ -0,0 +1,115 @@
+import os
+import threading
+import time
+from app.config import (
+    GEMINI_API_ENDPOINT, GEMINI_TIMEOUT_SECONDS, GEMINI_SLOW_CALL_SECONDS,
+    GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_OPEN_SECONDS,
+)
+from app.utils.circuit_breaker import CircuitBreaker, CircuitOpenError
+from app.utils.metrics import track_external_call
+
+_genai = None
+_genai_lock = threading.Lock()
+
+# Shared by every Gemini call: when Gemini is down or slow, callers answer in degraded mode at once
+gemini_breaker = CircuitBreaker(
+    "gemini", GEMINI_BREAKER_FAILURES, GEMINI_BREAKER_OPEN_SECONDS, GEMINI_SLOW_CALL_SECONDS
+)
+
+
+def _configure(genai):
+    """
+    Set up the google-generativeai client. With GEMINI_API_ENDPOINT set, requests
+    go over REST to that host instead (e.g. http://127.0.0.1:9100 for the stub).
+    """
+    if GEMINI_API_ENDPOINT:
+        genai.configure(
+            api_key=os.getenv("GEMINI_API_KEY"),
+            transport="rest",
+            client_options={"api_endpoint": GEMINI_API_ENDPOINT},
+        )
+    else:
+        genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+
+
+def get_genai():
+    """
+    The configured google.generativeai module, imported on first use: it pulls in
+    the whole gRPC stack, which the API should not pay for before the first call.
+    """
+    global _genai
+    if _genai is None:
+        with _genai_lock:
+            if _genai is None:
+                import google.generativeai as genai
+                _configure(genai)
+                _genai = genai
+    return _genai
+
+
+def _request_options(timeout: float):
+    # The SDK's default retry ignores the timeout and can keep a thread busy for minutes
+    return {"timeout": timeout, "retry": None}
+
+
+def generate_content(model_name: str, prompt: str, operation: str, timeout: float = GEMINI_TIMEOUT_SECONDS):
+    """
+    One Gemini call with a deadline, behind the circuit breaker.
+    Raises CircuitOpenError without calling Gemini while the breaker is open.
+    """
+    if not gemini_breaker.allow():
+        raise CircuitOpenError("Gemini circuit breaker is open")
+    start = time.perf_counter()
+    try:
+        model = get_genai().GenerativeModel(model_name)
+        with track_external_call("gemini", operation):
+            response = model.generate_content(prompt, request_options=_request_options(timeout))
+    except Exception:
+        gemini_breaker.record_failure()
+        raise
+    gemini_breaker.record_success(time.perf_counter() - start)
+    return response
+
+
+def stream_content(model_name: str, prompt: str, operation: str, timeout: float = GEMINI_TIMEOUT_SECONDS):
+    """
+    Yield the answer's text as Gemini streams it; ``timeout`` bounds each wait
+    for the next chunk. Slowness is judged on the time to the first chunk.
+    """
+    if not gemini_breaker.allow():
+        raise CircuitOpenError("Gemini circuit breaker is open")
+    start = time.perf_counter()
+    first_chunk_seconds = None
+    recorded = False
+    try:
+        model = get_genai().GenerativeModel(model_name)
+        with track_external_call("gemini", operation):
+            for chunk in model.generate_content(prompt, stream=True, request_options=_request_options(timeout)):
+                if first_chunk_seconds is None:
+                    first_chunk_seconds = time.perf_counter() - start
+                if chunk.text:
+                    yield chunk.text
+        recorded = True
+        gemini_breaker.record_success(first_chunk_seconds or 0.0)
+    except Exception:
+        recorded = True
+        gemini_breaker.record_failure()
+        raise
+    finally:
+        if not recorded:
+            gemini_breaker.release()  # the consumer stopped reading
+
+
+def fallback_reason(error: Exception):
+    """Label for llm_fallbacks_total: circuit_open, timeout or error."""
+    if isinstance(error, CircuitOpenError):
+        return "circuit_open"
+    if isinstance(error, TimeoutError):
+        return "timeout"
+    try:
+        # Loaded by the failed call already (REST and gRPC transports)
+        from requests.exceptions import Timeout
+        from google.api_core.exceptions import DeadlineExceeded
+    except ImportError:
+        return "error"
+    return "timeout" if isinstance(error, (Timeout, DeadlineExceeded)) else "error"
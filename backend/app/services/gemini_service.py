@@ -1,31 +1,125 @@
-import google.generativeai as genai
-import os
 from dotenv import load_dotenv
+from app.services.llm_cache import get_cached_response, store_response
+from app.services.gemini_client import generate_content, stream_content, fallback_reason
+from app.config import LOCAL_CLASSIFIER_THRESHOLD
+from app.services.local_classifier import predict_category
+from app.utils.sse import sse_event
+from app.utils.metrics import llm_fallbacks_total
 
 load_dotenv()
 
-# Configure API Key
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+SOLUTION_MODEL = "gemini-2.0-flash"
+
+# Degraded mode (Gemini failed, timed out or its breaker is open): a templated plan
+# addressed to the department of the locally predicted category
+SOLUTION_DEPARTMENTS = {
+    "Roads": "Public Works Department",
+    "Water": "Jal Nigam",
+    "Electricity": "power distribution company",
+    "Waste": "Nagar Nigam sanitation wing",
+    "Health": "District Health Department",
+    "Law & Order": "local police station",
+}
+
+SOLUTION_TEMPLATE = (
+    "1. **Short-term Action:** Forward the complaint to the {department}, have an officer "
+    "inspect the reported location within 48 hours and keep the citizen informed of progress.\n\n"
+    "2. **Long-term Solution:** Track repeat complaints from this area and include it in the "
+    "{department}'s preventive maintenance and review plan."
+)
+
+def _build_solution_prompt(grievance_text: str):
+    grievance_text = " ".join(grievance_text.split())
+    # We enforce a specific structure in the prompt
+    return (
+        f"Act as a government grievance redressal expert. "
+        f"Analyze this citizen complaint: '{grievance_text}'.\n\n"
+        f"Provide a structured response with exactly these two sections:\n"
+        f"1. **Short-term Action:** (Immediate steps to resolve the specific issue within 24-48 hours)\n"
+        f"2. **Long-term Solution:** (Systemic changes or infrastructure upgrades to prevent recurrence)\n\n"
+        f"Keep the tone professional and empathetic."
+    )
+
+def templated_solution(grievance_text: str):
+    label, confidence = predict_category(grievance_text)
+    # A misrouted plan is worse than a generic one
+    department = "concerned department"
+    if confidence >= LOCAL_CLASSIFIER_THRESHOLD:
+        department = SOLUTION_DEPARTMENTS.get(label, department)
+    return SOLUTION_TEMPLATE.format(department=department)
+
+def generate_text(prompt: str, operation: str):
+    """
+    Gemini's answer to ``prompt`` (cached); raises when Gemini fails,
+    times out or its circuit breaker is open.
+    """
+    cached = get_cached_response(SOLUTION_MODEL, prompt)
+    if cached is not None:
+        return cached
+
+    response = generate_content(SOLUTION_MODEL, prompt, operation)
+    store_response(SOLUTION_MODEL, prompt, response.text)
+    return response.text
 
 def generate_solution(grievance_text: str):
     """
     Generates a structured short-term and long-term solution using Gemini AI.
     """
     try:
-        model = genai.GenerativeModel('gemini-2.0-flash') # Or 'gemini-pro'
-        
-        # We enforce a specific structure in the prompt
-        prompt = (
-            f"Act as a government grievance redressal expert. "
-            f"Analyze this citizen complaint: '{grievance_text}'.\n\n"
-            f"Provide a structured response with exactly these two sections:\n"
-            f"1. **Short-term Action:** (Immediate steps to resolve the specific issue within 24-48 hours)\n"
-            f"2. **Long-term Solution:** (Systemic changes or infrastructure upgrades to prevent recurrence)\n\n"
-            f"Keep the tone professional and empathetic."
-        )
-        
-        response = model.generate_content(prompt)
-        return response.text
+        return generate_text(_build_solution_prompt(grievance_text), "solution")
     except Exception as e:
         print(f"Gemini Error: {e}")
-        return "Solution generation unavailable at the moment."
\ No newline at end of file
+        llm_fallbacks_total.inc(operation="solution", reason=fallback_reason(e))
+        return templated_solution(grievance_text)
+
+def stream_solution(grievance_text: str):
+    """
+    Yields the solution text as Gemini generates it (a cache hit comes as one chunk).
+    Only complete answers are cached; errors are raised to the caller.
+    """
+    prompt = _build_solution_prompt(grievance_text)
+    cached = get_cached_response(SOLUTION_MODEL, prompt)
+    if cached is not None:
+        yield cached
+        return
+
+    parts = []
+    for text in stream_content(SOLUTION_MODEL, prompt, "solution_stream"):
+        parts.append(text)
+        yield text
+    store_response(SOLUTION_MODEL, prompt, "".join(parts))
+
+def saved_solution_events(solution: str):
+    """The events of solution_event_stream for a solution that is already saved."""
+    yield sse_event("token", {"text": solution})
+    yield sse_event("done", {"solution": solution, "complete": True})
+
+def solution_event_stream(grievance_text: str, on_complete=None):
+    """
+    Server-Sent Events for a streamed solution: "token" events with text deltas,
+    then "done" with the full text. ``on_complete(solution)`` runs only when
+    Gemini finished the answer (not for the templated one or a broken stream).
+    """
+    parts = []
+    try:
+        for delta in stream_solution(grievance_text):
+            parts.append(delta)
+            yield sse_event("token", {"text": delta})
+    except Exception as e:
+        print(f"Gemini streaming error: {e}")
+        if parts:
+            yield sse_event("error", {"detail": "Solution stream interrupted"})
+            return
+        llm_fallbacks_total.inc(operation="solution_stream", reason=fallback_reason(e))
+        solution = templated_solution(grievance_text)
+        yield sse_event("token", {"text": solution})
+        yield sse_event("done", {"solution": solution, "complete": False})
+        return
+
+    solution = "".join(parts)
+    if on_complete:
+        try:
+            on_complete(solution)
+        except Exception as e:
+            print(f"Could not save streamed solution: {e}")
+    yield sse_event("done", {"solution": solution, "complete": True})
\ No newline at end of file
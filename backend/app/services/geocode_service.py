@@ -1,14 +1,146 @@
-from opencage.geocoder import OpenCageGeocode
+import csv
 import os
+import re
+import threading
+from datetime import datetime, timedelta
+from app.config import (
+    GEOCODE_CACHE_SIZE, GEOCODE_CACHE_TTL_SECONDS, GEOCODE_DB_TTL_DAYS, OPENCAGE_API_URL
+)
+from app.db.connection import SessionLocal
+from app.db.models import GeocodeCache
+from app.utils.ttl_cache import TTLCache
+from app.utils.metrics import db_query_seconds, track_external_call, observe_cache_stats
 
-def get_location(address):
-    api_key = os.getenv("OPENCAGE_API_KEY")
-    if not api_key:
+GAZETTEER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "data", "up_gazetteer.csv"
+)
+
+# Level 1: in-process LRU; level 2: geocode_cache table; then the OpenCage API
+_memory_cache = TTLCache(maxsize=GEOCODE_CACHE_SIZE, ttl=GEOCODE_CACHE_TTL_SECONDS)
+_gazetteer = None
+_geocoder = None
+_geocoder_lock = threading.Lock()
+
+_stats = {"db_hits": 0, "gazetteer_hits": 0, "api_calls": 0, "api_errors": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(stat: str):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def normalize_region(name: str):
+    """Cache key for a region name: trimmed, single-spaced, lower-case."""
+    return re.sub(r"\s+", " ", name or "").strip().lower()
+
+
+def load_gazetteer():
+    """Read the bundled Uttar Pradesh districts/towns file once."""
+    global _gazetteer
+    if _gazetteer is None:
+        entries = {}
+        try:
+            with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    entries[normalize_region(row["name"])] = {
+                        "latitude": float(row["latitude"]),
+                        "longitude": float(row["longitude"]),
+                    }
+        except Exception as e:
+            print("Could not load gazetteer:", e)
+        _gazetteer = entries
+    return _gazetteer
+
+
+def seed_geocode_cache():
+    """Insert gazetteer entries missing from the geocode_cache table."""
+    db = SessionLocal()
+    try:
+        existing = {key for (key,) in db.query(GeocodeCache.region_key).all()}
+        new_rows = [
+            GeocodeCache(region_key=key, source="gazetteer", **location)
+            for key, location in load_gazetteer().items()
+            if key not in existing
+        ]
+        db.add_all(new_rows)
+        db.commit()
+        if new_rows:
+            print(f"Seeded geocode cache with {len(new_rows)} gazetteer entries")
+        return len(new_rows)
+    except Exception as e:
+        db.rollback()
+        print("Could not seed geocode cache:", e)
+        return 0
+    finally:
+        db.close()
+
+
+def _get_geocoder():
+    global _geocoder
+    if _geocoder is None:
+        api_key = os.getenv("OPENCAGE_API_KEY")
+        if not api_key:
+            return None
+        with _geocoder_lock:
+            if _geocoder is None:
+                from opencage.geocoder import OpenCageGeocode
+                if OPENCAGE_API_URL:
+                    protocol, _, domain = OPENCAGE_API_URL.rstrip("/").partition("://")
+                    _geocoder = OpenCageGeocode(api_key, protocol=protocol, domain=domain)
+                else:
+                    _geocoder = OpenCageGeocode(api_key)
+    return _geocoder
+
+
+def _lookup_db(key: str):
+    db = SessionLocal()
+    try:
+        with db_query_seconds.time(group="geocode_cache"):
+            row = db.query(GeocodeCache).filter(GeocodeCache.region_key == key).first()
+    except Exception as e:
+        print("Geocode cache lookup error:", e)
+        return None
+    finally:
+        db.close()
+
+    if not row:
+        return None
+    if row.source != "gazetteer" and row.updated_at:
+        if row.updated_at < datetime.utcnow() - timedelta(days=GEOCODE_DB_TTL_DAYS):
+            return None
+    return {"latitude": row.latitude, "longitude": row.longitude}
+
+
+def _store_db(key: str, location: dict, source: str):
+    db = SessionLocal()
+    try:
+        with db_query_seconds.time(group="geocode_cache"):
+            db.merge(GeocodeCache(
+                region_key=key,
+                latitude=location["latitude"],
+                longitude=location["longitude"],
+                source=source,
+                updated_at=datetime.utcnow(),
+            ))
+            db.commit()
+    except Exception as e:
+        db.rollback()
+        print("Geocode cache write error:", e)
+    finally:
+        db.close()
+
+
+def _geocode_remote(address: str):
+    """Ask OpenCage. Returns None on failure so the result isn't cached."""
+    geocoder = _get_geocoder()
+    if geocoder is None:
         print("No OpenCage API key found.")
-        return {"latitude": None, "longitude": None}
-    geocoder = OpenCageGeocode(api_key)
+        return None
+    _count("api_calls")
     try:
-        result = geocoder.geocode(address)
+        with track_external_call("opencage", "geocode"):
+            result = geocoder.geocode(address)
         if result:
             return {
                 "latitude": result[0]['geometry']['lat'],
@@ -16,5 +148,49 @@ def get_location(address):
             }
         return {"latitude": None, "longitude": None}
     except Exception as e:
+        _count("api_errors")
         print("Geocoding error:", e)
+        return None
+
+
+def get_location(address):
+    key = normalize_region(address)
+    if not key:
         return {"latitude": None, "longitude": None}
+
+    location = _memory_cache.get(key)
+    if location is not None:
+        return dict(location)
+
+    location = _lookup_db(key)
+    if location is not None:
+        _count("db_hits")
+    else:
+        # The gazetteer answers even if the table was never seeded or the DB is down
+        location = load_gazetteer().get(key)
+        if location is not None:
+            _count("gazetteer_hits")
+        else:
+            location = _geocode_remote(address)
+            if location is None:
+                return {"latitude": None, "longitude": None}
+            _store_db(key, location, "opencage")
+
+    _memory_cache.set(key, location)
+    return dict(location)
+
+
+def get_geocode_stats():
+    """Hit/miss counters for every cache level."""
+    memory = _memory_cache.stats()
+    with _stats_lock:
+        stats = dict(_stats)
+    return {
+        "memory_hits": memory["hits"],
+        "memory_misses": memory["misses"],
+        "memory_size": memory["size"],
+        **stats,
+    }
+
+
+observe_cache_stats("geocode_memory", get_geocode_stats, hits="memory_hits", misses="memory_misses")
@@ -0,0 +1,69 @@
+import csv
+import io
+import json
+import zlib
+from sqlalchemy import select
+from app.db.connection import SessionLocal
+from app.db.models import Grievance
+from app.db.schemas import GrievanceResponse
+from app.services.grievance_listing import apply_grievance_filters
+
+# Rows fetched from the server-side cursor (and written out) per chunk
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_COLUMNS = list(GrievanceResponse.model_fields)
+
+MEDIA_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+
+def _format_value(value):
+    return value.isoformat() if hasattr(value, "isoformat") else value
+
+
+def _encode_chunk(rows, fmt: str, header: bool):
+    buffer = io.StringIO()
+    if fmt == "csv":
+        writer = csv.writer(buffer)
+        if header:
+            writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            writer.writerow(["" if value is None else _format_value(value) for value in row])
+    else:
+        for row in rows:
+            record = {name: _format_value(value) for name, value in zip(EXPORT_COLUMNS, row)}
+            buffer.write(json.dumps(record) + "\n")
+    return buffer.getvalue().encode("utf-8")
+
+
+def stream_export(filters: dict, fmt: str = "csv", compress: bool = False):
+    """
+    Yield the filtered grievances, newest first, as CSV or NDJSON byte chunks
+    (gzip-compressed on the fly when ``compress``). Rows come from a
+    server-side cursor, so memory stays flat whatever the export size.
+    """
+    columns = [getattr(Grievance, name) for name in EXPORT_COLUMNS]
+    query = apply_grievance_filters(select(*columns), filters)
+    query = (
+        query.order_by(Grievance.created_at.desc(), Grievance.id.desc())
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    gzip = zlib.compressobj(wbits=31) if compress else None  # 31 = gzip container
+
+    db = SessionLocal()
+    try:
+        header = True
+        for partition in db.execute(query).partitions():
+            chunk = _encode_chunk(partition, fmt, header)
+            header = False
+            chunk = gzip.compress(chunk) if gzip else chunk
+            if chunk:
+                yield chunk
+        if header:
+            chunk = _encode_chunk([], fmt, header)  # empty export: CSV header only
+            chunk = gzip.compress(chunk) if gzip else chunk
+            if chunk:
+                yield chunk
+        if gzip:
+            yield gzip.flush()
+    finally:
+        db.close()
@@ -0,0 +1,85 @@
+import base64
+from datetime import date, datetime, timedelta
+from typing import Optional
+from fastapi import HTTPException
+from sqlalchemy import func, tuple_
+from app.db.models import Grievance
+
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+
+
+def grievance_filters(
+    status: Optional[str] = None,
+    category: Optional[str] = None,
+    priority: Optional[str] = None,
+    region: Optional[str] = None,
+    created_from: Optional[datetime] = None,
+    created_to: Optional[datetime] = None,
+):
+    """Query-string filters shared by the listing endpoints (FastAPI dependency)."""
+    return {
+        "status": status,
+        "category": category,
+        "priority": priority,
+        "region": region,
+        "created_from": created_from,
+        "created_to": created_to,
+    }
+
+
+def apply_grievance_filters(query, filters: dict):
+    for column in ("status", "category", "priority", "region"):
+        if filters.get(column):
+            query = query.filter(getattr(Grievance, column) == filters[column])
+    if filters.get("created_from"):
+        query = query.filter(Grievance.created_at >= filters["created_from"])
+    if filters.get("created_to"):
+        query = query.filter(Grievance.created_at < filters["created_to"])
+    return query
+
+
+def encode_cursor(grievance: Grievance):
+    raw = f"{grievance.created_at.isoformat()}|{grievance.id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str):
+    try:
+        created_at, grievance_id = base64.urlsafe_b64decode(cursor.encode()).decode().split("|")
+        return datetime.fromisoformat(created_at), int(grievance_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def paginate_grievances(query, cursor: Optional[str], limit: int):
+    """
+    Keyset pagination, newest first, on (created_at, id).
+    Returns (page, next_cursor); next_cursor is None on the last page.
+    """
+    if cursor:
+        created_at, grievance_id = decode_cursor(cursor)
+        query = query.filter(
+            tuple_(Grievance.created_at, Grievance.id) < tuple_(created_at, grievance_id)
+        )
+
+    rows = (
+        query.order_by(Grievance.created_at.desc(), Grievance.id.desc())
+        .limit(limit + 1)
+        .all()
+    )
+    page = rows[:limit]
+    next_cursor = encode_cursor(page[-1]) if len(rows) > limit else None
+    return page, next_cursor
+
+
+def count_by_priority(db, start: date = None, end: date = None, region: str = None, category: str = None):
+    """Totals per priority, largest first. Counted on grievances: the daily rollup has no priority."""
+    query = apply_grievance_filters(db.query(Grievance.priority, func.count()), {
+        "region": region,
+        "category": category,
+        "created_from": start,
+        "created_to": end + timedelta(days=1) if end else None,
+    })
+    rows = query.group_by(Grievance.priority).order_by(func.count().desc()).all()
+    return {priority or "Unknown": int(count) for priority, count in rows}
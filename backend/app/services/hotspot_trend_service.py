@@ -1,86 +1,92 @@
-import pandas as pd
-from app.db.connection import get_db
+import threading
+from app.db.connection import SessionLocal
 from app.db.models import Grievance
-import joblib
-import numpy as np
+from app.utils.aggregate_data import fetch_region_hotspots
+from app.services.rollup_service import get_dominant_categories
+from app.services.forecast_manager import get_forecast_state
 
-def get_hotspot_trends(limit=5):
-    """Combine real hotspot volume with Prophet forecast trend (region + category adaptive)."""
-    db = next(get_db())
+TREND_DAYS = 30
+_trend_lock = threading.Lock()
 
-    #Fetch real grievance data ---
-    grievances = db.query(Grievance).all()
-    if not grievances:
-        return {"message": "No grievance data yet."}
 
-    data = [
-        {
-            "region": g.region,
-            "latitude": g.latitude,
-            "longitude": g.longitude,
-            "category": g.category
-        }
-        for g in grievances if g.latitude and g.longitude
-    ]
-    df = pd.DataFrame(data)
-    if df.empty:
-        return {"message": "No valid geolocation data yet."}
-
-    #Aggregate complaint counts per region ---
-    hotspot_df = (
-        df.groupby(["region", "latitude", "longitude"])
-        .size()
-        .reset_index(name="complaint_count")
-        .sort_values(by="complaint_count", ascending=False)
-        .head(limit)
+def _trend_from_series(yhat):
+    #Calculate trend
+    first, last = yhat[0], yhat[-1]
+    change = ((last - first) / first) * 100 if first != 0 else 0
+    trend = (
+        "increase" if change > 5 else
+        "decrease" if change < -5 else
+        "stable"
     )
+    return trend, round(float(change), 2)
 
-    #Load Prophet models ---
-    try:
-        models = joblib.load("app/models/forecast/up_forecast.pkl")
-        print("Forecast models loaded successfully.")
-    except Exception as e:
-        print("Could not load Prophet models:", e)
-        models = {}
 
-    results = []
+def get_category_trend(category: str, state=None):
+    """30-day trend of a category, computed once per model version."""
+    state = state or get_forecast_state()
+    if category in state.trends:
+        return state.trends[category]
 
-    #For each hotspot region ---
-    for _, row in hotspot_df.iterrows():
-        region = row["region"]
+    model = state.models.get(category)
+    if model is None:
+        return "unknown", 0
 
-        # Determine the dominant grievance category for this region
-        region_categories = df[df["region"] == region]["category"].value_counts()
-        category = region_categories.index[0] if not region_categories.empty else "Infrastructure"
+    with _trend_lock:
+        if category not in state.trends:
+            # Reuse the precomputed dashboard forecast when it is already there
+            cached = state.results.get((category, TREND_DAYS))
+            if cached is not None:
+                yhat = [point["predicted_count"] for point in cached["forecast"]]
+            else:
+                future = model.make_future_dataframe(periods=TREND_DAYS)
+                yhat = model.predict(future).tail(TREND_DAYS)["yhat"].tolist()
+            state.trends[category] = _trend_from_series(yhat)
+    return state.trends[category]
 
-        #Using corresponding Prophet model
-        if category in models:
-            model = models[category]
 
-            # Forecast for next 30 days
-            future = model.make_future_dataframe(periods=30)
-            forecast = model.predict(future).tail(30)
+def get_hotspot_trends(limit=5):
+    """Combine real hotspot volume with Prophet forecast trend (region + category adaptive)."""
+    db = SessionLocal()
+    try:
+        #Check for real grievance data ---
+        if db.query(Grievance.id).first() is None:
+            return {"message": "No grievance data yet."}
+
+        #Aggregate complaint counts per region (GROUP BY in SQL) ---
+        hotspot_df = fetch_region_hotspots(db, limit)
+        if hotspot_df.empty:
+            return {"message": "No valid geolocation data yet."}
+
+        #Dominant grievance category of the top regions, from the daily rollup ---
+        dominant = get_dominant_categories(db, hotspot_df["region"].tolist())
+    finally:
+        db.close()
+
+    hotspot_df["dominant_category"] = (
+        hotspot_df["region"].map(dominant).fillna("Infrastructure")
+    )
 
-            #Calculate trend
-            first, last = forecast["yhat"].iloc[0], forecast["yhat"].iloc[-1]
-            change = ((last - first) / first) * 100 if first != 0 else 0
-            trend = (
-                "increase" if change > 5 else
-                "decrease" if change < -5 else
-                "stable"
-            )
-        else:
-            change, trend = 0, "unknown"
+    #Trend per distinct category (memoized per model version) ---
+    state = get_forecast_state()
+    trends = {
+        category: get_category_trend(category, state)
+        for category in hotspot_df["dominant_category"].unique()
+    }
 
-        results.append({
+    results = [
+        {
             "region": region,
             "dominant_category": category,
-            "latitude": float(row["latitude"]),
-            "longitude": float(row["longitude"]),
-            "current_complaints": int(row["complaint_count"]),
-            "forecast_trend": trend,
-            "expected_change_percent": round(change, 2)
-        })
+            "latitude": float(lat),
+            "longitude": float(lon),
+            "current_complaints": int(count),
+            "forecast_trend": trends[category][0],
+            "expected_change_percent": trends[category][1]
+        }
+        for region, lat, lon, count, category in hotspot_df[
+            ["region", "latitude", "longitude", "complaint_count", "dominant_category"]
+        ].itertuples(index=False)
+    ]
 
     #Sort by most active regions first ---
     results = sorted(results, key=lambda x: x["current_complaints"], reverse=True)
@@ -0,0 +1,132 @@
+import hashlib
+import re
+import threading
+from datetime import datetime, timedelta
+from app.config import LLM_CACHE_ENABLED, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL_SECONDS
+from app.db.connection import SessionLocal
+from app.db.models import LLMResponseCache
+from app.utils.metrics import db_query_seconds, observe_cache_stats
+
+# Evict only every few writes so inserts don't each pay for a COUNT(*)
+_EVICT_EVERY_N_WRITES = 50
+
+_stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(stat: str, amount: int = 1):
+    with _stats_lock:
+        _stats[stat] += amount
+
+
+def normalize_prompt(prompt: str):
+    """Ignore case and whitespace differences between otherwise identical prompts."""
+    return re.sub(r"\s+", " ", prompt or "").strip().lower()
+
+
+def make_cache_key(model_name: str, prompt: str):
+    payload = f"{model_name}\n{normalize_prompt(prompt)}"
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def get_cached_response(model_name: str, prompt: str):
+    """Return the cached response text, or None on miss / expiry."""
+    if not LLM_CACHE_ENABLED:
+        return None
+
+    key = make_cache_key(model_name, prompt)
+    db = SessionLocal()
+    try:
+        with db_query_seconds.time(group="llm_cache"):
+            entry = db.query(LLMResponseCache).filter(LLMResponseCache.cache_key == key).first()
+            now = datetime.utcnow()
+            if not entry or (entry.expires_at and entry.expires_at <= now):
+                _count("misses")
+                return None
+
+            entry.last_accessed_at = now
+            db.commit()
+        _count("hits")
+        return entry.response
+    except Exception as e:
+        db.rollback()
+        print("LLM cache lookup error:", e)
+        return None
+    finally:
+        db.close()
+
+
+def store_response(model_name: str, prompt: str, response: str, ttl_seconds: int = None):
+    """Save a successful response. Failures here never break the caller."""
+    if not LLM_CACHE_ENABLED or not response:
+        return
+
+    now = datetime.utcnow()
+    ttl = LLM_CACHE_TTL_SECONDS if ttl_seconds is None else ttl_seconds
+    db = SessionLocal()
+    try:
+        with db_query_seconds.time(group="llm_cache"):
+            db.merge(LLMResponseCache(
+                cache_key=make_cache_key(model_name, prompt),
+                model=model_name,
+                response=response,
+                created_at=now,
+                last_accessed_at=now,
+                expires_at=now + timedelta(seconds=ttl),
+            ))
+            db.commit()
+        _count("writes")
+        if _stats["writes"] % _EVICT_EVERY_N_WRITES == 0:
+            evict_entries(db)
+    except Exception as e:
+        db.rollback()
+        print("LLM cache write error:", e)
+    finally:
+        db.close()
+
+
+def evict_entries(db=None):
+    """Drop expired rows, then least-recently-used rows above the size bound."""
+    own_session = db is None
+    db = db or SessionLocal()
+    try:
+        removed = (
+            db.query(LLMResponseCache)
+            .filter(LLMResponseCache.expires_at <= datetime.utcnow())
+            .delete(synchronize_session=False)
+        )
+
+        overflow = db.query(LLMResponseCache).count() - LLM_CACHE_MAX_ENTRIES
+        if overflow > 0:
+            oldest = (
+                db.query(LLMResponseCache.cache_key)
+                .order_by(LLMResponseCache.last_accessed_at.asc())
+                .limit(overflow)
+                .subquery()
+            )
+            removed += (
+                db.query(LLMResponseCache)
+                .filter(LLMResponseCache.cache_key.in_(db.query(oldest.c.cache_key)))
+                .delete(synchronize_session=False)
+            )
+        db.commit()
+        _count("evictions", removed)
+        return removed
+    except Exception as e:
+        db.rollback()
+        print("LLM cache eviction error:", e)
+        return 0
+    finally:
+        if own_session:
+            db.close()
+
+
+def get_llm_cache_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    lookups = stats["hits"] + stats["misses"]
+    stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+    return stats
+
+
+observe_cache_stats("llm", get_llm_cache_stats)
@@ -0,0 +1,250 @@
+import csv
+import re
+import threading
+import time
+from app.config import (
+    LOCAL_CLASSIFIER_THRESHOLD, LOCAL_CLASSIFIER_TRAINING_SIZE, LOCAL_CLASSIFIER_FULL_COVERAGE
+)
+from app.services.geocode_service import GAZETTEER_PATH
+from app.services.synthetic_grievances import CATEGORY_GROUPS, generate_grievance_texts, split_issues
+from app.utils.keyword_matcher import KeywordMatcher
+
+#Keyword rules (fine-grained label per keyword)
+CATEGORY_KEYWORDS = {
+    "Roads": ["road", "traffic", "pothole", "bridge", "footpath", "flyover", "highway"],
+    "Water": ["water", "pipeline", "tap", "hand pump", "tubewell", "tanker"],
+    "Electricity": ["electricity", "power cut", "power outage", "transformer", "voltage",
+                    "street light", "electric"],
+    "Waste": ["garbage", "sanitation", "drain", "sewer", "sewage", "toilet", "waste", "sweeper"],
+    "Health": ["hospital", "doctor", "medicine", "ambulance", "health", "dengue", "phc"],
+    "Law & Order": ["police", "theft", "snatching", "goons", "liquor", "eve teasing"],
+}
+
+PRIORITY_KEYWORDS = {
+    "High": ["accident", "fire", "collapse", "emergency", "ambulance", "health"],
+    "Medium": ["pothole", "flood", "supply issue", "power cut"],
+}
+
+# Confidence of keyword matches that all fall in one IGRS group
+KEYWORD_CONFIDENCE = 0.9
+PRIORITY_CONFIDENCE = {"High": 0.9, "Medium": 0.8, "Low": 0.6}
+
+_category_matcher = KeywordMatcher({
+    keyword: label for label, keywords in CATEGORY_KEYWORDS.items() for keyword in keywords
+})
+_priority_matcher = KeywordMatcher({
+    keyword: priority for priority, keywords in PRIORITY_KEYWORDS.items() for keyword in keywords
+})
+_region_matcher = None
+_model = None
+_vocabulary = None  # content words of the phrasings the model was trained on
+_model_lock = threading.Lock()
+
+_stats = {"keyword": 0, "model": 0, "low_confidence": 0}
+_stats_lock = threading.Lock()
+
+
+def _count(stat: str):
+    with _stats_lock:
+        _stats[stat] += 1
+
+
+def _get_region_matcher():
+    """Gazetteer names and aliases -> canonical spelling from the file."""
+    global _region_matcher
+    if _region_matcher is None:
+        names = {}
+        try:
+            with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+                for row in csv.DictReader(f):
+                    names[row["name"].lower()] = row["name"]
+        except Exception as e:
+            print("Could not load gazetteer for region matching:", e)
+        _region_matcher = KeywordMatcher(names, whole_words=True)
+    return _region_matcher
+
+
+def _content_words(text: str):
+    from sklearn.feature_extraction.text import ENGLISH_STOP_WORDS
+
+    return [word for word in re.findall(r"[a-z]{2,}", text.lower()) if word not in ENGLISH_STOP_WORDS]
+
+
+def _train_model():
+    """
+    TF-IDF + linear SVM fitted on synthetic grievances. The sigmoid calibration
+    is fitted on issue phrasings held out from training, so confidences reflect
+    unfamiliar wording rather than the SVM's own templates.
+    """
+    global _vocabulary
+    from sklearn.calibration import CalibratedClassifierCV
+    from sklearn.feature_extraction.text import TfidfVectorizer
+    from sklearn.frozen import FrozenEstimator
+    from sklearn.pipeline import make_pipeline
+    from sklearn.svm import LinearSVC
+
+    start = time.perf_counter()
+    kept, held_out = split_issues()
+    texts, labels = zip(*generate_grievance_texts(LOCAL_CLASSIFIER_TRAINING_SIZE, issues=kept))
+    calibration_texts, calibration_labels = zip(*generate_grievance_texts(
+        LOCAL_CLASSIFIER_TRAINING_SIZE // 3, seed=7, issues=held_out
+    ))
+    svm = make_pipeline(
+        TfidfVectorizer(ngram_range=(1, 2), sublinear_tf=True, min_df=2),
+        LinearSVC(C=0.5),
+    ).fit(texts, labels)
+    model = CalibratedClassifierCV(FrozenEstimator(svm), method="sigmoid")
+    model.fit(calibration_texts, calibration_labels)
+
+    _vocabulary = {word for phrases in kept.values() for phrase in phrases for word in _content_words(phrase)}
+    _vocabulary |= {word for keywords in CATEGORY_KEYWORDS.values() for keyword in keywords
+                    for word in _content_words(keyword)}
+    print(f"Local classifier trained on {len(texts)} synthetic grievances "
+          f"(calibrated on {len(calibration_texts)} held-out) in {time.perf_counter() - start:.2f}s")
+    return model
+
+
+def get_model():
+    global _model
+    if _model is None:
+        with _model_lock:
+            if _model is None:
+                _model = _train_model()
+    return _model
+
+
+def _coverage(text: str):
+    """Share of the text's content words the model was trained on (0 when it has none)."""
+    words = _content_words(text)
+    if not words:
+        return 0.0
+    return sum(word in _vocabulary for word in words) / len(words)
+
+
+def _keyword_votes(text: str):
+    votes = {}
+    for _, label in _category_matcher.find_all(text):
+        votes[label] = votes.get(label, 0) + 1
+    return votes
+
+
+def _group_votes(votes: dict):
+    """Keyword votes summed per IGRS group (Water and Electricity both count for Utilities)."""
+    groups = {}
+    for label, n in votes.items():
+        group = CATEGORY_GROUPS.get(label, "Other")
+        groups[group] = groups.get(group, 0) + n
+    return groups
+
+
+def _keyword_rule(votes: dict):
+    """First matched label in CATEGORY_KEYWORDS order, as the original keyword rules decided."""
+    return next((label for label in CATEGORY_KEYWORDS if label in votes), "Other")
+
+
+def keyword_category(text: str):
+    """IGRS category from the keyword rules alone ("Other" when no keyword matches)."""
+    return CATEGORY_GROUPS.get(_keyword_rule(_keyword_votes(text)), "Other")
+
+
+def _blend(probabilities, votes: dict):
+    """Average the model's probabilities with the keyword vote; (label, confidence)."""
+    if votes:
+        total = sum(votes.values())
+        probabilities = {
+            label: (p + votes.get(label, 0) / total) / 2 for label, p in probabilities.items()
+        }
+    label = max(probabilities, key=probabilities.get)
+    return label, float(probabilities[label])
+
+
+def predict_category(text: str):
+    """
+    (label, confidence) for the fine-grained category.
+    Keywords that all point to one IGRS group are answered straight away;
+    texts spanning several groups, or without keywords, go through the linear
+    model, blended with the keyword vote.
+    """
+    return predict_categories([text])[0]
+
+
+def predict_categories(texts: list):
+    """predict_category for many texts, with one model call for all that need it."""
+    results = [None] * len(texts)
+    uncertain = []
+    for i, text in enumerate(texts):
+        votes = _keyword_votes(text)
+        if len(_group_votes(votes)) == 1:
+            # Most votes within the group, ties in CATEGORY_KEYWORDS order
+            label = max((label for label in CATEGORY_KEYWORDS if label in votes), key=votes.get)
+            results[i] = (label, KEYWORD_CONFIDENCE)
+        else:
+            uncertain.append((i, votes))
+
+    if uncertain:
+        model = get_model()
+        rows = model.predict_proba([texts[i] for i, _ in uncertain])
+        for (i, votes), row in zip(uncertain, rows):
+            label, confidence = _blend(dict(zip(model.classes_, row)), votes)
+            # Mostly unknown words: the probabilities say little, whatever their size
+            coverage = _coverage(texts[i])
+            results[i] = (label, confidence * min(1.0, coverage / LOCAL_CLASSIFIER_FULL_COVERAGE))
+
+    with _stats_lock:
+        _stats["keyword"] += len(texts) - len(uncertain)
+        _stats["model"] += len(uncertain)
+    return results
+
+
+def predict_priority(text: str):
+    """(priority, confidence): the most severe keyword found wins."""
+    found = {priority for _, priority in _priority_matcher.find_all(text)}
+    for priority in ("High", "Medium"):
+        if priority in found:
+            return priority, PRIORITY_CONFIDENCE[priority]
+    return "Low", PRIORITY_CONFIDENCE["Low"]
+
+
+def find_region(text: str):
+    """First gazetteer district/town mentioned in the text, or None."""
+    matches = _get_region_matcher().find_all(text)
+    return matches[0][1] if matches else None
+
+
+def classify_text(problem: str):
+    """
+    Local classification in Gemini's response format plus the IGRS category,
+    confidences and ``source``; no network I/O.
+    """
+    return classify_texts([problem])[0]
+
+
+def classify_texts(problems: list):
+    """classify_text for a batch (one vectorized model call)."""
+    results = []
+    for problem, (label, confidence) in zip(problems, predict_categories(problems)):
+        priority, priority_confidence = predict_priority(problem)
+        if confidence < LOCAL_CLASSIFIER_THRESHOLD:
+            _count("low_confidence")
+        results.append({
+            "category": label,
+            "igrs_category": CATEGORY_GROUPS.get(label, "Other"),
+            "priority": priority,
+            "region": find_region(problem) or "Unknown",
+            "confidence": round(confidence, 4),
+            "priority_confidence": priority_confidence,
+            "source": "local",
+        })
+    return results
+
+
+def is_confident(result: dict):
+    return result["confidence"] >= LOCAL_CLASSIFIER_THRESHOLD
+
+
+def get_local_classifier_stats():
+    with _stats_lock:
+        stats = dict(_stats)
+    stats["threshold"] = LOCAL_CLASSIFIER_THRESHOLD
+    stats["model_trained"] = _model is not None
+    return stats
@@ -0,0 +1,57 @@
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from app.db.models import Grievance
+
+
+def _in_bbox(min_lat: float, min_lng: float, max_lat: float, max_lng: float):
+    return (
+        Grievance.latitude.between(min_lat, max_lat),
+        Grievance.longitude.between(min_lng, max_lng),
+    )
+
+
+def get_viewport_grievances(db: Session, min_lat: float, min_lng: float,
+                            max_lat: float, max_lng: float,
+                            limit: int = 500, precision: int = 5):
+    """
+    Grievances inside a bounding box (served by the lat/lng index) plus
+    per-geohash-cell counts, so the map can draw clusters when zoomed out.
+    """
+    bbox = _in_bbox(min_lat, min_lng, max_lat, max_lng)
+
+    cell = func.substr(Grievance.geohash, 1, precision).label("geohash")
+    cell_count = func.count().label("count")
+    cells = (
+        db.query(
+            cell,
+            func.avg(Grievance.latitude).label("latitude"),
+            func.avg(Grievance.longitude).label("longitude"),
+            cell_count,
+        )
+        .filter(*bbox, Grievance.geohash.isnot(None))
+        .group_by(cell)
+        .order_by(cell_count.desc())
+        .all()
+    )
+
+    grievances = (
+        db.query(Grievance)
+        .filter(*bbox)
+        .order_by(Grievance.created_at.desc())
+        .limit(limit)
+        .all()
+    )
+
+    return {
+        "total": sum(c.count for c in cells),
+        "cells": [
+            {
+                "geohash": c.geohash,
+                "latitude": float(c.latitude),
+                "longitude": float(c.longitude),
+                "count": int(c.count),
+            }
+            for c in cells
+        ],
+        "grievances": grievances,
+    }
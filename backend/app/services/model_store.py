@@ -0,0 +1,135 @@
+import hashlib
+import json
+import os
+import re
+from datetime import datetime
+from app.config import FORECAST_MODEL_DIR
+
+# Seed models shipped with the repo (export_model_store.py output); the API never writes here
+SEED_STORE_DIR = "app/models/forecast/store"
+# Retrains publish here; once it has a manifest it is served instead of the seed
+STORE_DIR = FORECAST_MODEL_DIR
+MANIFEST_NAME = "manifest.json"
+
+# Monolithic pickle from ml_pipeline/prophet_training_IGRS.ipynb / older retrains
+LEGACY_MODEL_PATH = "app/models/forecast/up_forecast.pkl"
+
+
+def _sha256(data: bytes):
+    return hashlib.sha256(data).hexdigest()
+
+
+def _artifact_name(category: str, version: str):
+    slug = re.sub(r"[^A-Za-z0-9_-]+", "_", category).strip("_") or "category"
+    return f"{slug}-{version}.json"
+
+
+def _write_atomic(path: str, data: bytes):
+    """Write to a temp file next to `path`, then rename it into place."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def _manifest_path(store_dir: str):
+    return os.path.join(store_dir, MANIFEST_NAME)
+
+
+def active_store_dir():
+    """The writable store once a retrain has published to it, the seed store before that."""
+    return STORE_DIR if os.path.exists(_manifest_path(STORE_DIR)) else SEED_STORE_DIR
+
+
+def manifest_path():
+    """Path of the manifest being served."""
+    return _manifest_path(active_store_dir())
+
+
+def read_manifest(store_dir: str = None):
+    """Current manifest (of `store_dir`, default the served store), or None when not published yet."""
+    try:
+        with open(_manifest_path(store_dir or active_store_dir()), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def _artifact_path(file_name: str):
+    # Entries read from the seed manifest keep pointing at the seed until the first publish
+    path = os.path.join(STORE_DIR, file_name)
+    return path if os.path.exists(path) else os.path.join(SEED_STORE_DIR, file_name)
+
+
+def load_model(entry: dict):
+    """Deserialize one category's model after checking its checksum."""
+    from prophet.serialize import model_from_json
+
+    with open(_artifact_path(entry["file"]), "rb") as f:
+        data = f.read()
+    if _sha256(data) != entry["sha256"]:
+        raise ValueError(f"Checksum mismatch for model artifact {entry['file']}")
+    return model_from_json(data.decode("utf-8"))
+
+
+def publish_models(models: dict, version: str, store_dir: str = None):
+    """
+    Write one JSON artifact per category, then swap the manifest in with a rename.
+    Categories not in `models` keep their current artifact (copied over from the
+    seed store on the first publish). Readers see either the old manifest or the
+    new one, never a partial write.
+    """
+    from prophet.serialize import model_to_json
+
+    store_dir = store_dir or STORE_DIR
+    os.makedirs(store_dir, exist_ok=True)
+    previous = read_manifest(store_dir) or read_manifest(SEED_STORE_DIR) or {"categories": {}}
+    categories = dict(previous["categories"])
+
+    for category, entry in categories.items():
+        path = os.path.join(store_dir, entry["file"])
+        if category not in models and not os.path.exists(path):
+            with open(os.path.join(SEED_STORE_DIR, entry["file"]), "rb") as f:
+                _write_atomic(path, f.read())
+
+    for category, model in models.items():
+        data = model_to_json(model).encode("utf-8")
+        file_name = _artifact_name(category, version)
+        _write_atomic(os.path.join(store_dir, file_name), data)
+        categories[category] = {
+            "file": file_name,
+            "sha256": _sha256(data),
+            "version": version,
+            "size_bytes": len(data),
+        }
+
+    manifest = {
+        "version": version,
+        "published_at": datetime.utcnow().isoformat(),
+        "categories": categories,
+    }
+    _write_atomic(_manifest_path(store_dir), json.dumps(manifest, indent=2).encode("utf-8"))
+    _remove_stale_artifacts(manifest, previous, store_dir)
+    return manifest
+
+
+def _remove_stale_artifacts(manifest: dict, previous: dict, store_dir: str):
+    """Drop artifacts referenced by neither the new nor the previous manifest."""
+    keep = {entry["file"] for entry in manifest["categories"].values()}
+    keep |= {entry["file"] for entry in previous["categories"].values()}
+    for file_name in os.listdir(store_dir):
+        if file_name.endswith(".json") and file_name != MANIFEST_NAME and file_name not in keep:
+            try:
+                os.remove(os.path.join(store_dir, file_name))
+            except OSError as e:
+                print(f"Could not remove stale model artifact {file_name}:", e)
+
+
+def import_legacy_pickle(version: str, store_dir: str = None):
+    """Split the monolithic pickle into per-category artifacts (one-time migration)."""
+    import joblib
+
+    models = joblib.load(LEGACY_MODEL_PATH)
+    return publish_models(models, version, store_dir)
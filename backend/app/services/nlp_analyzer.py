@@ -1,5 +1,9 @@
+import json
 from fastapi import APIRouter, HTTPException
-from app.services.gemini_service import generate_solution
+from app.services.gemini_service import generate_text
+from app.services.gemini_client import fallback_reason
+from app.services.nlp_processor import classify_locally
+from app.utils.metrics import llm_fallbacks_total
 
 router = APIRouter(prefix="/ai", tags=["AI Processing"])
 
@@ -23,5 +27,11 @@ def analyze_grievance(input_text: dict):
     }}
     """
 
-    response = generate_solution(prompt)
-    return response
+    try:
+        return generate_text(prompt, "analyze")
+    except Exception as e:
+        # Degraded mode: the local classifier's answer, in the same JSON shape
+        print("Gemini analyze error:", e)
+        llm_fallbacks_total.inc(operation="analyze", reason=fallback_reason(e))
+        local = classify_locally(description)
+        return json.dumps({key: local[key] for key in ("category", "priority", "region")})
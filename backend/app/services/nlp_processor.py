@@ -1,31 +1,25 @@
 import re
 from app.services.gemini_service import generate_solution
 from app.services.geocode_service import get_location
+from app.services.local_classifier import (
+    classify_text, classify_texts, is_confident, keyword_category, predict_category, predict_priority
+)
+from app.services.synthetic_grievances import CATEGORY_GROUPS
+from app.services.classify_batcher import classify_with_batching
+from app.services.gemini_classifier import classify_grievances_batch, DEFAULT_CLASSIFICATION
+from app.services.gemini_client import gemini_breaker
+from app.utils.metrics import pipeline_stage_seconds, llm_fallbacks_total
 
-#Categorization based on keywords
+#Categorization: compiled keyword matcher, TF-IDF model when keywords are ambiguous
 def categorize_problem(problem: str):
-    text = problem.lower()
-    if "road" in text or "traffic" in text:
-        return "Infrastructure"
-    elif "water" in text or "electricity" in text:
-        return "Utilities"
-    elif "garbage" in text or "sanitation" in text:
-        return "Sanitation"
-    elif any(word in text for word in ["hospital", "doctor", "medicine", "ambulance", "health"]):
-        return "Medical"
-    else:
-        return "Other"
+    label, _ = predict_category(problem)
+    return CATEGORY_GROUPS.get(label, "Other")
     
 
 #Priority assignment based on keywords
 def assign_priority(problem: str):
-    text = problem.lower()
-    if any(word in text for word in ["accident", "fire", "collapse", "emergency", "ambulance", "health"]):
-        return "High"
-    elif any(word in text for word in ["pothole", "flood", "supply issue", "power cut"]):
-        return "Medium"
-    else:
-        return "Low"
+    priority, _ = predict_priority(problem)
+    return priority
     
 #Extract location using geocoding service
 def extract_location(text: str):
@@ -33,20 +27,78 @@ def extract_location(text: str):
     match = re.search(pattern, text)
     return match.group(1) if match else "Unknown Location"
 
+#Fast, local part of the pipeline (no network calls)
+def classify_locally(problem_text: str):
+    return classify_locally_batch([problem_text])[0]
+
+def classify_locally_batch(problem_texts: list):
+    with pipeline_stage_seconds.time(stage="classify"):
+        classified = classify_texts(problem_texts)
+
+    processed = []
+    for problem_text, local in zip(problem_texts, classified):
+        region = local["region"]
+        if region == "Unknown":
+            with pipeline_stage_seconds.time(stage="extract_location"):
+                region = extract_location(problem_text)
+        processed.append({
+            "description": problem_text,
+            # Not confident: the plain keyword rule until the enrichment worker asks Gemini
+            "category": local["igrs_category"] if is_confident(local) else keyword_category(problem_text),
+            "priority": local["priority"],
+            "region": region,
+        })
+    return processed
+
+#Local answer unless its confidence is below the threshold, then Gemini
+def _prefer_gemini(local: dict, gemini: dict):
+    if not gemini or gemini == DEFAULT_CLASSIFICATION:
+        return local  # Gemini failed: the low-confidence local guess beats "Other"
+    return {**gemini, "confidence": local["confidence"], "source": "gemini"}
+
+def classify_with_fallback(problem_text: str):
+    local = classify_text(problem_text)
+    if is_confident(local):
+        return local
+    if gemini_breaker.is_open():
+        # Degraded mode: answer from the local classifier without waiting for a batch
+        llm_fallbacks_total.inc(operation="classify", reason="circuit_open")
+        return local
+    return _prefer_gemini(local, classify_with_batching(problem_text))
+
+def classify_batch_with_fallback(problems: list):
+    results = classify_texts(problems)
+    uncertain = [i for i, result in enumerate(results) if not is_confident(result)]
+    if uncertain and gemini_breaker.is_open():
+        llm_fallbacks_total.inc(len(uncertain), operation="classify_batch", reason="circuit_open")
+    elif uncertain:
+        answers = classify_grievances_batch([problems[i] for i in uncertain])
+        for i, gemini in zip(uncertain, answers):
+            results[i] = _prefer_gemini(results[i], gemini)
+    return results
+
+#Gemini's IGRS category for a text the local classifier is unsure of (None: keep the stored one)
+def reclassify_uncertain(problem_text: str):
+    result = classify_with_fallback(problem_text)
+    if result.get("source") != "gemini":
+        return None
+    return CATEGORY_GROUPS.get(result["category"], "Other")
+
+#Slow part of the pipeline (OpenCage + Gemini), run by the enrichment workers
+def locate_region(region: str):
+    with pipeline_stage_seconds.time(stage="geocode"):
+        location = get_location(region)
+    return {"latitude": location.get("latitude"), "longitude": location.get("longitude")}
+
+def solve_problem(problem_text: str):
+    with pipeline_stage_seconds.time(stage="solution"):
+        return generate_solution(problem_text)
+
+def enrich_grievance_fields(problem_text: str, region: str):
+    return {**locate_region(region), "solution": solve_problem(problem_text)}
+
 #Main Processing Pipeline
 def process_grievance(problem_text: str):
-    category = categorize_problem(problem_text)
-    priority = assign_priority(problem_text)
-    region = extract_location(problem_text)
-    location = get_location(region)
-    solution = generate_solution(problem_text)
-
-    return {
-        "description": problem_text,
-        "category": category,
-        "priority": priority,
-        "region": region,
-        "latitude": location.get("latitude"),
-        "longitude": location.get("longitude"),
-        "solution": solution
-    }
\ No newline at end of file
+    processed = classify_locally(problem_text)
+    processed.update(enrich_grievance_fields(problem_text, processed["region"]))
+    return processed
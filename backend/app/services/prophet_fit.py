@@ -0,0 +1,45 @@
+import os
+import time
+
+# Kept free of app/DB imports: this module is what retrain worker processes load.
+# Prophet (and cmdstanpy) is imported on the first fit, not when the API starts.
+
+
+def lower_priority(increment: int):
+    """Process pool initializer: fits yield the CPU to the API (no-op where nice() is missing)."""
+    if increment and hasattr(os, "nice"):
+        os.nice(increment)
+
+
+def warm_start_params(model):
+    """Previous model's fitted parameters in the shape Stan's `init` expects."""
+    if model is None or not getattr(model, "params", None):
+        return None
+    params = {}
+    for name in ("k", "m", "sigma_obs"):
+        params[name] = float(model.params[name][0][0])
+    for name in ("delta", "beta"):
+        params[name] = model.params[name][0].copy()
+    return params
+
+
+def fit_category(category: str, df_cat, init_params=None):
+    """
+    Fit one category's Prophet model, warm-started from ``init_params`` when given.
+    Returns (category, model, fit_seconds, warm_started).
+    """
+    from prophet import Prophet
+
+    start = time.perf_counter()
+    if init_params is not None:
+        try:
+            model = Prophet(yearly_seasonality=True, weekly_seasonality=True)
+            model.fit(df_cat, init=init_params)
+            return category, model, time.perf_counter() - start, True
+        except Exception as e:
+            # e.g. changepoint/seasonality shapes differ from the old model
+            print(f"Warm start failed for {category}, fitting from scratch: {e}")
+
+    model = Prophet(yearly_seasonality=True, weekly_seasonality=True)
+    model.fit(df_cat)
+    return category, model, time.perf_counter() - start, False
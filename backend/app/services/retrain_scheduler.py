@@ -0,0 +1,198 @@
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+from sqlalchemy import func
+from app.config import (
+    RETRAIN_NEW_ROWS, RETRAIN_INTERVAL_SECONDS, RETRAIN_CHECK_SECONDS, RETRAIN_STARTUP_DELAY_SECONDS
+)
+from app.db.connection import SessionLocal
+from app.db.models import GrievanceDailyCount
+from app.utils.metrics import queue_depth
+from app.services.model_store import manifest_path
+from app.services.retrain_service import (
+    retrain_forecast_models, get_last_retrain_report, RetrainCancelled
+)
+
+# Finished jobs kept around for GET /analytics/retrain/{job_id}
+MAX_JOB_HISTORY = 50
+
+ACTIVE_STATUSES = ("queued", "running")
+
+
+class RetrainJob:
+    def __init__(self, trigger: str):
+        self.id = uuid.uuid4().hex
+        self.trigger = trigger
+        self.status = "queued"
+        self.message = None
+        self.progress = {"done": 0, "total": None, "current": None}
+        self.report = None
+        self.created_at = datetime.utcnow()
+        self.started_at = None
+        self.finished_at = None
+        self.cancel_requested = threading.Event()
+
+    def to_dict(self):
+        duration = None
+        if self.started_at:
+            duration = ((self.finished_at or datetime.utcnow()) - self.started_at).total_seconds()
+        return {
+            "job_id": self.id,
+            "trigger": self.trigger,
+            "status": self.status,
+            "message": self.message,
+            "progress": dict(self.progress),
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "duration_seconds": round(duration, 2) if duration is not None else None,
+            "report": self.report,
+        }
+
+
+class RetrainScheduler:
+    """
+    Single-flight retrain queue: at most one job runs and at most one waits.
+    Submitting while a job is queued returns that job instead of adding another.
+    A ticker submits jobs when enough new grievances arrived or too much time passed.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._queue = queue.Queue()
+        self._jobs = OrderedDict()
+        self._started = False
+        self._last_trained_at = None
+        self._rows_at_last_train = None
+
+    #Jobs ---
+    def submit(self, trigger: str = "manual"):
+        with self._lock:
+            for job in self._jobs.values():
+                if job.status == "queued":
+                    return job
+            job = RetrainJob(trigger)
+            self._jobs[job.id] = job
+            while len(self._jobs) > MAX_JOB_HISTORY:
+                oldest_id = next(iter(self._jobs))
+                if self._jobs[oldest_id].status in ACTIVE_STATUSES:
+                    break
+                self._jobs.pop(oldest_id)
+        self._queue.put(job)
+        return job
+
+    def get(self, job_id: str):
+        return self._jobs.get(job_id)
+
+    def list_jobs(self):
+        return [job.to_dict() for job in reversed(self._jobs.values())]
+
+    def cancel(self, job_id: str):
+        job = self._jobs.get(job_id)
+        if job is None:
+            return None
+        with self._lock:
+            if job.status == "queued":
+                job.status = "cancelled"
+                job.finished_at = datetime.utcnow()
+            elif job.status == "running":
+                job.cancel_requested.set()  # picked up between category fits
+        return job
+
+    def _run(self, job: RetrainJob):
+        with self._lock:
+            if job.status != "queued":
+                return  # cancelled while waiting
+            job.status = "running"
+            job.started_at = datetime.utcnow()
+
+        def on_progress(done, total, category):
+            job.progress = {"done": done, "total": total, "current": category}
+
+        try:
+            rows = self._count_rows()
+            trained = retrain_forecast_models(
+                on_progress=on_progress, should_cancel=job.cancel_requested.is_set
+            )
+            if trained:
+                job.status = "succeeded"
+                job.message = "Model retrained successfully using real data."
+                job.report = get_last_retrain_report()
+            else:
+                job.status = "skipped"
+                job.message = "Not enough data yet. Using trained data model."
+            self._last_trained_at = time.time()
+            self._rows_at_last_train = rows
+        except RetrainCancelled:
+            job.status = "cancelled"
+            job.message = "Cancelled before the new models were installed."
+        except Exception as e:
+            print("Retrain job failed:", e)
+            job.status = "failed"
+            job.message = str(e)
+        finally:
+            job.finished_at = datetime.utcnow()
+
+    def _worker_loop(self):
+        while True:
+            self._run(self._queue.get())
+
+    #Triggers ---
+    def _count_rows(self):
+        db = SessionLocal()
+        try:
+            total = db.query(func.coalesce(func.sum(GrievanceDailyCount.count), 0)).scalar()
+            return int(total or 0)
+        except Exception as e:
+            print("Could not count grievances for retrain trigger:", e)
+            return None
+        finally:
+            db.close()
+
+    def check_triggers(self):
+        """Submit a job if the new-row or elapsed-time threshold has been reached."""
+        if any(job.status in ACTIVE_STATUSES for job in list(self._jobs.values())):
+            return None
+        rows = self._count_rows()
+        if rows is not None and self._rows_at_last_train is not None:
+            if rows - self._rows_at_last_train >= RETRAIN_NEW_ROWS:
+                return self.submit("new_rows")
+        if self._last_trained_at and time.time() - self._last_trained_at >= RETRAIN_INTERVAL_SECONDS:
+            return self.submit("interval")
+        return None
+
+    def _ticker_loop(self):
+        time.sleep(RETRAIN_STARTUP_DELAY_SECONDS)
+        while True:
+            try:
+                self.check_triggers()
+            except Exception as e:
+                print("Retrain trigger check failed:", e)
+            time.sleep(RETRAIN_CHECK_SECONDS)
+
+    def start(self):
+        """Start the worker and trigger threads (idempotent)."""
+        with self._lock:
+            if self._started:
+                return
+            self._started = True
+
+        # Last retrain = when the model store manifest was published
+        try:
+            self._last_trained_at = os.path.getmtime(manifest_path())
+        except OSError:
+            self._last_trained_at = time.time()
+        self._rows_at_last_train = self._count_rows()
+
+        threading.Thread(target=self._worker_loop, name="retrain-worker", daemon=True).start()
+        threading.Thread(target=self._ticker_loop, name="retrain-ticker", daemon=True).start()
+        print("Retrain scheduler started")
+
+
+retrain_scheduler = RetrainScheduler()
+
+queue_depth.set_function(retrain_scheduler._queue.qsize, queue="retrain")
@@ -1,38 +1,115 @@
-import joblib
-from prophet import Prophet
+import multiprocessing
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from app.config import RETRAIN_WORKERS, RETRAIN_NICENESS
 from app.utils.aggregate_data import fetch_aggregated_data
 from app.db.connection import get_db
-from app.services.forecast_manager import update_forecast_cache
+from app.services.forecast_manager import get_forecast_model, update_forecast_cache
+from app.services.prophet_fit import fit_category, warm_start_params, lower_priority
 
-def retrain_forecast_models():
+_last_report = {}
+
+# How often a parallel retrain checks for cancellation while fits are running
+CANCEL_POLL_SECONDS = 1.0
+
+
+class RetrainCancelled(Exception):
+    """Raised when a running retrain is cancelled before it installs new models."""
+
+
+def _pool_size(n_categories: int):
+    workers = RETRAIN_WORKERS or os.cpu_count() or 1
+    return max(1, min(workers, n_categories))
+
+
+def _fit_all(jobs: dict, should_cancel):
+    """Fit every category, in parallel processes when more than one core is available."""
+    workers = _pool_size(len(jobs))
+    if workers == 1:
+        for category, (df_cat, init) in jobs.items():
+            if should_cancel():
+                raise RetrainCancelled()
+            yield fit_category(category, df_cat, init)
+        return
+
+    # spawn, not fork: the API process runs threads (workers, schedulers)
+    context = multiprocessing.get_context("spawn")
+    pool = ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                               initializer=lower_priority, initargs=(RETRAIN_NICENESS,))
+    finished = False
+    try:
+        pending = {
+            pool.submit(fit_category, category, df_cat, init)
+            for category, (df_cat, init) in jobs.items()
+        }
+        while pending:
+            done, pending = wait(pending, timeout=CANCEL_POLL_SECONDS, return_when=FIRST_COMPLETED)
+            if should_cancel():
+                raise RetrainCancelled()
+            for future in done:
+                yield future.result()
+        finished = True
+    finally:
+        # On cancel or error drop the queued fits and return at once; fits already
+        # running finish in their (niced) processes and their results are discarded
+        pool.shutdown(wait=finished, cancel_futures=not finished)
+
+
+def retrain_forecast_models(on_progress=None, should_cancel=None):
     """
     Retrains Prophet models using real grievance data if enough exists.
     Falls back to trained dataset otherwise.
+    `on_progress(done, total, category)` is called after every fitted category;
+    when `should_cancel()` turns true, RetrainCancelled is raised and nothing is saved.
     """
+    should_cancel = should_cancel or (lambda: False)
+    global _last_report
     db = next(get_db())
-    df = fetch_aggregated_data(db)
+    try:
+        df = fetch_aggregated_data(db)
+    finally:
+        db.close()
 
     if df is None or len(df["date"].unique()) < 60:
         print("Not enough real data for retraining. Using pretrained dataset.")
         return False  # This will trigger fallback to trained model
 
-    categories = df["category"].unique()
-    models = {}
-
-    for category in categories:
+    jobs = {}
+    for category in df["category"].unique():
         df_cat = df[df["category"] == category].groupby("date")["count"].sum().reset_index()
         df_cat.rename(columns={"date": "ds", "count": "y"}, inplace=True)
+        # Warm start from the currently served model of this category
+        previous = get_forecast_model(category, keep_loaded=False)
+        jobs[category] = (df_cat, warm_start_params(previous))
 
-        model = Prophet(yearly_seasonality=True, weekly_seasonality=True)
-        model.fit(df_cat)
+    started = time.perf_counter()
+    models = {}
+    fit_times = {}
+    for category, model, seconds, warm in _fit_all(jobs, should_cancel):
         models[category] = model
+        fit_times[category] = {"seconds": round(seconds, 2), "warm_start": warm}
+        print(f"Fitted {category} in {seconds:.2f}s ({'warm' if warm else 'cold'} start)")
+        if on_progress:
+            on_progress(len(models), len(jobs), category)
+
+    if should_cancel():
+        raise RetrainCancelled()
 
-    # Save retrained model
-    os.makedirs("app/models/forecast", exist_ok=True)
-    model_path = "app/models/forecast/up_forecast.pkl"
-    joblib.dump(models, model_path)
+    # Publish retrained models to the store and serve them
     update_forecast_cache(models)
 
-    print(f"Retrained Prophet models saved at {model_path}")
+    wall_time = time.perf_counter() - started
+    _last_report = {
+        "workers": _pool_size(len(jobs)),
+        "wall_seconds": round(wall_time, 2),
+        "fit_seconds_total": round(sum(t["seconds"] for t in fit_times.values()), 2),
+        "categories": fit_times,
+    }
+    print(f"Retrained Prophet models published in {wall_time:.2f}s")
     return True
+
+
+def get_last_retrain_report():
+    """Per-category fit times of the most recent successful retrain."""
+    return _last_report
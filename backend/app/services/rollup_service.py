@@ -0,0 +1,160 @@
+from datetime import datetime, date
+from sqlalchemy import func, select, delete, insert
+from sqlalchemy.orm import Session
+from app.db.models import Grievance, GrievanceDailyCount
+
+Rollup = GrievanceDailyCount
+
+
+def _rollup_key(created_at: datetime, region: str, category: str, status: str):
+    return {
+        "day": (created_at or datetime.utcnow()).date(),
+        "region": region or "",
+        "category": category or "",
+        "status": status or "",
+    }
+
+
+def _increment(db: Session, key: dict, amount: int):
+    """Atomic upsert count = count + amount (ON CONFLICT where supported)."""
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        if dialect == "postgresql":
+            from sqlalchemy.dialects.postgresql import insert as dialect_insert
+        else:
+            from sqlalchemy.dialects.sqlite import insert as dialect_insert
+        stmt = dialect_insert(Rollup).values(**key, count=amount)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["day", "region", "category", "status"],
+            set_={"count": Rollup.count + stmt.excluded.count},
+        )
+        db.execute(stmt)
+        return
+
+    row = db.get(Rollup, (key["day"], key["region"], key["category"], key["status"]))
+    if row:
+        row.count += amount
+    else:
+        db.add(Rollup(**key, count=amount))
+
+
+def record_grievance_created(db: Session, grievance: Grievance):
+    """Call inside the transaction that inserts the grievance."""
+    _increment(db, _rollup_key(
+        grievance.created_at, grievance.region, grievance.category, grievance.status
+    ), 1)
+
+
+def record_bulk_created(db: Session, grievances):
+    """Bulk-insert counterpart of record_grievance_created (one upsert per key)."""
+    counts = {}
+    for grievance in grievances:
+        key = _rollup_key(
+            grievance["created_at"], grievance["region"], grievance["category"], grievance["status"]
+        )
+        counts[tuple(key.values())] = counts.get(tuple(key.values()), 0) + 1
+    for (day, region, category, status), amount in counts.items():
+        _increment(db, {"day": day, "region": region, "category": category, "status": status}, amount)
+
+
+def record_status_change(db: Session, grievance: Grievance, old_status: str):
+    """Call inside the transaction that changes grievance.status."""
+    if old_status == grievance.status:
+        return
+    _increment(db, _rollup_key(
+        grievance.created_at, grievance.region, grievance.category, old_status
+    ), -1)
+    _increment(db, _rollup_key(
+        grievance.created_at, grievance.region, grievance.category, grievance.status
+    ), 1)
+
+
+def record_category_change(db: Session, grievance: Grievance, old_category: str):
+    """Call inside the transaction that changes grievance.category."""
+    if old_category == grievance.category:
+        return
+    _increment(db, _rollup_key(
+        grievance.created_at, grievance.region, old_category, grievance.status
+    ), -1)
+    _increment(db, _rollup_key(
+        grievance.created_at, grievance.region, grievance.category, grievance.status
+    ), 1)
+
+
+def rebuild_daily_counts(db: Session):
+    """Recompute the whole rollup from the grievances table (repair command)."""
+    day = func.date(Grievance.created_at)
+    region = func.coalesce(Grievance.region, "")
+    category = func.coalesce(Grievance.category, "")
+    status = func.coalesce(Grievance.status, "")
+    source = (
+        select(day, region, category, status, func.count())
+        .where(Grievance.created_at.isnot(None))
+        .group_by(day, region, category, status)
+    )
+    db.execute(delete(Rollup))
+    db.execute(insert(Rollup).from_select(["day", "region", "category", "status", "count"], source))
+    db.commit()
+    return db.query(func.count()).select_from(Rollup).scalar()
+
+
+def _filtered(query, start: date = None, end: date = None, region: str = None,
+              category: str = None, status: str = None):
+    if start:
+        query = query.filter(Rollup.day >= start)
+    if end:
+        query = query.filter(Rollup.day <= end)
+    if region:
+        query = query.filter(Rollup.region == region)
+    if category:
+        query = query.filter(Rollup.category == category)
+    if status:
+        query = query.filter(Rollup.status == status)
+    return query
+
+
+def get_daily_counts(db: Session, **filters):
+    """(date, region, category) -> count across all statuses, as a DataFrame."""
+    import pandas as pd
+
+    total = func.sum(Rollup.count).label("count")
+    rows = (
+        _filtered(db.query(Rollup.day, Rollup.region, Rollup.category, total), **filters)
+        .filter(Rollup.region != "", Rollup.category != "")
+        .group_by(Rollup.day, Rollup.region, Rollup.category)
+        .having(func.sum(Rollup.count) > 0)
+        .all()
+    )
+    return pd.DataFrame(rows, columns=["date", "region", "category", "count"])
+
+
+def get_count_totals(db: Session, group_by: str, **filters):
+    """Totals per region, category or status, largest first."""
+    column = getattr(Rollup, group_by)
+    total = func.sum(Rollup.count).label("count")
+    rows = (
+        _filtered(db.query(column, total), **filters)
+        .group_by(column)
+        .having(func.sum(Rollup.count) > 0)
+        .order_by(total.desc())
+        .all()
+    )
+    return {key or "Unknown": int(count) for key, count in rows}
+
+
+def get_dominant_categories(db: Session, regions):
+    """Most frequent category of each of the given regions."""
+    regions = list(regions)
+    if not regions:
+        return {}
+    total = func.sum(Rollup.count)
+    rows = (
+        db.query(Rollup.region, Rollup.category, total)
+        .filter(Rollup.region.in_(regions), Rollup.category != "")
+        .group_by(Rollup.region, Rollup.category)
+        .all()
+    )
+    dominant = {}
+    for region, category, n in sorted(rows, key=lambda row: row[2], reverse=True):
+        dominant.setdefault(region, category)
+    return dominant
@@ -0,0 +1,221 @@
+import random
+from datetime import date, datetime, timedelta
+
+# Categories, regions and relative volumes follow
+# ml_pipeline/synthetic_data_generation_IGRS.ipynb; that notebook only produces
+# daily counts, so the complaint texts are generated here from templates.
+
+REGIONS = [
+    "Lucknow", "Kanpur", "Varanasi", "Agra", "Meerut",
+    "Prayagraj", "Gorakhpur", "Bareilly", "Noida", "Ghaziabad"
+]
+
+# Fine-grained label (Gemini's taxonomy) -> IGRS category used by forecasts
+CATEGORY_GROUPS = {
+    "Roads": "Infrastructure",
+    "Water": "Utilities",
+    "Electricity": "Utilities",
+    "Waste": "Sanitation",
+    "Health": "Medical",
+    "Law & Order": "Other",
+    "Other": "Other",
+}
+
+# Notebook base_counts (Infrastructure 50, Utilities 40, Sanitation 30, Medical 25)
+LABEL_WEIGHTS = {
+    "Roads": 50,
+    "Water": 20,
+    "Electricity": 20,
+    "Waste": 30,
+    "Health": 25,
+    "Law & Order": 10,
+    "Other": 10,
+}
+
+ISSUES = {
+    "Roads": [
+        "a huge pothole on the main road", "the road is completely broken",
+        "the bridge has cracks and looks unsafe", "traffic jam every morning because of road digging",
+        "the footpath is encroached by shops", "the flyover construction has been stuck for months",
+        "the street is full of potholes", "the speed breaker is damaged",
+        "the highway stretch has caved in", "the culvert on the road has collapsed",
+        "the traffic signal is not working", "the road was dug up and never repaired",
+    ],
+    "Water": [
+        "no water supply for three days", "dirty water coming from the taps",
+        "the water pipeline has burst", "the hand pump is not working",
+        "very low water pressure", "contaminated drinking water",
+        "the water tanker did not come", "a water leakage on the street is wasting water",
+        "the tubewell has been dry for a week", "sewage is mixing with the drinking water",
+    ],
+    "Electricity": [
+        "power cut every evening", "the transformer has blown",
+        "electricity is gone for two days", "the street lights are not working",
+        "voltage fluctuation damaged our appliances", "electric wires are hanging low",
+        "the electricity bill is wrong", "a sparking electric pole",
+        "frequent power outages", "no electricity supply since last night",
+    ],
+    "Waste": [
+        "garbage has not been collected", "the drain is blocked and overflowing",
+        "a garbage dump next to the school", "the sewer line is choked",
+        "dead animal lying on the road is not removed", "the public toilet is very dirty",
+        "mosquitoes breeding in stagnant water", "waste is burnt in the open",
+        "the sweeper has not come for weeks", "the sanitation of the colony is very poor",
+    ],
+    "Health": [
+        "no doctor at the government hospital", "the ambulance did not arrive",
+        "medicines are not available at the health centre", "the primary health centre is closed",
+        "dengue cases are rising", "the hospital staff is demanding bribes",
+        "no beds available in the district hospital", "the vaccination camp was cancelled",
+        "the hospital is refusing emergency patients", "the PHC has no medical staff",
+    ],
+    "Law & Order": [
+        "chain snatching incidents are increasing", "police are not registering our FIR",
+        "illegal liquor is sold openly", "eve teasing near the college",
+        "theft in our locality every week", "a gang is threatening shopkeepers",
+        "land is being grabbed by local goons", "no police patrolling at night",
+    ],
+    "Other": [
+        "my pension has not been credited", "the ration shop is not giving grain",
+        "stray dogs are attacking children", "loudspeakers are played late at night",
+        "the birth certificate is pending for months", "the school teacher is always absent",
+        "my scholarship application is stuck", "the ration card has not been issued",
+    ],
+}
+
+PLACES = [
+    "near the railway station", "in our colony", "in ward number 12", "near the bus stand",
+    "in the old city area", "near the district court", "behind the main market",
+    "in our village", "near the government school", "in sector 5",
+]
+
+URGENCY = {
+    "High": [
+        "It is an emergency.", "There was an accident yesterday.",
+        "Please act immediately, lives are at risk.", "A fire broke out because of this.",
+    ],
+    "Medium": [
+        "Please look into it soon.", "Flood water makes it worse.",
+        "It is causing a lot of trouble.", "This supply issue keeps coming back.",
+    ],
+    "Low": ["", "Kindly resolve.", "Requesting action.", "Thank you."],
+}
+
+TEMPLATES = [
+    "There is {issue} {place} in {region}. {urgency}",
+    "{issue_cap} {place}, {region}. {urgency}",
+    "Sir, {issue} in {region} {place}. {urgency}",
+    "Complaint: {issue} at {region}. {urgency}",
+    "{urgency} {issue_cap} in {region}.",
+    "We are facing a problem: {issue} {place}. {urgency}",
+]
+
+
+def split_issues(every: int = 4):
+    """(kept, held_out) ISSUES: every ``every``-th phrase of each label is held out."""
+    kept, held_out = {}, {}
+    for label, phrases in ISSUES.items():
+        held_out[label] = phrases[every - 1::every]
+        kept[label] = [phrase for phrase in phrases if phrase not in held_out[label]]
+    return kept, held_out
+
+
+def generate_grievance_texts(n: int = 6000, seed: int = 42, issues: dict = None):
+    """(text, label) pairs, labels drawn with the notebook's category weights."""
+    issues = issues or ISSUES
+    rnd = random.Random(seed)
+    labels = list(LABEL_WEIGHTS)
+    weights = [LABEL_WEIGHTS[label] for label in labels]
+    samples = []
+    for label in rnd.choices(labels, weights=weights, k=n):
+        issue = rnd.choice(issues[label])
+        text = rnd.choice(TEMPLATES).format(
+            issue=issue,
+            issue_cap=issue[0].upper() + issue[1:],
+            place=rnd.choice(PLACES),
+            region=rnd.choice(REGIONS),
+            urgency=rnd.choice(URGENCY[rnd.choice(["High", "Medium", "Low", "Low"])]),
+        )
+        samples.append((" ".join(text.split()), label))
+    return samples
+
+
+#Historical volumes (the notebook's daily count model) ---
+# Average complaints per region per day
+BASE_COUNTS = {"Infrastructure": 50, "Utilities": 40, "Sanitation": 30, "Medical": 25}
+
+SEASONAL_MULTIPLIERS = {
+    "Infrastructure": {"Monsoon": 1.6, "Summer": 1.0, "Post-Monsoon": 0.9, "Winter": 0.8},
+    "Sanitation": {"Monsoon": 1.4, "Summer": 1.0, "Post-Monsoon": 0.9, "Winter": 0.8},
+    "Utilities": {"Monsoon": 1.0, "Summer": 1.5, "Post-Monsoon": 1.1, "Winter": 0.9},
+    "Medical": {"Monsoon": 1.2, "Summer": 1.0, "Post-Monsoon": 1.3, "Winter": 1.1},
+}
+
+# Bigger cities = more complaints
+REGION_WEIGHTS = {
+    "Lucknow": 1.4, "Kanpur": 1.3, "Varanasi": 1.1, "Agra": 1.0, "Meerut": 0.9,
+    "Prayagraj": 1.0, "Gorakhpur": 0.8, "Bareilly": 0.8, "Noida": 1.2, "Ghaziabad": 1.3,
+}
+
+STATUS_WEIGHTS = {"Resolved": 55, "In Progress": 20, "Pending": 20, "Closed": 5}
+
+
+def get_season(month: int):
+    if month in (6, 7, 8, 9):
+        return "Monsoon"
+    if month in (3, 4, 5):
+        return "Summer"
+    if month in (10, 11):
+        return "Post-Monsoon"
+    return "Winter"
+
+
+def generate_grievance_records(n: int, start: date, end: date, seed: int = 42, batch_size: int = 10000):
+    """
+    Yield ``n`` grievance rows (description, category, priority, region, status,
+    created_at) between ``start`` and ``end``. Day/region/category cells are
+    drawn in proportion to the notebook's daily counts (base x season x region
+    weight + noise), so the rollup, hotspots and Prophet see the same shape.
+    Rows are produced lazily, so any ``n`` fits in memory.
+    """
+    rnd = random.Random(seed)
+    cells, cumulative, total = [], [], 0.0
+    day = start
+    while day <= end:
+        season = get_season(day.month)
+        for region in REGIONS:
+            for category, base in BASE_COUNTS.items():
+                expected = base * SEASONAL_MULTIPLIERS[category][season] * REGION_WEIGHTS[region]
+                total += max(0.0, expected + rnd.uniform(-8, 8))
+                cells.append((day, region, category))
+                cumulative.append(total)
+        day += timedelta(days=1)
+
+    labels = {}
+    for label, group in CATEGORY_GROUPS.items():
+        labels.setdefault(group, []).append(label)
+    statuses, status_weights = list(STATUS_WEIGHTS), list(STATUS_WEIGHTS.values())
+
+    produced = 0
+    while produced < n:
+        count = min(batch_size, n - produced)
+        for day, region, category in rnd.choices(cells, cum_weights=cumulative, k=count):
+            label = rnd.choice(labels[category])
+            priority = rnd.choice(["High", "Medium", "Low", "Low"])
+            issue = rnd.choice(ISSUES[label])
+            text = rnd.choice(TEMPLATES).format(
+                issue=issue,
+                issue_cap=issue[0].upper() + issue[1:],
+                place=rnd.choice(PLACES),
+                region=region,
+                urgency=rnd.choice(URGENCY[priority]),
+            )
+            yield {
+                "description": " ".join(text.split()),
+                "category": category,
+                "priority": priority,
+                "region": region,
+                "status": rnd.choices(statuses, weights=status_weights)[0],
+                "created_at": datetime.combine(day, datetime.min.time()) + timedelta(seconds=rnd.randrange(86400)),
+            }
+        produced += count
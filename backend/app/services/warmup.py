@@ -0,0 +1,53 @@
+import threading
+import time
+
+_steps = {}  # name -> {"status", "seconds", "error"}
+_lock = threading.Lock()
+_thread = None
+_started_at = None
+_finished_at = None
+
+
+def _run(steps):
+    global _finished_at
+    for name, fn in steps:
+        with _lock:
+            _steps[name]["status"] = "running"
+        start = time.perf_counter()
+        try:
+            fn()
+            status, error = "done", None
+        except Exception as e:
+            # A failed step degrades that feature, it does not stop the others
+            print(f"Warm-up step {name} failed:", e)
+            status, error = "failed", str(e)
+        with _lock:
+            _steps[name].update(status=status, seconds=round(time.perf_counter() - start, 3), error=error)
+    with _lock:
+        _finished_at = time.time()
+    print(f"Warm-up finished in {_finished_at - _started_at:.1f}s")
+
+
+def start_warm_up(steps):
+    """
+    Run ``(name, fn)`` startup steps one after another in a background thread,
+    so the server accepts connections (and answers /health/live) immediately.
+    """
+    global _thread, _started_at
+    with _lock:
+        if _thread is not None:
+            return
+        for name, _ in steps:
+            _steps[name] = {"status": "pending", "seconds": None, "error": None}
+        _started_at = time.time()
+        _thread = threading.Thread(target=_run, args=(list(steps),), name="warm-up", daemon=True)
+    _thread.start()
+
+
+def get_warm_up_status():
+    with _lock:
+        return {
+            "finished": _finished_at is not None,
+            "seconds": round((_finished_at or time.time()) - _started_at, 3) if _started_at else None,
+            "steps": {name: dict(step) for name, step in _steps.items()},
+        }
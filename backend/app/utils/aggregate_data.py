@@ -1,21 +1,54 @@
-import pandas as pd
+from sqlalchemy import func, select
 from sqlalchemy.orm import Session
 from app.db.models import Grievance
 from app.db.connection import get_db
+from app.services.rollup_service import get_daily_counts
 
-def fetch_aggregated_data(db: Session):
-    grievances = db.query(Grievance).all()
-    if not grievances:
-        return None
+# Rows fetched per round trip when streaming raw points
+STREAM_BATCH_SIZE = 10000
 
-    data = [
-        {"date": g.created_at.date(), "region": g.region, "category": g.category}
-        for g in grievances if g.created_at and g.category and g.region
-    ]
 
-    df = pd.DataFrame(data)
+def _has_coordinates():
+    return Grievance.latitude.isnot(None), Grievance.longitude.isnot(None)
+
+
+def fetch_aggregated_data(db: Session):
+    """(date, region, category) -> count, read from the grievance_daily_counts rollup."""
+    df = get_daily_counts(db)
     if df.empty:
         return None
-
-    df = df.groupby(["date", "region", "category"]).size().reset_index(name="count")
     return df
+
+
+def fetch_region_hotspots(db: Session, limit: int):
+    """Top (region, latitude, longitude) groups by complaint count."""
+    import pandas as pd
+
+    complaint_count = func.count().label("complaint_count")
+    rows = (
+        db.query(Grievance.region, Grievance.latitude, Grievance.longitude, complaint_count)
+        .filter(*_has_coordinates())
+        .group_by(Grievance.region, Grievance.latitude, Grievance.longitude)
+        .order_by(complaint_count.desc())
+        .limit(limit)
+        .all()
+    )
+    return pd.DataFrame(rows, columns=["region", "latitude", "longitude", "complaint_count"])
+
+
+def stream_coordinates(db: Session):
+    """All (latitude, longitude) points as an (N, 2) float array, read in chunks."""
+    import numpy as np
+
+    query = (
+        select(Grievance.latitude, Grievance.longitude)
+        .where(*_has_coordinates())
+        .execution_options(yield_per=STREAM_BATCH_SIZE)
+    )
+    chunks = [
+        np.asarray(partition, dtype=float)
+        for partition in db.execute(query).partitions()
+    ]
+    if not chunks:
+        return np.empty((0, 2))
+    return np.concatenate(chunks)
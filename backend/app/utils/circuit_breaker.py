@@ -0,0 +1,90 @@
+import threading
+import time
+from app.utils.metrics import circuit_breaker_state, circuit_breaker_transitions_total
+
+CLOSED, HALF_OPEN, OPEN = "closed", "half_open", "open"
+_STATE_VALUES = {CLOSED: 0, HALF_OPEN: 1, OPEN: 2}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a dependency whose breaker is open."""
+
+
+class CircuitBreaker:
+    """
+    Opens after ``failure_threshold`` consecutive failures (a call slower than
+    ``slow_call_seconds`` counts as one) and rejects calls for ``open_seconds``.
+    Then one probe call is let through: success closes the breaker, failure
+    opens it again. State is exported as igrs_circuit_breaker_state{breaker}.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, open_seconds: float = 30,
+                 slow_call_seconds: float = None):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self.slow_call_seconds = slow_call_seconds
+        self.state = CLOSED
+        self.failures = 0
+        self.rejected = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        circuit_breaker_state.set_function(lambda: _STATE_VALUES[self.state], breaker=name)
+
+    def _enter(self, state: str):
+        if state != self.state:
+            self.state = state
+            circuit_breaker_transitions_total.inc(breaker=self.name, state=state)
+            print(f"Circuit breaker {self.name}: {state}")
+
+    def allow(self):
+        """True if a call may go ahead now; every allowed call must end in record_* or release."""
+        with self._lock:
+            if self.state == OPEN and time.monotonic() - self._opened_at >= self.open_seconds:
+                self._enter(HALF_OPEN)
+            if self.state == CLOSED:
+                return True
+            if self.state == HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+            self.rejected += 1
+            return False
+
+    def is_open(self):
+        """True while calls would be rejected (does not use up the half-open probe)."""
+        with self._lock:
+            if self.state == OPEN:
+                return time.monotonic() - self._opened_at < self.open_seconds
+            return self.state == HALF_OPEN and self._probe_in_flight
+
+    def record_success(self, seconds: float = 0.0):
+        if self.slow_call_seconds is not None and seconds > self.slow_call_seconds:
+            self.record_failure()
+            return
+        with self._lock:
+            self._probe_in_flight = False
+            self.failures = 0
+            self._enter(CLOSED)
+
+    def record_failure(self):
+        with self._lock:
+            self._probe_in_flight = False
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+                self._enter(OPEN)
+
+    def release(self):
+        """The call ended without telling us anything (e.g. the client went away)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def stats(self):
+        with self._lock:
+            return {
+                "state": self.state,
+                "consecutive_failures": self.failures,
+                "rejected": self.rejected,
+                "open_seconds": self.open_seconds,
+            }
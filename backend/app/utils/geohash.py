@@ -0,0 +1,35 @@
+_BASE32 = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Precision 9 ~ 5m x 5m cells, plenty for street-level complaints
+GEOHASH_PRECISION = 9
+
+
+def encode_geohash(latitude: float, longitude: float, precision: int = GEOHASH_PRECISION):
+    """Standard base32 geohash of a point; None if either coordinate is missing."""
+    if latitude is None or longitude is None:
+        return None
+
+    lat_range = [-90.0, 90.0]
+    lon_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # geohash interleaves longitude bits first
+
+    while len(chars) < precision:
+        rng, value = (lon_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            rng[0] = mid
+        else:
+            bits <<= 1
+            rng[1] = mid
+        even = not even
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return "".join(chars)
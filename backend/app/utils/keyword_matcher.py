@@ -0,0 +1,66 @@
+from collections import deque
+
+
+class KeywordMatcher:
+    """
+    Aho-Corasick automaton over case-insensitive keywords.
+    Built once; every text is then scanned in a single pass no matter
+    how many keywords there are.
+
+    Keywords must start at a word boundary; unless ``whole_words`` is set
+    they may run on into the word, so "road" also matches "roads".
+    """
+
+    def __init__(self, keywords: dict, whole_words: bool = False):
+        """``keywords`` maps keyword (may contain spaces) -> value returned on a match."""
+        self.whole_words = whole_words
+        self._goto = [{}]
+        self._fail = [0]
+        self._output = [[]]
+        for keyword, value in keywords.items():
+            self._add(keyword.lower(), value)
+        self._build()
+
+    def _add(self, keyword: str, value):
+        state = 0
+        for char in keyword:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._output.append([])
+            state = next_state
+        self._output[state].append((keyword, value))
+
+    def _build(self):
+        # Breadth-first: a node's failure link points to a shallower node
+        pending = deque(self._goto[0].values())
+        while pending:
+            state = pending.popleft()
+            for char, next_state in self._goto[state].items():
+                pending.append(next_state)
+                fail = self._fail[state]
+                while fail and char not in self._goto[fail]:
+                    fail = self._fail[fail]
+                self._fail[next_state] = self._goto[fail].get(char, 0)
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def find_all(self, text: str):
+        """All matches in ``text`` as (keyword, value), in order of appearance."""
+        text = text.lower()
+        matches = []
+        state = 0
+        for end, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for keyword, value in self._output[state]:
+                start = end - len(keyword) + 1
+                if start > 0 and text[start - 1].isalnum():
+                    continue
+                if self.whole_words and end + 1 < len(text) and text[end + 1].isalnum():
+                    continue
+                matches.append((keyword, value))
+        return matches
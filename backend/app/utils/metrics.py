@@ -0,0 +1,255 @@
+import bisect
+import threading
+import time
+from contextlib import contextmanager
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+# Seconds; from 1ms (keyword rules, cache lookups) up to slow Gemini answers
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+
+_registry = []
+_registry_lock = threading.Lock()
+
+
+def _escape(value: str):
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names, values, extra: str = ""):
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+def _format_value(value):
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+class _Metric:
+    """
+    One metric family with a fixed set of label names. Children (one per label
+    combination) are created on first use; updates take a single lock and do
+    no formatting, which happens only when /metrics is scraped.
+    """
+    type_name = None
+
+    def __init__(self, name: str, documentation: str, labelnames=()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values = {}
+        self._functions = {}
+        self._lock = threading.Lock()
+        with _registry_lock:
+            _registry.append(self)
+
+    def _key(self, labels: dict):
+        if len(labels) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def set_function(self, fn, **labels):
+        """Read the value from ``fn()`` at scrape time (for state kept elsewhere)."""
+        with self._lock:
+            self._functions[self._key(labels)] = fn
+
+    def _samples(self):
+        with self._lock:
+            values = dict(self._values)
+            functions = dict(self._functions)
+        for key, fn in functions.items():
+            try:
+                values[key] = fn()
+            except Exception as e:
+                print(f"Metric {self.name} callback failed: {e}")
+        for key in sorted(values):
+            yield self.name, _format_labels(self.labelnames, key), values[key]
+
+    def render(self):
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.type_name}"]
+        lines += [f"{name}{labels} {_format_value(value)}" for name, labels, value in self._samples()]
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    type_name = "counter"
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+
+class Gauge(_Metric):
+    type_name = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def dec(self, amount: float = 1, **labels):
+        self.inc(-amount, **labels)
+
+
+class Histogram(_Metric):
+    type_name = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames=(), buckets=DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            child = self._values.get(key)
+            if child is None:
+                # Per-bucket counts (the last one is +Inf), made cumulative on render
+                child = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            child[0][index] += 1
+            child[1] += value
+            child[2] += 1
+
+    @contextmanager
+    def time(self, **labels):
+        """Observe the duration of the ``with`` block, also when it raises."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def _samples(self):
+        with self._lock:
+            children = {key: (list(counts), total, count) for key, (counts, total, count) in self._values.items()}
+        bounds = [_format_value(float(bound)) for bound in self.buckets] + ["+Inf"]
+        for key in sorted(children):
+            counts, total, count = children[key]
+            cumulative = 0
+            for bound, bucket_count in zip(bounds, counts):
+                cumulative += bucket_count
+                yield (f"{self.name}_bucket",
+                       _format_labels(self.labelnames, key, f'le="{bound}"'), cumulative)
+            yield f"{self.name}_sum", _format_labels(self.labelnames, key), total
+            yield f"{self.name}_count", _format_labels(self.labelnames, key), count
+
+
+def render_metrics():
+    """All registered metrics in the Prometheus text exposition format."""
+    with _registry_lock:
+        metrics = list(_registry)
+    return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+#Application metrics ---
+pipeline_stage_seconds = Histogram(
+    "igrs_pipeline_stage_seconds",
+    "Time spent in each step of grievance processing",
+    ["stage"],
+)
+external_call_seconds = Histogram(
+    "igrs_external_call_seconds",
+    "Latency of calls to external APIs (Gemini, OpenCage)",
+    ["service", "operation", "outcome"],
+)
+db_query_seconds = Histogram(
+    "igrs_db_query_seconds",
+    "Latency of database work, grouped by what it is for",
+    ["group"],
+)
+http_request_seconds = Histogram(
+    "igrs_http_request_seconds",
+    "Time to fully answer an HTTP request, by route template",
+    ["method", "route", "status"],
+)
+cache_requests_total = Counter(
+    "igrs_cache_requests_total",
+    "Cache lookups by cache and result (hit / miss)",
+    ["cache", "result"],
+)
+llm_fallbacks_total = Counter(
+    "igrs_llm_fallbacks_total",
+    "Answers that fell back because Gemini failed or was not trusted",
+    ["operation", "reason"],
+)
+queue_depth = Gauge(
+    "igrs_queue_depth",
+    "Jobs waiting or running in in-process queues",
+    ["queue"],
+)
+circuit_breaker_state = Gauge(
+    "igrs_circuit_breaker_state",
+    "Circuit breaker state: 0 closed, 1 half-open, 2 open",
+    ["breaker"],
+)
+circuit_breaker_transitions_total = Counter(
+    "igrs_circuit_breaker_transitions_total",
+    "Circuit breaker state changes, by the state entered",
+    ["breaker", "state"],
+)
+
+
+@contextmanager
+def track_external_call(service: str, operation: str):
+    """Time an external API call, labelled ok / error by whether the block raised."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        external_call_seconds.observe(
+            time.perf_counter() - start, service=service, operation=operation, outcome=outcome
+        )
+
+
+def observe_cache_stats(cache: str, stats_fn, hits: str = "hits", misses: str = "misses"):
+    """Export the hit/miss counters a cache already keeps, read at scrape time."""
+    cache_requests_total.set_function(lambda: stats_fn()[hits], cache=cache, result="hit")
+    cache_requests_total.set_function(lambda: stats_fn()[misses], cache=cache, result="miss")
+
+
+class MetricsMiddleware:
+    """
+    ASGI middleware feeding http_request_seconds. Requests are labelled with the
+    matched route's path template (so /grievance/{grievance_id}/status, not every id);
+    unmatched paths share one label to keep the series count bounded.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        start = time.perf_counter()
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            route = scope.get("route")
+            http_request_seconds.observe(
+                time.perf_counter() - start,
+                method=scope["method"],
+                route=getattr(route, "path", "unmatched"),
+                status=status,
+            )
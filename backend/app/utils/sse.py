@@ -0,0 +1,13 @@
+import json
+
+# Headers that keep proxies from buffering or caching an event stream
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+
+def sse_event(event: str, data: dict):
+    """One Server-Sent Event; data is JSON so multi-line text stays in one frame."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def wants_event_stream(accept_header: str):
+    return "text/event-stream" in (accept_header or "")
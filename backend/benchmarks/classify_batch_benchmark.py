@@ -0,0 +1,114 @@
+"""
+Throughput of Gemini classification at different batch sizes, measured
+against a local stub model (no network, no API key needed).
+
+    python benchmarks/classify_batch_benchmark.py --items 200 --latency-ms 400
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+import types
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ["LLM_CACHE_ENABLED"] = "false"  # measure upstream calls, not the cache
+
+from app.services import gemini_classifier, gemini_client
+from app.services.classify_batcher import MicroBatcher
+
+SAMPLE_TEXTS = [
+    "Water supply has been cut for three days in Lucknow",
+    "Huge pothole on the main road near Kanpur station",
+    "Garbage is not collected in our colony in Varanasi",
+    "No doctor available at the district hospital in Agra",
+    "Power cut every evening in Meerut",
+]
+
+
+class StubModel:
+    """Mimics GenerativeModel: fixed round-trip latency plus a small per-item cost."""
+    latency = 0.4
+    per_item = 0.005
+    calls = 0
+    timeouts = set()  # request_options["timeout"] of the calls seen
+
+    def __init__(self, name):
+        self.name = name
+
+    def generate_content(self, prompt, **kwargs):
+        StubModel.calls += 1
+        StubModel.timeouts.add(kwargs.get("request_options", {}).get("timeout"))
+        items = re.findall(r"^\s*(\d+)\. \"", prompt, flags=re.MULTILINE)
+        time.sleep(self.latency + self.per_item * max(1, len(items)))
+        answer = {"category": "Water", "priority": "Medium", "region": "Lucknow"}
+        if items:
+            text = json.dumps([{"index": int(i), **answer} for i in items])
+        else:
+            text = json.dumps(answer)
+        return type("Response", (), {"text": text})()
+
+
+def make_texts(n):
+    return [f"{SAMPLE_TEXTS[i % len(SAMPLE_TEXTS)]} (ref {i})" for i in range(n)]
+
+
+def bench_batch_api(texts, batch_size):
+    gemini_classifier.CLASSIFY_BATCH_MAX_SIZE = batch_size
+    StubModel.calls = 0
+    start = time.perf_counter()
+    gemini_classifier.classify_grievances_batch(texts)
+    elapsed = time.perf_counter() - start
+    return elapsed, StubModel.calls
+
+
+def bench_micro_batcher(texts, batch_size, concurrency, window_ms, in_flight):
+    gemini_classifier.CLASSIFY_BATCH_MAX_SIZE = batch_size
+    batcher = MicroBatcher(
+        gemini_classifier.classify_grievances_batch, batch_size, window_ms, in_flight
+    )
+    StubModel.calls = 0
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        list(pool.map(batcher, texts))
+    elapsed = time.perf_counter() - start
+    return elapsed, StubModel.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--items", type=int, default=200)
+    parser.add_argument("--latency-ms", type=float, default=400)
+    parser.add_argument("--per-item-ms", type=float, default=5)
+    parser.add_argument("--batch-sizes", default="1,5,10,20,50")
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--window-ms", type=int, default=10)
+    parser.add_argument("--in-flight", type=int, default=4)
+    args = parser.parse_args()
+
+    StubModel.latency = args.latency_ms / 1000
+    StubModel.per_item = args.per_item_ms / 1000
+    # Every Gemini call goes through gemini_client (deadline, breaker, metrics): give it the stub SDK
+    stub_genai = types.SimpleNamespace(GenerativeModel=StubModel)
+    gemini_client.get_genai = lambda: stub_genai
+    texts = make_texts(args.items)
+
+    print(f"{args.items} grievances, stub latency {args.latency_ms}ms + {args.per_item_ms}ms/item")
+    print(f"{'mode':<14}{'batch':>6}{'calls':>8}{'seconds':>10}{'items/s':>10}")
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        elapsed, calls = bench_batch_api(texts, batch_size)
+        print(f"{'batch api':<14}{batch_size:>6}{calls:>8}{elapsed:>10.2f}{len(texts) / elapsed:>10.1f}")
+
+    for batch_size in [int(b) for b in args.batch_sizes.split(",")]:
+        elapsed, calls = bench_micro_batcher(
+            texts, batch_size, args.concurrency, args.window_ms, args.in_flight
+        )
+        print(f"{'micro-batcher':<14}{batch_size:>6}{calls:>8}{elapsed:>10.2f}{len(texts) / elapsed:>10.1f}")
+    print(f"request timeouts used (s): {sorted(StubModel.timeouts)}")
+
+
+if __name__ == "__main__":
+    main()
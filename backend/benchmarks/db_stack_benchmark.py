@@ -0,0 +1,146 @@
+"""
+Requests per second of the sync (SessionLocal + threadpool) and async
+(AsyncSessionLocal + asyncpg/aiosqlite) database stacks under the same load.
+
+Each stack is served by uvicorn in its own process with one endpoint doing what
+an authenticated listing does: look up a user, then read a page of grievances.
+Uses DATABASE_URL (run create_db.py first).
+
+    python benchmarks/db_stack_benchmark.py --concurrency 100 --seconds 10
+
+--db-latency-ms adds a simulated network round trip per query (time.sleep vs
+asyncio.sleep), approximating a hosted Postgres when benchmarking locally.
+"""
+import argparse
+import asyncio
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+PAGE_SIZE = 20
+
+
+def build_app(stack: str, latency: float):
+    from fastapi import Depends, FastAPI
+    from sqlalchemy import select
+    from app.db.connection import get_db, get_async_db
+    from app.db.models import Grievance, User
+
+    app = FastAPI()
+    user_query = select(User.id).limit(1)
+    page_query = select(Grievance.id, Grievance.status).order_by(
+        Grievance.created_at.desc(), Grievance.id.desc()
+    ).limit(PAGE_SIZE)
+
+    @app.get("/ping")
+    def ping():
+        return {}
+
+    if stack == "sync":
+        @app.get("/bench")
+        def bench(db=Depends(get_db)):
+            for query in (user_query, page_query):
+                if latency:
+                    time.sleep(latency)
+                rows = db.execute(query).all()
+            return {"rows": len(rows)}
+    else:
+        @app.get("/bench")
+        async def bench(db=Depends(get_async_db)):
+            for query in (user_query, page_query):
+                if latency:
+                    await asyncio.sleep(latency)
+                rows = (await db.execute(query)).all()
+            return {"rows": len(rows)}
+    return app
+
+
+def serve(stack: str, port: int, latency: float):
+    import uvicorn
+    uvicorn.run(build_app(stack, latency), port=port, log_level="warning")
+
+
+async def load(url: str, concurrency: int, seconds: float):
+    import httpx
+
+    latencies, errors = [], 0
+    deadline = time.perf_counter() + seconds
+
+    async def client_loop(client):
+        nonlocal errors
+        while time.perf_counter() < deadline:
+            start = time.perf_counter()
+            try:
+                response = await client.get(url)
+                response.raise_for_status()
+                latencies.append(time.perf_counter() - start)
+            except Exception:
+                errors += 1
+
+    limits = httpx.Limits(max_connections=concurrency)
+    async with httpx.AsyncClient(limits=limits, timeout=30) as client:
+        await asyncio.gather(*(client_loop(client) for _ in range(concurrency)))
+    return latencies, errors
+
+
+def wait_until_up(url: str, timeout: float = 60):
+    import httpx
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except Exception:
+            time.sleep(0.5)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+def percentile(values, fraction):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--stacks", default="sync,async")
+    parser.add_argument("--concurrency", type=int, default=100)
+    parser.add_argument("--seconds", type=float, default=10)
+    parser.add_argument("--db-latency-ms", type=float, default=0)
+    parser.add_argument("--port", type=int, default=8900)
+    parser.add_argument("--serve", choices=["sync", "async"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    latency = args.db_latency_ms / 1000
+    if args.serve:
+        serve(args.serve, args.port, latency)
+        return
+
+    print(f"{args.concurrency} concurrent clients for {args.seconds:.0f}s, "
+          f"simulated DB latency {args.db_latency_ms}ms per query")
+    print(f"{'stack':<8}{'requests':>10}{'errors':>8}{'req/s':>10}{'p50 ms':>9}{'p95 ms':>9}")
+    for stack in args.stacks.split(","):
+        server = subprocess.Popen([
+            sys.executable, os.path.abspath(__file__), "--serve", stack,
+            "--port", str(args.port), "--db-latency-ms", str(args.db_latency_ms),
+        ])
+        url = f"http://127.0.0.1:{args.port}/bench"
+        try:
+            wait_until_up(f"http://127.0.0.1:{args.port}/ping")
+            latencies, errors = asyncio.run(load(url, args.concurrency, args.seconds))
+        finally:
+            server.terminate()
+            server.wait()
+        if not latencies:
+            print(f"{stack:<8}{0:>10}{errors:>8}")
+            continue
+        print(f"{stack:<8}{len(latencies):>10}{errors:>8}{len(latencies) / args.seconds:>10.1f}"
+              f"{statistics.median(latencies) * 1000:>9.1f}{percentile(latencies, 0.95) * 1000:>9.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,336 @@
+"""
+Scripted load scenarios against the backend. Each scenario reports throughput
+and p50/p95/p99 latency, and every run is saved as JSON so runs can be compared.
+
+    # 1. seed a local database (see benchmarks/seed_grievances.py)
+    DATABASE_URL=sqlite:///bench.db python benchmarks/seed_grievances.py --rows 100000
+    # 2. run; starts the stub Gemini/OpenCage server and uvicorn itself
+    DATABASE_URL=sqlite:///bench.db python benchmarks/load_scenarios.py --concurrency 20 --seconds 20
+    # 3. compare with an earlier run
+    python benchmarks/load_scenarios.py ... --compare benchmarks/results/<earlier>.json
+
+Scenarios: submit, login, grievance_all, hotspots, hotspot_trends, forecast.
+Use --base-url to load an already running server instead (it should then be
+started with GEMINI_API_ENDPOINT / OPENCAGE_API_URL pointing at stub_apis.py).
+Needs httpx (pip install httpx).
+"""
+import argparse
+import asyncio
+import json
+import math
+import os
+import platform
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from stub_apis import StubConfig, make_server
+from seed_grievances import BENCH_ADMIN_EMAIL, BENCH_PASSWORD, bench_user_email
+from app.services.synthetic_grievances import generate_grievance_texts
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results")
+
+SCENARIOS = ["submit", "login", "grievance_all", "hotspots", "hotspot_trends", "forecast"]
+FORECAST_CATEGORIES = ["Infrastructure", "Utilities", "Sanitation", "Medical"]
+FORECAST_DAYS = [7, 30, 90]
+GRIEVANCE_PAGES = 10  # a client follows X-Next-Cursor this deep, then starts over
+
+
+class ScenarioContext:
+    """Tokens and inputs shared by the virtual clients of one run."""
+
+    def __init__(self, admin_token: str, user_tokens: list, users: int):
+        self.admin_headers = {"Authorization": f"Bearer {admin_token}"}
+        self.user_headers = [{"Authorization": f"Bearer {token}"} for token in user_tokens]
+        self.users = users
+        self.texts = [text for text, _ in generate_grievance_texts(2000, seed=7)]
+
+
+#Scenarios: each is one request; ``i`` counts the client's requests, ``state`` is per client
+async def scenario_submit(client, ctx, i, state):
+    headers = ctx.user_headers[(state["client"] + i) % len(ctx.user_headers)]
+    text = ctx.texts[(state["client"] * 7919 + i) % len(ctx.texts)]
+    return await client.post("/grievance/submit", json={"description": text}, headers=headers)
+
+
+async def scenario_login(client, ctx, i, state):
+    email = bench_user_email((state["client"] + i) % ctx.users)
+    return await client.post("/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+
+
+async def scenario_grievance_all(client, ctx, i, state):
+    params = {"limit": 50}
+    if state.get("cursor") and state.get("page", 0) < GRIEVANCE_PAGES:
+        params["cursor"] = state["cursor"]
+        state["page"] = state.get("page", 0) + 1
+    else:
+        state["page"] = 0
+    response = await client.get("/grievance/all", params=params, headers=ctx.admin_headers)
+    state["cursor"] = response.headers.get("X-Next-Cursor")
+    return response
+
+
+async def scenario_hotspots(client, ctx, i, state):
+    return await client.get("/analytics/hotspots", headers=ctx.admin_headers)
+
+
+async def scenario_hotspot_trends(client, ctx, i, state):
+    return await client.get("/analytics/hotspots/trends", headers=ctx.admin_headers)
+
+
+async def scenario_forecast(client, ctx, i, state):
+    n = state["client"] + i
+    category = FORECAST_CATEGORIES[n % len(FORECAST_CATEGORIES)]
+    days = FORECAST_DAYS[n // len(FORECAST_CATEGORIES) % len(FORECAST_DAYS)]
+    return await client.get(f"/analytics/forecast/{category}", params={"days": days}, headers=ctx.admin_headers)
+
+
+#Load generation ---
+def percentile(ordered: list, fraction: float):
+    """Nearest-rank percentile of an already sorted list."""
+    if not ordered:
+        return None
+    return ordered[max(0, math.ceil(fraction * len(ordered)) - 1)]
+
+
+def summarize(latencies: list, statuses: dict, errors: int, seconds: float):
+    ordered = sorted(latencies)
+    ms = lambda value: None if value is None else round(value * 1000, 2)
+    return {
+        "requests": len(latencies) + errors,
+        "ok": sum(count for status, count in statuses.items() if status.startswith(("2", "3"))),
+        "errors": errors + sum(count for status, count in statuses.items() if not status.startswith(("2", "3"))),
+        "status_codes": dict(sorted(statuses.items())),
+        "throughput_rps": round(len(latencies) / seconds, 2) if seconds else 0,
+        "latency_ms": {
+            "p50": ms(percentile(ordered, 0.50)),
+            "p95": ms(percentile(ordered, 0.95)),
+            "p99": ms(percentile(ordered, 0.99)),
+            "mean": ms(sum(ordered) / len(ordered)) if ordered else None,
+            "max": ms(ordered[-1]) if ordered else None,
+        },
+    }
+
+
+async def run_scenario(base_url: str, fn, ctx, concurrency: int, seconds: float, warmup: float):
+    """Closed loop: ``concurrency`` clients send requests back to back; warm-up results are dropped."""
+    import httpx
+
+    latencies, statuses = [], {}
+    errors = 0
+    start = time.perf_counter()
+    measure_from = start + warmup
+    deadline = measure_from + seconds
+
+    async def client_loop(client, number):
+        nonlocal errors
+        state, i = {"client": number}, 0
+        while time.perf_counter() < deadline:
+            sent = time.perf_counter()
+            try:
+                response = await fn(client, ctx, i, state)
+                status = str(response.status_code)
+            except Exception:
+                status = None
+            done = time.perf_counter()
+            i += 1
+            if sent < measure_from:
+                continue
+            if status is None:
+                errors += 1
+                continue
+            statuses[status] = statuses.get(status, 0) + 1
+            latencies.append(done - sent)
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=60) as client:
+        await asyncio.gather(*(client_loop(client, n) for n in range(concurrency)))
+    return summarize(latencies, statuses, errors, seconds)
+
+
+async def login(base_url: str, email: str):
+    import httpx
+
+    async with httpx.AsyncClient(base_url=base_url, timeout=60) as client:
+        response = await client.post("/auth/login", json={"email": email, "password": BENCH_PASSWORD})
+        response.raise_for_status()
+        return response.json()["access_token"]
+
+
+async def build_context(base_url: str, users: int, token_users: int):
+    admin_token = await login(base_url, BENCH_ADMIN_EMAIL)
+    user_tokens = [await login(base_url, bench_user_email(i)) for i in range(min(users, token_users))]
+    return ScenarioContext(admin_token, user_tokens, users)
+
+
+#Server management ---
+def wait_until_up(url: str, timeout: float = 120):
+    import httpx
+
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        try:
+            if httpx.get(url, timeout=2).status_code == 200:
+                return
+        except Exception:
+            pass
+        time.sleep(0.5)
+    raise RuntimeError(f"server at {url} did not start")
+
+
+def start_backend(port: int, stub_url: str):
+    env = dict(os.environ)
+    env.update(
+        GEMINI_API_ENDPOINT=stub_url, GEMINI_API_KEY=env.get("GEMINI_API_KEY") or "stub",
+        OPENCAGE_API_URL=stub_url, OPENCAGE_API_KEY=env.get("OPENCAGE_API_KEY") or "stub",
+    )
+    return subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env,
+    )
+
+
+def git_commit():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=BACKEND_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except Exception:
+        return None
+
+
+def database_info():
+    url = os.getenv("DATABASE_URL") or ""
+    info = {"dialect": url.split(":", 1)[0] or None}
+    try:
+        from app.db.connection import SessionLocal
+        from app.db.models import Grievance
+        db = SessionLocal()
+        try:
+            info["grievances"] = db.query(Grievance).count()
+        finally:
+            db.close()
+    except Exception as e:
+        print("Could not count grievances:", e)
+    return info
+
+
+#Reporting ---
+def print_results(results: dict):
+    print(f"{'scenario':<16}{'requests':>9}{'errors':>8}{'req/s':>9}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}")
+    for name, result in results.items():
+        latency = result["latency_ms"]
+        cells = [f"{latency[key]:>9.1f}" if latency[key] is not None else f"{'-':>9}" for key in ("p50", "p95", "p99")]
+        print(f"{name:<16}{result['requests']:>9}{result['errors']:>8}{result['throughput_rps']:>9.1f}" + "".join(cells))
+
+
+def print_comparison(results: dict, baseline_path: str):
+    with open(baseline_path) as f:
+        baseline = json.load(f)
+    print(f"\nCompared with {baseline_path} ({baseline.get('label') or baseline.get('git_commit')}):")
+    print(f"{'scenario':<16}{'req/s':>24}{'p95 ms':>24}{'p99 ms':>24}")
+    change = lambda old, new: f"{(new - old) / old:+.0%}" if old and new is not None else "n/a"
+    for name, result in results.items():
+        old = baseline.get("scenarios", {}).get(name)
+        if not old:
+            continue
+        cells = [f"{old['throughput_rps']}->{result['throughput_rps']} {change(old['throughput_rps'], result['throughput_rps'])}"]
+        for key in ("p95", "p99"):
+            before, after = old["latency_ms"][key], result["latency_ms"][key]
+            cells.append(f"{before}->{after} {change(before, after)}")
+        print(f"{name:<16}" + "".join(f"{cell:>24}" for cell in cells))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--concurrency", type=int, default=20)
+    parser.add_argument("--seconds", type=float, default=20, help="measured time per scenario")
+    parser.add_argument("--warmup", type=float, default=3, help="unmeasured time before each scenario")
+    parser.add_argument("--users", type=int, default=100, help="bench users seeded by seed_grievances.py")
+    parser.add_argument("--token-users", type=int, default=20, help="users logged in up front for submit")
+    parser.add_argument("--base-url", help="load this running server instead of starting one")
+    parser.add_argument("--port", type=int, default=8800)
+    parser.add_argument("--stub-port", type=int, default=9100)
+    parser.add_argument("--stub-latency-ms", type=float, default=300)
+    parser.add_argument("--stub-jitter-ms", type=float, default=100)
+    parser.add_argument("--stub-error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=42, help="stub randomness (latency jitter, injected errors)")
+    parser.add_argument("--label", help="name stored with the results")
+    parser.add_argument("--output", help=f"results file (default {RESULTS_DIR}/<timestamp>.json)")
+    parser.add_argument("--compare", help="earlier results file to compare with")
+    args = parser.parse_args()
+
+    scenarios = [name.strip() for name in args.scenarios.split(",") if name.strip()]
+    unknown = set(scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    stub, backend = None, None
+    base_url = args.base_url
+    try:
+        if base_url is None:
+            if not os.getenv("DATABASE_URL"):
+                sys.exit("Set DATABASE_URL to the seeded local database (or pass --base-url)")
+            config = StubConfig(args.stub_latency_ms, args.stub_jitter_ms, args.stub_error_rate, seed=args.seed)
+            stub = make_server(args.stub_port, config)
+            threading.Thread(target=stub.serve_forever, name="stub-apis", daemon=True).start()
+            backend = start_backend(args.port, f"http://localhost:{args.stub_port}")
+            base_url = f"http://127.0.0.1:{args.port}"
+        wait_until_up(base_url + "/")
+
+        ctx = asyncio.run(build_context(base_url, args.users, args.token_users))
+        print(f"{args.concurrency} concurrent clients, {args.seconds:.0f}s per scenario "
+              f"(+{args.warmup:.0f}s warm-up), stub latency {args.stub_latency_ms:.0f}ms")
+        results = {}
+        for name in scenarios:
+            fn = globals()[f"scenario_{name}"]
+            results[name] = asyncio.run(
+                run_scenario(base_url, fn, ctx, args.concurrency, args.seconds, args.warmup)
+            )
+            print(f"  {name}: {results[name]['throughput_rps']} req/s, p95 {results[name]['latency_ms']['p95']} ms")
+        stub_stats = dict(stub.RequestHandlerClass.config.stats) if stub else None
+    finally:
+        if backend:
+            backend.terminate()
+            backend.wait()
+        if stub:
+            stub.shutdown()
+            stub.server_close()
+
+    report = {
+        "label": args.label,
+        "started_at": datetime.utcnow().isoformat() + "Z",
+        "git_commit": git_commit(),
+        "python": platform.python_version(),
+        "cpu_count": os.cpu_count(),
+        "base_url": base_url if args.base_url else None,
+        "database": database_info() if not args.base_url else None,
+        "settings": {
+            "concurrency": args.concurrency, "seconds": args.seconds, "warmup": args.warmup,
+            "users": args.users, "stub_latency_ms": args.stub_latency_ms,
+            "stub_jitter_ms": args.stub_jitter_ms, "stub_error_rate": args.stub_error_rate,
+        },
+        "scenarios": results,
+        "stub_calls": stub_stats,
+    }
+    output = args.output or os.path.join(RESULTS_DIR, f"{datetime.utcnow():%Y%m%d-%H%M%S}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print()
+    print_results(results)
+    print(f"\nSaved to {output}")
+    if args.compare:
+        print_comparison(results, args.compare)
+
+
+if __name__ == "__main__":
+    main()
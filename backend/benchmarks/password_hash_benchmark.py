@@ -0,0 +1,61 @@
+"""
+Login throughput of the password hashing pool: bcrypt verifications per
+second in total and per worker process (one worker per core).
+
+    python benchmarks/password_hash_benchmark.py --logins 200 --workers 1,2,4
+"""
+import argparse
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.auth.hashing import hash_password
+from app.auth.password_pool import PasswordHashPool, PasswordPoolBusy
+
+
+def bench(stored_hash, logins, workers, concurrency, max_queue):
+    pool = PasswordHashPool(workers=workers, max_queue=max_queue)
+    pool.warm_up()
+    pool.verify_and_update("correct horse", stored_hash)  # workers are up
+
+    def login(_):
+        try:
+            return pool.verify_and_update("correct horse", stored_hash)[0]
+        except PasswordPoolBusy:
+            return None
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as threads:
+        results = list(threads.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    pool.shutdown()
+    accepted = sum(1 for r in results if r)
+    return elapsed, accepted, results.count(None)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--logins", type=int, default=200)
+    parser.add_argument("--workers", default="1,2,4")
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--max-queue", type=int, default=1000,
+                        help="large by default so nothing is rejected; lower it to see 503s")
+    args = parser.parse_args()
+
+    stored_hash = hash_password("correct horse")
+    print(f"{args.logins} logins, {args.concurrency} concurrent clients, "
+          f"bcrypt cost {stored_hash.split('$')[2]}, {os.cpu_count()} cores")
+    print(f"{'workers':>8}{'ok':>7}{'503':>7}{'seconds':>10}{'logins/s':>10}{'per core':>10}")
+    for workers in [int(w) for w in args.workers.split(",")]:
+        elapsed, accepted, rejected = bench(
+            stored_hash, args.logins, workers, args.concurrency, args.max_queue
+        )
+        rate = accepted / elapsed
+        print(f"{workers:>8}{accepted:>7}{rejected:>7}{elapsed:>10.2f}{rate:>10.1f}{rate / workers:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
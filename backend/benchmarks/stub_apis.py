@@ -0,0 +1,248 @@
+"""
+Local stand-in for the Gemini (REST) and OpenCage APIs, so load tests neither
+cost money nor depend on the real services' latency on the day.
+
+    python benchmarks/stub_apis.py --port 9100 --latency-ms 400 --jitter-ms 150 --error-rate 0.02
+
+Point the backend at it with
+
+    GEMINI_API_ENDPOINT=http://localhost:9100  GEMINI_API_KEY=stub
+    OPENCAGE_API_URL=http://localhost:9100     OPENCAGE_API_KEY=stub
+
+(the OpenCage client only accepts opencagedata.com subdomains or localhost).
+
+Gemini answers are shaped like the prompts ask (classification JSON, a
+two-section solution, streamed in chunks for streamGenerateContent); OpenCage
+answers come from the bundled gazetteer, or a made-up point in Uttar Pradesh.
+GET /stub/stats returns the request/error counts per operation.
+"""
+import argparse
+import csv
+import hashlib
+import json
+import os
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+GAZETTEER_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "data", "up_gazetteer.csv"
+)
+
+CATEGORIES = ["Roads", "Water", "Electricity", "Waste", "Health", "Law & Order", "Other"]
+PRIORITIES = ["High", "Medium", "Low"]
+
+SOLUTION_TEXT = (
+    "1. **Short-term Action:** Register the complaint with the concerned department, "
+    "send a field officer within 24 hours and keep the citizen informed of progress.\n\n"
+    "2. **Long-term Solution:** Add the location to the preventive maintenance plan, "
+    "track repeat complaints from the area and review the contractor's service levels."
+)
+
+
+class StubConfig:
+    def __init__(self, latency_ms=300, jitter_ms=100, error_rate=0.0, error_status=500,
+                 stream_chunks=8, chunk_delay_ms=30, seed=None):
+        self.latency = latency_ms / 1000
+        self.jitter = jitter_ms / 1000
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.stream_chunks = max(1, stream_chunks)
+        self.chunk_delay = chunk_delay_ms / 1000
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.stats = {}
+        self.gazetteer = {}
+        with open(GAZETTEER_PATH, newline="", encoding="utf-8") as f:
+            for row in csv.DictReader(f):
+                self.gazetteer[row["name"].lower()] = (float(row["latitude"]), float(row["longitude"]))
+        self.region_pattern = re.compile(
+            r"\b(" + "|".join(re.escape(name) for name in sorted(self.gazetteer, key=len, reverse=True)) + r")\b",
+            re.IGNORECASE,
+        )
+
+    def delay(self):
+        with self.lock:
+            seconds = self.latency + self.random.uniform(-self.jitter, self.jitter)
+        time.sleep(max(0.0, seconds))
+
+    def should_fail(self):
+        with self.lock:
+            return self.random.random() < self.error_rate
+
+    def count(self, operation: str, failed: bool):
+        with self.lock:
+            entry = self.stats.setdefault(operation, {"requests": 0, "errors": 0})
+            entry["requests"] += 1
+            entry["errors"] += int(failed)
+
+
+def _pick(options, text: str):
+    digest = hashlib.md5(text.encode("utf-8")).digest()
+    return options[digest[0] % len(options)]
+
+
+def _classification(config: StubConfig, text: str):
+    match = config.region_pattern.search(text)
+    return {
+        "category": _pick(CATEGORIES, text),
+        "priority": _pick(PRIORITIES, text[::-1]),
+        "region": match.group(1).title() if match else "Unknown",
+    }
+
+
+def answer_prompt(config: StubConfig, prompt: str):
+    """The text Gemini would return for one of the backend's prompts."""
+    batch = re.search(r"Classify EACH of the following (\d+) grievances", prompt)
+    if batch:
+        grievances = re.findall(r'^\s*(\d+)\. "(.*)"\s*$', prompt, re.MULTILINE)
+        items = [{"index": int(i), **_classification(config, text)} for i, text in grievances]
+        return "```json\n" + json.dumps(items) + "\n```"
+    single = re.search(r'Grievance: "(.*)"', prompt, re.DOTALL)
+    if single:
+        return json.dumps(_classification(config, single.group(1)))
+    if "forecast insight" in prompt:
+        return "Complaint volume is expected to stay close to recent levels.\nPlan staffing accordingly."
+    return SOLUTION_TEXT
+
+
+def _candidate(text: str):
+    return {
+        "candidates": [{"content": {"parts": [{"text": text}], "role": "model"}, "finishReason": 1, "index": 0}],
+        "usageMetadata": {"promptTokenCount": 50, "candidatesTokenCount": len(text.split())},
+    }
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    config: StubConfig = None
+
+    def log_message(self, format, *args):
+        pass  # one line per request would dominate a load test's output
+
+    def handle_one_request(self):
+        try:
+            super().handle_one_request()
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True  # the client gave up (deadline) before the answer
+
+    def _send_json(self, status: int, payload):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _fail(self, operation: str):
+        self.config.count(operation, True)
+        self._send_json(self.config.error_status, {"error": {
+            "code": self.config.error_status, "message": "stub: injected error", "status": "INTERNAL",
+        }})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/stub/stats":
+            with self.config.lock:
+                self._send_json(200, self.config.stats)
+            return
+        if url.path != "/geocode/v1/json":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        self.config.delay()
+        if self.config.should_fail():
+            self._fail("opencage")
+            return
+        query = parse_qs(url.query).get("q", [""])[0]
+        location = self.config.gazetteer.get(query.strip().lower())
+        if location is None:
+            # Somewhere inside Uttar Pradesh, stable for the same query
+            digest = hashlib.md5(query.encode("utf-8")).digest()
+            location = (24.0 + digest[0] / 255 * 6, 77.0 + digest[1] / 255 * 7.5)
+        self.config.count("opencage", False)
+        self._send_json(200, {
+            "results": [{"geometry": {"lat": location[0], "lng": location[1]}, "confidence": 7}],
+            "status": {"code": 200, "message": "OK"},
+            "total_results": 1,
+        })
+
+    def do_POST(self):
+        url = urlparse(self.path)
+        length = int(self.headers.get("Content-Length") or 0)
+        body = json.loads(self.rfile.read(length) or b"{}")
+        streaming = url.path.endswith(":streamGenerateContent")
+        if not (streaming or url.path.endswith(":generateContent")):
+            self._send_json(404, {"error": {"code": 404, "message": "not found", "status": "NOT_FOUND"}})
+            return
+
+        operation = "gemini_stream" if streaming else "gemini"
+        prompt = "".join(
+            part.get("text", "") for content in body.get("contents", []) for part in content.get("parts", [])
+        )
+        self.config.delay()
+        if self.config.should_fail():
+            self._fail(operation)
+            return
+        text = answer_prompt(self.config, prompt)
+        self.config.count(operation, False)
+        if not streaming:
+            self._send_json(200, _candidate(text))
+            return
+
+        # REST streaming is one JSON array sent piece by piece
+        words = text.split(" ")
+        size = -(-len(words) // self.config.stream_chunks)
+        pieces = [" ".join(words[i:i + size]) + " " for i in range(0, len(words), size)]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for i, piece in enumerate(pieces):
+            if i:
+                time.sleep(self.config.chunk_delay)
+            data = (("[" if i == 0 else ",") + json.dumps(_candidate(piece))).encode("utf-8")
+            self.wfile.write(f"{len(data):X}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+        self.wfile.write(b"1\r\n]\r\n0\r\n\r\n")
+
+
+def make_server(port: int, config: StubConfig, host: str = "127.0.0.1"):
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    parser.add_argument("--latency-ms", type=float, default=300)
+    parser.add_argument("--jitter-ms", type=float, default=100)
+    parser.add_argument("--error-rate", type=float, default=0.0, help="share of requests answered with an error")
+    parser.add_argument("--error-status", type=int, default=500,
+                        help="500 fails fast; 503 makes the Gemini client retry like it would in production")
+    parser.add_argument("--stream-chunks", type=int, default=8)
+    parser.add_argument("--chunk-delay-ms", type=float, default=30)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    config = StubConfig(args.latency_ms, args.jitter_ms, args.error_rate, args.error_status,
+                        args.stream_chunks, args.chunk_delay_ms, args.seed)
+    server = make_server(args.port, config, args.host)
+    print(f"Stub Gemini/OpenCage on http://{args.host}:{args.port} "
+          f"(latency {args.latency_ms:.0f}±{args.jitter_ms:.0f}ms, error rate {args.error_rate:.0%})")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Check that importing the app stays cheap: the median `import app.main` over a
+few fresh interpreters must fit IMPORT_TIME_BUDGET_MS, and none of the heavy
+libraries (loaded lazily on first use) may be imported at startup.
+
+    python check_import_time.py [--runs 5] [--budget-ms 1500]
+
+Exits 1 on a violation and lists the slowest imports (from -X importtime).
+tests/test_import_time.py enforces the same budget in the test suite.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import IMPORT_TIME_BUDGET_MS
+
+HEAVY_MODULES = ["pandas", "numpy", "prophet", "sklearn", "google.generativeai", "grpc", "opencage"]
+
+PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import app.main
+elapsed = time.perf_counter() - start
+print(json.dumps([elapsed * 1000, [name for name in {heavy!r} if name in sys.modules]]))
+"""
+
+
+def _env():
+    env = dict(os.environ)
+    # Building the engines does not connect, any URL will do
+    env.setdefault("DATABASE_URL", "sqlite:///./import_check.db")
+    return env
+
+
+def measure_once():
+    output = subprocess.run(
+        [sys.executable, "-c", PROBE.format(heavy=HEAVY_MODULES)],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=_env(),
+        capture_output=True, text=True, check=True,
+    ).stdout.strip().splitlines()
+    # The last line; startup prints from the app may come before it
+    ms, heavy = json.loads(output[-1])
+    return ms, heavy
+
+
+def slowest_imports(limit: int = 15):
+    """(cumulative microseconds, package) for the libraries that cost app.main the most."""
+    stderr = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", "import app.main"],
+        cwd=os.path.dirname(os.path.abspath(__file__)), env=_env(),
+        capture_output=True, text=True, check=True,
+    ).stderr
+    packages = {}
+    # "import time:   self [us] | cumulative | imported package"
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:"):].split("|")
+        # A package's first import carries the cost of everything it pulled in
+        package = module.strip().split(".")[0]
+        if package != "app":
+            packages[package] = max(packages.get(package, 0), int(cumulative))
+    return sorted(((us, package) for package, us in packages.items()), reverse=True)[:limit]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--budget-ms", type=float, default=IMPORT_TIME_BUDGET_MS)
+    args = parser.parse_args()
+
+    timings, heavy = [], set()
+    for _ in range(max(1, args.runs)):
+        ms, modules = measure_once()
+        timings.append(ms)
+        heavy.update(modules)
+    median = statistics.median(timings)
+    print(f"import app.main: median {median:.0f}ms over {len(timings)} runs "
+          f"(min {min(timings):.0f}ms, max {max(timings):.0f}ms), budget {args.budget_ms:.0f}ms")
+
+    failures = []
+    if median > args.budget_ms:
+        failures.append(f"median import time {median:.0f}ms is over the {args.budget_ms:.0f}ms budget")
+    if heavy:
+        failures.append(f"heavy modules imported at startup: {', '.join(sorted(heavy))}")
+
+    if failures:
+        print("\nSlowest imports (cumulative):")
+        for us, module in slowest_imports():
+            print(f"  {us / 1000:>8.1f}ms  {module}")
+        for failure in failures:
+            print("FAIL:", failure)
+        sys.exit(1)
+    print("OK")
+
+
+if __name__ == "__main__":
+    main()
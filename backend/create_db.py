@@ -5,12 +5,14 @@ sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from app.db.connection import Base, engine
 from app.db.models import Grievance
+from app.services.geocode_service import seed_geocode_cache
 
 print("Creating database tables.... on Neon Postgress...")
 
 try:
     Base.metadata.create_all(bind=engine)
     print("Tables created successfully")
+    seed_geocode_cache()
 except Exception as e:
     print("Error creating tables:", e)
 
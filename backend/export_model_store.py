@@ -0,0 +1,19 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from datetime import datetime
+from app.services.model_store import LEGACY_MODEL_PATH, SEED_STORE_DIR, MANIFEST_NAME, import_legacy_pickle
+
+print(f"Splitting {LEGACY_MODEL_PATH} into per-category model artifacts...")
+
+try:
+    # Writes the seed store shipped with the repo, not the runtime FORECAST_MODEL_DIR
+    manifest = import_legacy_pickle(datetime.utcnow().strftime("%Y%m%d%H%M%S%f"), SEED_STORE_DIR)
+    for category, entry in manifest["categories"].items():
+        print(f"  {category}: {entry['file']} ({entry['size_bytes']} bytes)")
+    print(f"Model store published: {os.path.join(SEED_STORE_DIR, MANIFEST_NAME)} (version {manifest['version']})")
+except Exception as e:
+    print("Error exporting model store:", e)
+    sys.exit(1)
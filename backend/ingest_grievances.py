@@ -0,0 +1,44 @@
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.config import BULK_INGEST_BATCH_SIZE
+from app.services.bulk_ingest import ingest_stream
+
+# Bulk import of historical grievances from CSV or JSONL:
+#   python ingest_grievances.py backlog.csv
+# Re-running the same command resumes after the last committed batch.
+
+parser = argparse.ArgumentParser(description="Bulk import grievances from CSV or JSONL")
+parser.add_argument("path")
+parser.add_argument("--format", choices=["csv", "jsonl"], help="default: from the file extension")
+parser.add_argument("--job-id", help="checkpoint name (default: derived from the file path)")
+parser.add_argument("--batch-size", type=int, default=BULK_INGEST_BATCH_SIZE)
+parser.add_argument("--errors", help="per-row error report (default: <path>.errors.jsonl)")
+args = parser.parse_args()
+
+fmt = args.format or ("csv" if args.path.lower().endswith(".csv") else "jsonl")
+source = os.path.abspath(args.path)
+job_id = args.job_id or "file-" + hashlib.sha1(source.encode()).hexdigest()[:16]
+errors_path = args.errors or f"{args.path}.errors.jsonl"
+
+print(f"Importing {args.path} as {fmt} (job {job_id})...")
+
+status = "failed"
+with open(args.path, "rb") as stream, open(errors_path, "a", encoding="utf-8") as errors:
+    for event in ingest_stream(stream, fmt, job_id, source=source, batch_size=args.batch_size):
+        if event["event"] == "error":
+            errors.write(json.dumps(event) + "\n")
+        elif event["event"] == "batch":
+            print(f"  rows {event['rows_done']}: {event['inserted']} inserted, {event['failed']} rejected")
+        else:
+            status = event["status"]
+            print(f"Import {status}: {event['inserted']} inserted, {event['failed']} rejected "
+                  f"({event['rows_done']} rows read)")
+
+print(f"Row errors written to {errors_path}")
+sys.exit(0 if status == "completed" else 1)
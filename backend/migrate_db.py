@@ -0,0 +1,149 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from sqlalchemy import inspect, text
+from app.db.connection import Base, engine
+from app.db import models
+from app.db.connection import SessionLocal
+from app.services.rollup_service import rebuild_daily_counts
+from app.utils.geohash import encode_geohash
+from app.db.schema_check import find_schema_problems
+
+# Idempotent schema upgrades for databases created before the matching model change.
+# Safe to run on every deploy: each step checks the current schema first.
+
+BACKFILL_BATCH_SIZE = 5000
+
+
+def _columns(table: str):
+    return {col["name"]: col for col in inspect(engine).get_columns(table)}
+
+
+def migrate_coordinates_to_float():
+    """grievances.latitude/longitude: VARCHAR -> double precision."""
+    columns = _columns("grievances")
+    if engine.dialect.name == "postgresql":
+        with engine.begin() as conn:
+            for name in ("latitude", "longitude"):
+                if "CHAR" not in str(columns[name]["type"]).upper():
+                    continue
+                conn.execute(text(
+                    f"ALTER TABLE grievances ALTER COLUMN {name} TYPE double precision "
+                    f"USING CASE WHEN {name} ~ '^\\s*-?[0-9]+(\\.[0-9]+)?\\s*$' "
+                    f"THEN {name}::double precision END"
+                ))
+                print(f"grievances.{name} converted to double precision")
+    elif any("CHAR" in str(columns[name]["type"]).upper() for name in ("latitude", "longitude")):
+        # SQLite can't change a column type: rebuild the table from the model
+        grievances = Base.metadata.tables["grievances"]
+        old_columns = [name for name in columns if name in grievances.c]
+        select_list = ", ".join(
+            f"CAST(NULLIF(TRIM({name}), '') AS REAL)" if name in ("latitude", "longitude") else name
+            for name in old_columns
+        )
+        with engine.begin() as conn:
+            for index in inspect(engine).get_indexes("grievances"):
+                conn.execute(text(f"DROP INDEX IF EXISTS {index['name']}"))
+            conn.execute(text("ALTER TABLE grievances RENAME TO grievances_old"))
+            grievances.create(bind=conn)
+            conn.execute(text(
+                f"INSERT INTO grievances ({', '.join(old_columns)}) "
+                f"SELECT {select_list} FROM grievances_old"
+            ))
+            conn.execute(text("DROP TABLE grievances_old"))
+        print("grievances table rebuilt with REAL coordinates")
+
+
+def add_geohash_column():
+    if "geohash" not in _columns("grievances"):
+        with engine.begin() as conn:
+            conn.execute(text("ALTER TABLE grievances ADD COLUMN geohash VARCHAR(12)"))
+        print("grievances.geohash added")
+
+
+def add_enrichment_claim_columns():
+    existing = _columns("grievances")
+    added = []
+    with engine.begin() as conn:
+        if "enrichment_claimed_by" not in existing:
+            conn.execute(text("ALTER TABLE grievances ADD COLUMN enrichment_claimed_by VARCHAR(32)"))
+            added.append("enrichment_claimed_by")
+        if "enrichment_claimed_at" not in existing:
+            conn.execute(text("ALTER TABLE grievances ADD COLUMN enrichment_claimed_at TIMESTAMP"))
+            added.append("enrichment_claimed_at")
+    if added:
+        print("grievances." + ", grievances.".join(added) + " added")
+
+
+def backfill_geohashes():
+    total = 0
+    while True:
+        with engine.begin() as conn:
+            rows = conn.execute(text(
+                "SELECT id, latitude, longitude FROM grievances "
+                "WHERE geohash IS NULL AND latitude IS NOT NULL AND longitude IS NOT NULL "
+                "LIMIT :limit"
+            ), {"limit": BACKFILL_BATCH_SIZE}).all()
+            if not rows:
+                break
+            conn.execute(
+                text("UPDATE grievances SET geohash = :geohash WHERE id = :id"),
+                [{"id": r.id, "geohash": encode_geohash(r.latitude, r.longitude)} for r in rows],
+            )
+        total += len(rows)
+    if total:
+        print(f"Backfilled geohash for {total} grievances")
+
+
+def create_missing_indexes():
+    """Create every index declared on the models that the database doesn't have yet."""
+    inspector = inspect(engine)
+    for table in Base.metadata.sorted_tables:
+        if not inspector.has_table(table.name):
+            continue
+        existing = {ix["name"] for ix in inspector.get_indexes(table.name)}
+        for index in table.indexes:
+            if index.name not in existing:
+                index.create(bind=engine)
+                print(f"Index {index.name} created")
+
+
+def backfill_daily_counts():
+    """Fill grievance_daily_counts once for databases that predate it."""
+    with engine.connect() as conn:
+        has_rollup = conn.execute(text("SELECT 1 FROM grievance_daily_counts LIMIT 1")).first()
+    if has_rollup:
+        return
+    db = SessionLocal()
+    try:
+        rows = rebuild_daily_counts(db)
+        print(f"grievance_daily_counts backfilled ({rows} rows)")
+    finally:
+        db.close()
+
+
+MIGRATIONS = [
+    migrate_coordinates_to_float,
+    add_geohash_column,
+    add_enrichment_claim_columns,
+    backfill_geohashes,
+    create_missing_indexes,
+    backfill_daily_counts,
+]
+
+
+if __name__ == "__main__":
+    print("Migrating database schema...")
+    try:
+        Base.metadata.create_all(bind=engine)  # brand new tables
+        for step in MIGRATIONS:
+            step()
+        problems = find_schema_problems()
+        if problems:
+            raise RuntimeError("schema still differs from the models: " + "; ".join(problems))
+        print("Migration finished")
+    except Exception as e:
+        print("Migration failed:", e)
+        sys.exit(1)
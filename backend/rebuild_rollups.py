@@ -0,0 +1,20 @@
+import os
+import sys
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.db.connection import SessionLocal
+from app.services.rollup_service import rebuild_daily_counts
+
+print("Rebuilding grievance_daily_counts from the grievances table...")
+
+db = SessionLocal()
+try:
+    rows = rebuild_daily_counts(db)
+    print(f"Rollup rebuilt: {rows} (day, region, category, status) rows")
+except Exception as e:
+    db.rollback()
+    print("Error rebuilding rollup:", e)
+    sys.exit(1)
+finally:
+    db.close()
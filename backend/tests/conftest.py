@@ -0,0 +1,23 @@
+import os
+import sys
+import tempfile
+
+import pytest
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# A throwaway SQLite database unless the run points somewhere else
+os.environ.setdefault("DATABASE_URL", "sqlite:///" + os.path.join(tempfile.mkdtemp(), "igrs_test.db"))
+
+
+@pytest.fixture
+def db():
+    from app.db.connection import Base, engine, SessionLocal
+
+    Base.metadata.create_all(bind=engine)
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
+        Base.metadata.drop_all(bind=engine)
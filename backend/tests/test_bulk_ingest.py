@@ -0,0 +1,30 @@
+import io
+import json
+
+from app.db.models import Grievance, User, UserRole
+from app.services.bulk_ingest import ingest_stream
+
+
+def _jsonl(records):
+    return io.BytesIO("\n".join(json.dumps(record) for record in records).encode("utf-8"))
+
+
+def test_unknown_user_id_fails_only_its_row(db):
+    user = User(name="Citizen", email="citizen@example.com", password_hash="x", role=UserRole.user)
+    db.add(user)
+    db.commit()
+    base = {"category": "Utilities", "priority": "Low", "region": "Lucknow",
+            "latitude": 26.85, "longitude": 80.95, "created_at": "2025-01-01T10:00:00"}
+    records = [
+        {**base, "description": "No water supply", "user_id": user.id},
+        {**base, "description": "Pipeline burst", "user_id": 999999},
+        {**base, "description": "Dirty water"},
+    ]
+
+    events = list(ingest_stream(_jsonl(records), "jsonl", job_id="unknown-user", batch_size=10))
+
+    errors = [event for event in events if event["event"] == "error"]
+    assert [(event["row"], event["error"]) for event in errors] == [(2, "user_id 999999 does not exist")]
+    assert events[-1]["status"] == "completed"
+    assert (events[-1]["inserted"], events[-1]["failed"], events[-1]["rows_done"]) == (2, 1, 3)
+    assert db.query(Grievance).count() == 2
@@ -0,0 +1,132 @@
+import queue
+import threading
+import time
+from datetime import datetime, timedelta
+
+from app.db.models import Grievance, GrievanceDailyCount
+from app.services import enrichment_worker
+from app.services.rollup_service import record_grievance_created
+
+
+def _submit(db, description: str, category: str, **claim):
+    grievance = Grievance(
+        description=description, category=category, priority="Low", region="Lucknow",
+        status="Processing", created_at=datetime(2025, 1, 1),
+        **(claim or enrichment_worker.enrichment_claim()),
+    )
+    db.add(grievance)
+    record_grievance_created(db, grievance)
+    db.commit()
+    return grievance.id
+
+
+def _counts(db):
+    return {(row.category, row.status): row.count for row in db.query(GrievanceDailyCount) if row.count}
+
+
+def _locate(monkeypatch):
+    monkeypatch.setattr(enrichment_worker, "locate_region", lambda region: {"latitude": 26.85, "longitude": 80.95})
+
+
+def test_worker_stores_gemini_category_for_uncertain_text(db, monkeypatch):
+    _locate(monkeypatch)
+    monkeypatch.setattr(enrichment_worker, "solve_problem", lambda text: "Fix it")
+    monkeypatch.setattr(enrichment_worker, "reclassify_uncertain", lambda text: "Sanitation")
+    grievance_id = _submit(db, "Community toilet has no water and is filthy", "Utilities")
+
+    enrichment_worker.enrich_grievance(grievance_id)
+
+    db.expire_all()
+    grievance = db.get(Grievance, grievance_id)
+    assert (grievance.category, grievance.status) == ("Sanitation", "Pending")
+    assert _counts(db) == {("Sanitation", "Pending"): 1}
+
+
+def test_worker_reuses_a_solution_being_streamed(db, monkeypatch):
+    _locate(monkeypatch)
+    monkeypatch.setattr(enrichment_worker, "reclassify_uncertain", lambda text: None)
+    gemini_calls = []
+    monkeypatch.setattr(enrichment_worker, "solve_problem", lambda text: gemini_calls.append(text) or "Worker")
+    streaming, finish = threading.Event(), threading.Event()
+
+    def slow_stream(text, on_complete):
+        streaming.set()
+        finish.wait(5)
+        on_complete("Streamed")
+        yield "done"
+
+    monkeypatch.setattr(enrichment_worker, "solution_event_stream", slow_stream)
+    grievance_id = _submit(db, "Garbage not lifted for a week", "Sanitation")
+
+    stream = enrichment_worker.solution_stream_events(grievance_id, "Garbage not lifted for a week")
+    client = threading.Thread(target=lambda: list(stream))
+    client.start()
+    assert streaming.wait(5)
+    worker = threading.Thread(target=enrichment_worker.enrich_grievance, args=(grievance_id,))
+    worker.start()
+    time.sleep(0.3)  # the worker reaches the solution while the stream is still running
+    finish.set()
+    client.join(5)
+    worker.join(5)
+
+    db.expire_all()
+    grievance = db.get(Grievance, grievance_id)
+    assert (grievance.solution, grievance.status) == ("Streamed", "Pending")
+    assert gemini_calls == []
+
+
+def _queued_ids(pending):
+    return [item[2] for item in pending.queue]
+
+
+def _fresh_queue(monkeypatch):
+    pending = queue.PriorityQueue()
+    monkeypatch.setattr(enrichment_worker, "_queue", pending)
+    monkeypatch.setattr(enrichment_worker, "_queued_ids", set())
+    return pending
+
+
+def test_requeue_claims_each_unfinished_grievance_once(db, monkeypatch):
+    pending = _fresh_queue(monkeypatch)
+    submitted = _submit(db, "Streetlight broken", "Electricity")  # queued by its own submit
+    orphan = _submit(db, "Pothole on main road", "Roads", enrichment_claimed_by=None)
+    stale = _submit(
+        db, "Water leaking", "Water", enrichment_claimed_by="deadprocess",
+        enrichment_claimed_at=datetime.utcnow() - timedelta(days=1),
+    )
+    live = _submit(
+        db, "Drain blocked", "Sanitation", enrichment_claimed_by="otherprocess",
+        enrichment_claimed_at=datetime.utcnow(),
+    )
+
+    assert enrichment_worker.requeue_unfinished_grievances() == 2
+    assert enrichment_worker.requeue_unfinished_grievances() == 0  # a second process finds nothing
+    queued = _queued_ids(pending)
+    assert sorted(queued) == sorted([orphan, stale])
+
+    db.expire_all()
+    assert db.get(Grievance, live).enrichment_claimed_by == "otherprocess"
+    assert submitted not in queued
+
+
+def test_enqueue_skips_an_id_already_queued(monkeypatch):
+    pending = _fresh_queue(monkeypatch)
+    enrichment_worker.enqueue_grievance(7, "High")
+    enrichment_worker.enqueue_grievance(7, "High")
+    assert _queued_ids(pending) == [7]
+
+
+def test_worker_leaves_a_grievance_claimed_by_another_process(db, monkeypatch):
+    _locate(monkeypatch)
+    monkeypatch.setattr(enrichment_worker, "solve_problem", lambda text: "Fix it")
+    monkeypatch.setattr(enrichment_worker, "reclassify_uncertain", lambda text: None)
+    grievance_id = _submit(
+        db, "Garbage not lifted", "Sanitation", enrichment_claimed_by="otherprocess",
+        enrichment_claimed_at=datetime.utcnow(),
+    )
+
+    enrichment_worker.enrich_grievance(grievance_id)
+
+    db.expire_all()
+    grievance = db.get(Grievance, grievance_id)
+    assert (grievance.status, grievance.solution) == ("Processing", None)
@@ -0,0 +1,8 @@
+from app.services.gemini_service import templated_solution
+
+
+def test_templated_solution_names_department_only_when_confident():
+    assert "Public Works Department" in templated_solution("Huge pothole on the main road in Kanpur")
+    for text in ["I want to complain about corruption in the tehsil office", "Bribe demanded by clerk"]:
+        solution = templated_solution(text)
+        assert "concerned department" in solution, text
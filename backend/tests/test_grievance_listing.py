@@ -0,0 +1,15 @@
+from datetime import date, datetime
+
+from app.db.models import Grievance
+from app.services.grievance_listing import count_by_priority
+
+
+def test_count_by_priority_applies_filters(db):
+    for priority, category, day in [("High", "Utilities", 1), ("High", "Sanitation", 2),
+                                    ("Low", "Utilities", 2), ("High", "Utilities", 5)]:
+        db.add(Grievance(description="x", category=category, priority=priority, region="Lucknow",
+                         status="Pending", created_at=datetime(2025, 1, day, 18)))
+    db.commit()
+
+    assert count_by_priority(db) == {"High": 3, "Low": 1}
+    assert count_by_priority(db, category="Utilities", end=date(2025, 1, 2)) == {"High": 1, "Low": 1}
@@ -0,0 +1,32 @@
+from datetime import datetime
+
+import numpy as np
+
+from app.db.models import Grievance
+from app.services.rollup_service import get_dominant_categories, record_grievance_created
+
+
+def _add(db, region: str, category: str, count: int):
+    for _ in range(count):
+        grievance = Grievance(
+            description=f"{category} issue in {region}", category=category, priority="Low",
+            region=region, status="Pending", created_at=datetime(2025, 1, 1),
+        )
+        db.add(grievance)
+        record_grievance_created(db, grievance)
+    db.commit()
+
+
+def test_dominant_categories_accepts_numpy_array_of_several_regions(db):
+    # Callers may pass pandas .unique() output; a NumPy array has no truth value
+    _add(db, "Lucknow", "Utilities", 3)
+    _add(db, "Lucknow", "Sanitation", 1)
+    _add(db, "Kanpur", "Infrastructure", 2)
+
+    dominant = get_dominant_categories(db, np.array(["Lucknow", "Kanpur"]))
+
+    assert dominant == {"Lucknow": "Utilities", "Kanpur": "Infrastructure"}
+
+
+def test_dominant_categories_of_no_regions(db):
+    assert get_dominant_categories(db, np.array([], dtype=object)) == {}
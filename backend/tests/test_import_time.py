@@ -0,0 +1,20 @@
+import statistics
+
+from check_import_time import HEAVY_MODULES, IMPORT_TIME_BUDGET_MS, measure_once
+
+RUNS = 3
+
+
+def test_import_app_main_fits_budget_without_heavy_modules():
+    timings, heavy = [], set()
+    for _ in range(RUNS):
+        ms, modules = measure_once()
+        timings.append(ms)
+        heavy.update(modules)
+
+    assert not heavy, f"imported at startup: {sorted(heavy)} (of {HEAVY_MODULES})"
+    median = statistics.median(timings)
+    assert median <= IMPORT_TIME_BUDGET_MS, (
+        f"median import app.main {median:.0f}ms > {IMPORT_TIME_BUDGET_MS}ms; "
+        "run check_import_time.py for the slowest imports"
+    )
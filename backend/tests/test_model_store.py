@@ -0,0 +1,47 @@
+import os
+import shutil
+
+import pytest
+
+from app.services import model_store
+
+SHIPPED_SEED = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app/models/forecast/store")
+
+
+@pytest.fixture
+def stores(tmp_path, monkeypatch):
+    seed, runtime = tmp_path / "seed", tmp_path / "runtime"
+    shutil.copytree(SHIPPED_SEED, seed)
+    monkeypatch.setattr(model_store, "SEED_STORE_DIR", str(seed))
+    monkeypatch.setattr(model_store, "STORE_DIR", str(runtime))
+    return seed, runtime
+
+
+def _snapshot(directory):
+    return {path.name: path.read_bytes() for path in directory.iterdir()}
+
+
+def test_seed_is_served_until_the_first_publish(stores):
+    seed, runtime = stores
+    assert model_store.active_store_dir() == str(seed)
+    entry = next(iter(model_store.read_manifest()["categories"].values()))
+    assert model_store.load_model(entry) is not None
+    assert not runtime.exists()
+
+
+def test_publish_writes_only_the_runtime_store(stores):
+    seed, runtime = stores
+    before = _snapshot(seed)
+    categories = model_store.read_manifest()["categories"]
+    retrained, kept = sorted(categories)[:2]
+
+    manifest = model_store.publish_models(
+        {retrained: model_store.load_model(categories[retrained])}, "20990101000000000000"
+    )
+
+    assert _snapshot(seed) == before
+    assert model_store.active_store_dir() == str(runtime)
+    assert manifest["categories"][retrained]["version"] == "20990101000000000000"
+    # Categories that were not retrained are copied from the seed and still load
+    assert (runtime / manifest["categories"][kept]["file"]).exists()
+    assert model_store.load_model(model_store.read_manifest()["categories"][kept]) is not None
@@ -0,0 +1,57 @@
+import asyncio
+import time
+
+import pytest
+from fastapi import HTTPException
+
+from app.auth import principal_cache
+from app.auth.dependencies import require_admin
+from app.auth.principal_cache import Principal, cache_principal, get_cached_principal, invalidate_user
+from app.db.connection import AsyncSessionLocal
+from app.db.models import User, UserRole
+
+
+def _principal(user_id=1, role=UserRole.user):
+    return Principal(id=user_id, name="Citizen", email=f"user{user_id}@example.com", role=role)
+
+
+def test_invalidation_drops_snapshots_loaded_before_it():
+    loaded_at = time.monotonic()
+    cache_principal("token-a", _principal(1), loaded_at=loaded_at)
+    cache_principal("token-b", _principal(2))
+
+    invalidate_user(1)
+    # Read from the database before the invalidation, cached after it: still stale
+    cache_principal("token-c", _principal(1), loaded_at=loaded_at)
+
+    assert get_cached_principal("token-a") is None
+    assert get_cached_principal("token-c") is None
+    assert get_cached_principal("token-b") == _principal(2)
+
+
+def test_invalidation_records_expire_with_the_cache_ttl(monkeypatch):
+    monkeypatch.setattr(principal_cache, "AUTH_CACHE_TTL_SECONDS", 0)
+    for user_id in range(100, 200):
+        invalidate_user(user_id)
+    assert len(principal_cache._invalidated_at) <= 2
+
+
+def test_demoted_admin_loses_access_despite_cached_snapshot(db):
+    admin = User(name="Admin", email="admin@example.com", password_hash="x", role=UserRole.admin)
+    db.add(admin)
+    db.commit()
+    principal = _principal(admin.id, UserRole.admin)
+    cache_principal("admin-token", principal)
+
+    async def check():
+        async with AsyncSessionLocal() as session:
+            return await require_admin(principal, session)
+
+    assert asyncio.run(check()) == principal
+
+    admin.role = UserRole.user
+    db.commit()
+    with pytest.raises(HTTPException) as denied:
+        asyncio.run(check())
+    assert denied.value.status_code == 403
+    assert get_cached_principal("admin-token") is None
@@ -0,0 +1,22 @@
+import time
+
+import pytest
+
+from app.services import retrain_service
+
+
+def _slow_fit(category, df, init):
+    time.sleep(3)
+    return category, None, 3.0, False
+
+
+def test_cancel_returns_without_waiting_for_running_fits(monkeypatch):
+    monkeypatch.setattr(retrain_service, "RETRAIN_WORKERS", 2)
+    monkeypatch.setattr(retrain_service, "fit_category", _slow_fit)
+    jobs = {category: (None, None) for category in ("Utilities", "Sanitation", "Medical")}
+
+    started = time.perf_counter()
+    with pytest.raises(retrain_service.RetrainCancelled):
+        list(retrain_service._fit_all(jobs, should_cancel=lambda: True))
+
+    assert time.perf_counter() - started < 2.5
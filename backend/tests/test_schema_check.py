@@ -0,0 +1,17 @@
+import pytest
+from sqlalchemy import text
+
+from app.db.connection import engine
+from app.db.schema_check import SchemaOutOfDate, check_schema
+
+
+def test_current_schema_passes(db):
+    check_schema()
+
+
+def test_missing_rollup_table_fails_with_migration_hint(db):
+    with engine.begin() as conn:
+        conn.execute(text("DROP TABLE grievance_daily_counts"))
+
+    with pytest.raises(SchemaOutOfDate, match="grievance_daily_counts is missing.*migrate_db.py"):
+        check_schema()
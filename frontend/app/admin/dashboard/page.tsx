@@ -1,9 +1,9 @@
 "use client";
 
-import { useEffect, useState, useMemo } from "react";
+import { useEffect, useState, useMemo, useRef } from "react";
 import { useRouter } from "next/navigation";
 import dynamic from "next/dynamic";
-import api from "@/lib/api";
+import api, { fetchPage } from "@/lib/api";
 import { 
   LayoutDashboard, 
   Map as MapIcon, 
@@ -88,9 +88,15 @@ export default function AdminDashboard() {
   const router = useRouter();
   const [activeTab, setActiveTab] = useState<"list" | "map" | "analytics">("list");
   const [grievances, setGrievances] = useState<Grievance[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | undefined>();
+  const [loadingMore, setLoadingMore] = useState(false);
+  const [statusCounts, setStatusCounts] = useState<Record<string, number>>({});
+  const [priorityCounts, setPriorityCounts] = useState<Record<string, number>>({});
   const [loading, setLoading] = useState(true);
   const [searchTerm, setSearchTerm] = useState("");
   const [filterStatus, setFilterStatus] = useState("All");
+  const [filterCategory, setFilterCategory] = useState("All");
+  const listRequest = useRef(0); // ignore pages of a filter that has since changed
   
   // Modal State
   const [selectedGrievance, setSelectedGrievance] = useState<Grievance | null>(null);
@@ -103,26 +109,54 @@ export default function AdminDashboard() {
 
   // --- 1. Fetch Data on Load ---
   useEffect(() => {
-    const init = async () => {
-      try {
-        const token = localStorage.getItem("token");
-        const role = localStorage.getItem("role");
-
-        if (!token || role !== "admin") {
-          router.push("/auth/login/admin");
-          return;
-        }
-
-        const res = await api.get("/grievance/all");
-        setGrievances(res.data);
-      } catch (error) {
-        console.error("Failed to load admin data", error);
-      } finally {
+    const token = localStorage.getItem("token");
+    const role = localStorage.getItem("role");
+    if (!token || role !== "admin") {
+      router.push("/auth/login/admin");
+      return;
+    }
+
+    // Totals come from the server, the list only holds the pages loaded so far
+    const counts = (groupBy: string) =>
+      api.get("/analytics/counts", { params: { group_by: groupBy } })
+        .then(res => res.data as Record<string, number>)
+        .catch(() => ({}));
+    counts("status").then(setStatusCounts);
+    counts("priority").then(setPriorityCounts);
+  }, [router]);
+
+  // Status and category filters run on the server; a new filter starts from the first page
+  const loadGrievances = async (cursor?: string) => {
+    const request = ++listRequest.current;
+    const params = {
+      status: filterStatus !== "All" ? filterStatus : undefined,
+      category: filterCategory !== "All" ? filterCategory : undefined,
+    };
+    try {
+      const page = await fetchPage<Grievance>("/grievance/all", params, cursor);
+      if (request !== listRequest.current) return;
+      setGrievances(prev => cursor ? [...prev, ...page.items] : page.items);
+      setNextCursor(page.nextCursor);
+    } catch (error) {
+      console.error("Failed to load admin data", error);
+    } finally {
+      if (request === listRequest.current) {
         setLoading(false);
+        setLoadingMore(false);
       }
-    };
-    init();
-  }, [router]);
+    }
+  };
+
+  useEffect(() => {
+    if (localStorage.getItem("role") !== "admin") return;
+    loadGrievances();
+  }, [filterStatus, filterCategory]);
+
+  const loadMore = () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    loadGrievances(nextCursor);
+  };
 
   // --- 2. Fetch Forecast when Analytics Tab is active ---
   useEffect(() => {
@@ -154,7 +188,16 @@ export default function AdminDashboard() {
   // --- 3. Update Status Logic ---
   const handleStatusUpdate = async (id: number, newStatus: string) => {
     const originalGrievances = [...grievances];
+    const originalCounts = statusCounts;
+    const oldStatus = grievances.find(g => g.id === id)?.status;
     
+    if (oldStatus && oldStatus !== newStatus) {
+      setStatusCounts({
+        ...statusCounts,
+        [oldStatus]: (statusCounts[oldStatus] || 0) - 1,
+        [newStatus]: (statusCounts[newStatus] || 0) + 1,
+      });
+    }
     // Optimistic Update for both list and modal
     setGrievances(prev => prev.map(g => g.id === id ? { ...g, status: newStatus } : g));
     if (selectedGrievance && selectedGrievance.id === id) {
@@ -169,6 +212,7 @@ export default function AdminDashboard() {
       console.error("Update failed", error);
       alert("Failed to update status on server.");
       setGrievances(originalGrievances); // Revert on failure
+      setStatusCounts(originalCounts);
     }
   };
 
@@ -178,25 +222,22 @@ export default function AdminDashboard() {
   };
 
   // --- Computed Data ---
+  // Search narrows the loaded pages only
   const filteredGrievances = useMemo(() => {
-    return grievances.filter(g => {
-      const matchesSearch = 
-        g.description.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        g.region?.toLowerCase().includes(searchTerm.toLowerCase()) ||
-        g.category?.toLowerCase().includes(searchTerm.toLowerCase());
-      
-      const matchesFilter = filterStatus === "All" || g.status === filterStatus;
-
-      return matchesSearch && matchesFilter;
-    });
-  }, [grievances, searchTerm, filterStatus]);
+    const term = searchTerm.toLowerCase();
+    return grievances.filter(g =>
+      g.description.toLowerCase().includes(term) ||
+      g.region?.toLowerCase().includes(term) ||
+      g.category?.toLowerCase().includes(term)
+    );
+  }, [grievances, searchTerm]);
 
   const stats = useMemo(() => ({
-    total: grievances.length,
-    pending: grievances.filter(g => g.status === "Pending").length,
-    resolved: grievances.filter(g => g.status === "Resolved").length,
-    critical: grievances.filter(g => g.priority === "High" || g.priority === "Critical").length,
-  }), [grievances]);
+    total: Object.values(statusCounts).reduce((sum, n) => sum + n, 0),
+    pending: statusCounts["Pending"] || 0,
+    resolved: statusCounts["Resolved"] || 0,
+    critical: (priorityCounts["High"] || 0) + (priorityCounts["Critical"] || 0),
+  }), [statusCounts, priorityCounts]);
 
   if (loading) return (
     <div className="min-h-screen flex items-center justify-center bg-gray-50">
@@ -251,7 +292,7 @@ export default function AdminDashboard() {
                 <Search className="absolute left-3 top-2.5 text-gray-400" size={18} />
                 <input 
                   type="text" 
-                  placeholder="Search grievances..." 
+                  placeholder="Search loaded grievances..." 
                   value={searchTerm}
                   onChange={(e) => setSearchTerm(e.target.value)}
                   className="w-full pl-10 pr-4 py-2 rounded-lg border border-gray-200 dark:border-gray-600 bg-white dark:bg-gray-800 focus:ring-2 focus:ring-blue-500 outline-none"
@@ -269,6 +310,18 @@ export default function AdminDashboard() {
                   <option value="In Progress">In Progress</option>
                   <option value="Resolved">Resolved</option>
                 </select>
+                <select 
+                  value={filterCategory}
+                  onChange={(e) => setFilterCategory(e.target.value)}
+                  className="bg-white dark:bg-gray-800 border border-gray-200 dark:border-gray-600 rounded-lg px-3 py-2 text-sm focus:outline-none"
+                >
+                  <option value="All">All Categories</option>
+                  <option value="Infrastructure">Infrastructure</option>
+                  <option value="Utilities">Utilities</option>
+                  <option value="Sanitation">Sanitation</option>
+                  <option value="Medical">Medical</option>
+                  <option value="Other">Other</option>
+                </select>
               </div>
             </div>
 
@@ -337,6 +390,17 @@ export default function AdminDashboard() {
                 </tbody>
               </table>
             </div>
+            {nextCursor && (
+              <div className="p-4 border-t border-gray-200 dark:border-gray-700 flex justify-center">
+                <button
+                  onClick={loadMore}
+                  disabled={loadingMore}
+                  className="px-4 py-2 text-sm font-medium text-blue-600 hover:bg-blue-50 rounded-lg transition disabled:opacity-50"
+                >
+                  {loadingMore ? "Loading..." : `Load more (${grievances.length} shown)`}
+                </button>
+              </div>
+            )}
           </div>
         )}
 
@@ -2,13 +2,15 @@
 
 import { useEffect, useState } from "react";
 import { useRouter } from "next/navigation";
-import api from "@/lib/api";
+import { fetchPage } from "@/lib/api";
 import { AxiosError } from "axios"; // Import AxiosError for type safety
 import GrievanceChatbot from "@/components/GrievanceChatbot";
 import GrievanceList from "@/components/GrievanceList";
 
 export default function UserDashboard() {
-  const [grievances, setGrievances] = useState([]);
+  const [grievances, setGrievances] = useState<any[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | undefined>();
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(true);
   const [error, setError] = useState("");
   const router = useRouter();
@@ -22,8 +24,9 @@ export default function UserDashboard() {
           throw new Error("No access token found. Please login.");
         }
 
-        const res = await api.get("/grievance/my-grievances");
-        setGrievances(res.data);
+        const page = await fetchPage("/grievance/my-grievances");
+        setGrievances(page.items);
+        setNextCursor(page.nextCursor);
       } catch (err: any) {
         console.error("Dashboard Error:", err); // 🔍 Check Console for this!
 
@@ -50,6 +53,21 @@ export default function UserDashboard() {
     fetchGrievances();
   }, [router]);
 
+  // Next page of older grievances
+  const loadMore = async () => {
+    if (!nextCursor || loadingMore) return;
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage("/grievance/my-grievances", {}, nextCursor);
+      setGrievances((prev) => [...prev, ...page.items]);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.error("Dashboard Error:", err);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleLogout = () => {
     localStorage.removeItem("token");
     localStorage.removeItem("role");
@@ -96,7 +114,18 @@ export default function UserDashboard() {
                 <p className="text-sm">Use the AI Assistant to file one!</p>
               </div>
             ) : (
-              <GrievanceList grievances={grievances} />
+              <>
+                <GrievanceList grievances={grievances} />
+                {nextCursor && (
+                  <button
+                    onClick={loadMore}
+                    disabled={loadingMore}
+                    className="mt-4 w-full py-2 text-sm font-medium text-blue-600 hover:bg-blue-50 rounded-lg transition disabled:opacity-50"
+                  >
+                    {loadingMore ? "Loading..." : "Load older grievances"}
+                  </button>
+                )}
+              </>
             )}
           </div>
         </div>
@@ -15,4 +15,20 @@ api.interceptors.request.use((config) => {
   return config;
 });
 
+export interface Page<T> {
+  items: T[];
+  nextCursor?: string; // undefined on the last page
+}
+
+// Listing endpoints are keyset-paginated: pass nextCursor back to get the following page
+export async function fetchPage<T = any>(
+  url: string,
+  params: Record<string, string | undefined> = {},
+  cursor?: string,
+  pageSize = 50,
+): Promise<Page<T>> {
+  const res = await api.get<T[]>(url, { params: { ...params, cursor, limit: pageSize } });
+  return { items: res.data, nextCursor: res.headers["x-next-cursor"] || undefined };
+}
+
 export default api;
\ No newline at end of file